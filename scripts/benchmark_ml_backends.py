@@ -0,0 +1,165 @@
+"""
+Compares the ML categorizer's inference backends on a labeled fixture set.
+
+Fixtures are laid out by expected category, the same way the organizer sorts them:
+
+    fixtures/Images/Personal/beach.jpg
+    fixtures/Documents/Code/script.py
+
+Each backend runs in its own process so its memory is measured in isolation. The report shows model load
+time, per-file latency (p50/p95), batched throughput, RSS once the models are loaded, peak RSS, accuracy,
+and the accuracy delta and prediction agreement against the fp32 "torch" backend.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from pro_file_organizer.core.constants import DEFAULT_ML_CATEGORIES
+from pro_file_organizer.core.ml_backends import ML_BACKENDS
+from pro_file_organizer.core.ml_organizer import IMAGE_EXTENSIONS, TEXT_EXTENSIONS, MultimodalFileOrganizer
+
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Bytes on macOS, kilobytes on Linux
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        import psutil  # Windows
+
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+
+
+def current_rss_mb() -> float:
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        # Linux without psutil
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+def load_fixtures(root: Path) -> list[tuple[Path, str]]:
+    fixtures = []
+    for path in sorted(root.rglob("*")):
+        if path.is_file() and path.suffix.lower() in IMAGE_EXTENSIONS | TEXT_EXTENSIONS:
+            fixtures.append((path, path.parent.relative_to(root).as_posix()))
+    return fixtures
+
+
+def run_backend(backend: str, root: Path, batch_size: int) -> dict:
+    """Measures one backend in this process. Called in a child process by main()."""
+    fixtures = load_fixtures(root)
+    categorizer = MultimodalFileOrganizer(DEFAULT_ML_CATEGORIES, backend=backend)
+
+    start = time.perf_counter()
+    if not categorizer.load_models():
+        raise SystemExit(f"Could not load models for backend {backend}")
+    load_seconds = time.perf_counter() - start
+    # What stays resident between runs; the peak also covers weights freed after loading (e.g. the onnx
+    # backend's PyTorch vision tower)
+    loaded_rss = current_rss_mb()
+
+    # Warm-up so one-time allocations don't land in the first sample
+    if fixtures:
+        categorizer.smart_categorize(fixtures[0][0], threshold=0.0)
+
+    latencies = []
+    predictions = {}
+    for path, _ in fixtures:
+        start = time.perf_counter()
+        category, _, _ = categorizer.smart_categorize(path, threshold=0.0)
+        latencies.append((time.perf_counter() - start) * 1000)
+        predictions[str(path.relative_to(root))] = category
+
+    categorizer.batch_size = batch_size
+    start = time.perf_counter()
+    categorizer.smart_categorize_many([path for path, _ in fixtures], threshold=0.0)
+    batch_seconds = time.perf_counter() - start
+
+    correct = sum(predictions[str(path.relative_to(root))] == label for path, label in fixtures)
+    return {
+        "backend": categorizer.backend,
+        "files": len(fixtures),
+        "load_seconds": round(load_seconds, 2),
+        "p50_ms": round(statistics.median(latencies), 1) if latencies else 0.0,
+        "p95_ms": round(sorted(latencies)[int(0.95 * (len(latencies) - 1))], 1) if latencies else 0.0,
+        "files_per_second": round(len(fixtures) / batch_seconds, 1) if batch_seconds > 0 else 0.0,
+        "loaded_rss_mb": round(loaded_rss, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "accuracy": correct / len(fixtures) if fixtures else 0.0,
+        "predictions": predictions,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ML categorizer backends on labeled fixtures")
+    parser.add_argument("fixtures", help="Folder of fixtures sorted into <category>/<file>")
+    parser.add_argument(
+        "--backends", nargs="+", choices=ML_BACKENDS, default=list(ML_BACKENDS), help="Backends to compare"
+    )
+    parser.add_argument("--batch-size", type=int, default=16, help="Batch size for the throughput run")
+    parser.add_argument("--json", metavar="FILE", help="Also write the full results (with predictions) here")
+    parser.add_argument("--worker", choices=ML_BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    root = Path(args.fixtures).resolve()
+
+    if args.worker:
+        print(json.dumps(run_backend(args.worker, root, args.batch_size)))
+        return
+
+    if not load_fixtures(root):
+        print(f"Error: no image or text fixtures found under {root}.")
+        sys.exit(1)
+
+    results = {}
+    for backend in args.backends:
+        print(f"Running {backend}...", flush=True)
+        proc = subprocess.run(
+            [sys.executable, __file__, str(root), "--worker", backend, "--batch-size", str(args.batch_size)],
+            capture_output=True,
+            text=True,
+            env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+        )
+        if proc.returncode != 0:
+            print(f"  failed: {proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else proc.returncode}")
+            continue
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if result["backend"] != backend:
+            print(f"  {backend} unavailable, ran {result['backend']} instead; skipping")
+            continue
+        results[backend] = result
+
+    baseline = results.get("torch")
+    header = (
+        f"{'backend':<12}{'load s':>8}{'p50 ms':>9}{'p95 ms':>9}{'files/s':>9}{'RSS MB':>9}{'peak MB':>9}{'acc':>7}"
+    )
+    print("\n" + header + f"{'Δacc':>8}{'agree':>8}")
+    for backend, r in results.items():
+        line = (
+            f"{backend:<12}{r['load_seconds']:>8.1f}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}"
+            f"{r['files_per_second']:>9.1f}{r['loaded_rss_mb']:>9.0f}{r['peak_rss_mb']:>9.0f}{r['accuracy']:>7.1%}"
+        )
+        if baseline:
+            delta = r["accuracy"] - baseline["accuracy"]
+            same = sum(r["predictions"][k] == v for k, v in baseline["predictions"].items())
+            line += f"{delta:>+8.1%}{same / max(1, len(baseline['predictions'])):>8.1%}"
+        print(line)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Measures the per-file cost of the organizer's target-folder safety checks.
+
+"before" is the check the move loop used to run for every file: resolve the target folder and the source
+root, then resolve the file's folder to see if it is already in place. "after" is TargetResolver, which
+resolves each distinct (category, date folder) and each source folder once per run.
+
+The source root is reached through a chain of symlinks (--symlink-depth), since every extra link adds
+syscalls to each resolve(); on a network mount each of those is a round trip.
+"""
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from pro_file_organizer.core.constants import DEFAULT_DIRECTORIES
+from pro_file_organizer.core.organizer import TargetResolver
+
+MONTHS = ["January", "February", "March", "April", "May", "June"]
+
+
+def build_tree(root: Path, symlink_depth: int, folders: int) -> tuple[Path, list[str]]:
+    """A source folder behind `symlink_depth` links, with `folders` sub-folders to move files out of."""
+    real = root / "real" / "source"
+    real.mkdir(parents=True)
+    source = real
+    for i in range(symlink_depth):
+        link = root / f"link{i}"
+        link.symlink_to(source, target_is_directory=True)
+        source = link
+    parents = []
+    for i in range(folders):
+        (real / f"incoming{i}").mkdir()
+        parents.append(str(source / f"incoming{i}"))
+    return source, parents
+
+
+def plan(files: int, parents: list[str], date_sort: bool, seed: int = 0) -> list[tuple[str, str, str]]:
+    """(category, date folder, parent folder) for each file."""
+    rng = random.Random(seed)
+    categories = list(DEFAULT_DIRECTORIES)
+    return [
+        (
+            rng.choice(categories),
+            f"{rng.choice(('2023', '2024'))}/{rng.choice(MONTHS)}" if date_sort else "",
+            rng.choice(parents),
+        )
+        for _ in range(files)
+    ]
+
+
+def check_uncached(source: Path, items: list[tuple[str, str, str]]) -> int:
+    placed = 0
+    for category, relative_dir, parent in items:
+        target_dir = source / category
+        if relative_dir:
+            target_dir = target_dir / relative_dir
+        target_dir.resolve().relative_to(source.resolve())
+        placed += Path(parent).resolve() == target_dir.resolve()
+    return placed
+
+
+def check_cached(source: Path, items: list[tuple[str, str, str]]) -> int:
+    placed = 0
+    targets = TargetResolver(source)
+    for category, relative_dir, parent in items:
+        _, resolved = targets.target(category, relative_dir)
+        placed += targets.resolve_parent(parent) == resolved
+    return placed
+
+
+def best_of(runs: int, func, *args) -> float:
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark target-folder safety checks per file")
+    parser.add_argument("--files", type=int, default=100_000, help="Files in the simulated run")
+    parser.add_argument("--folders", type=int, default=20, help="Distinct folders the files come from")
+    parser.add_argument("--symlink-depth", type=int, default=3, help="Symlinks between the path and the source")
+    parser.add_argument("--no-date-sort", action="store_true", help="Don't add year/month target folders")
+    parser.add_argument("--runs", type=int, default=3, help="Repetitions; the best time is reported")
+    args = parser.parse_args()
+
+    root = Path(tempfile.mkdtemp())
+    try:
+        source, parents = build_tree(root, args.symlink_depth, args.folders)
+        items = plan(args.files, parents, not args.no_date_sort)
+        assert check_uncached(source, items[:1000]) == check_cached(source, items[:1000])
+
+        before = best_of(args.runs, check_uncached, source, items)
+        after = best_of(args.runs, check_cached, source, items)
+    finally:
+        shutil.rmtree(root)
+
+    targets = len({(category, relative_dir) for category, relative_dir, _ in items})
+    print(
+        f"{args.files} files, {targets} target folders, {args.folders} source folders, "
+        f"{args.symlink_depth} symlinks deep"
+    )
+    print(f"{'':<8}{'total s':>10}{'µs/file':>10}")
+    for label, seconds in (("before", before), ("after", after)):
+        print(f"{label:<8}{seconds:>10.3f}{seconds / args.files * 1e6:>10.2f}")
+    print(f"speedup {before / after:.0f}x" if after > 0 else "")
+
+
+if __name__ == "__main__":
+    main()
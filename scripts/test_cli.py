@@ -3,7 +3,10 @@ import os
 import sys
 from pathlib import Path
 
+from pro_file_organizer.core.hashing import HASH_ALGORITHMS
+from pro_file_organizer.core.ml_backends import ML_BACKENDS
 from pro_file_organizer.core.organizer import FileOrganizer, OrganizationOptions
+from pro_file_organizer.core.undo_journal import UndoJournal
 
 
 def main():
@@ -12,9 +15,59 @@ def main():
         "source", nargs="?", default="/sandbox", help="Path to the directory to organize (default: /sandbox)"
     )
     parser.add_argument("--recursive", "-r", action="store_true", help="Organize subdirectories")
+    parser.add_argument(
+        "--scan-workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="List directories on N threads during recursive scans (helps on network filesystems)",
+    )
     parser.add_argument("--ml", action="store_true", help="Enable AI-powered categorization")
+    parser.add_argument(
+        "--ml-batch-size", type=int, default=16, metavar="N", help="Files per ML inference batch (1 disables batching)"
+    )
+    parser.add_argument(
+        "--ml-backend",
+        choices=ML_BACKENDS,
+        help="Inference backend for --ml: torch (fp32), torch-int8 (quantized, CPU) or onnx (needs the 'onnx' extra)",
+    )
+    parser.add_argument(
+        "--extract-workers",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Extract PDF/DOCX/text content on N processes ahead of ML inference (0 extracts inline)",
+    )
+    parser.add_argument(
+        "--extract-timeout",
+        type=float,
+        default=30.0,
+        metavar="SECONDS",
+        help="Give up extracting a file's text after this long and sort it by extension",
+    )
     parser.add_argument("--dry-run", action="store_true", help="Show what would be done without moving files")
     parser.add_argument("--undo", action="store_true", help="Undo the last organization run")
+    parser.add_argument("--duplicates", action="store_true", help="Skip files whose content is already organized")
+    parser.add_argument(
+        "--rebuild-hash-cache",
+        action="store_true",
+        help="Clear the duplicate-detection hash cache and re-hash the category folders, then exit",
+    )
+    parser.add_argument(
+        "--hash-algorithm",
+        choices=HASH_ALGORITHMS,
+        help="Content hash for --duplicates (xxh3_128 and blake3 need the 'fasthash' extra)",
+    )
+    parser.add_argument(
+        "--hash-workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Hash files for --duplicates and --rebuild-hash-cache on N threads",
+    )
+    parser.add_argument(
+        "--stream", action="store_true", help="Move files while scanning (progress shows files discovered so far)"
+    )
 
     args = parser.parse_args()
     source_path = Path(args.source).resolve()
@@ -23,15 +76,32 @@ def main():
         print(f"Error: {source_path} is not a valid directory.")
         sys.exit(1)
 
-    organizer = FileOrganizer()
-
-    # Allow overriding the undo stack path for Docker persistence
-    if "UNDO_STACK_PATH" in os.environ:
-        from pro_file_organizer.core import constants
-
-        constants.DEFAULT_UNDO_STACK_FILE = Path(os.environ["UNDO_STACK_PATH"])
-        # Re-load to ensure we pick up the mounted file
-        organizer._load_undo_stack()
+    # State is loaded below, once the undo journal location is known
+    organizer = FileOrganizer(defer_state=True)
+    if args.hash_algorithm:
+        organizer.hash_algorithm = args.hash_algorithm
+    if args.ml_backend:
+        organizer.ml_backend = args.ml_backend
+
+    # Allow overriding the undo journal location for Docker persistence. UNDO_STACK_PATH names a
+    # pre-journal undo_stack.json, which is migrated into the journal next to it.
+    if "UNDO_JOURNAL_PATH" in os.environ or "UNDO_STACK_PATH" in os.environ:
+        legacy_file = os.environ.get("UNDO_STACK_PATH")
+        journal_dir = os.environ.get("UNDO_JOURNAL_PATH") or str(Path(legacy_file or ".").parent / ".undo_journal")
+        organizer.undo_journal = UndoJournal(journal_dir, legacy_file=legacy_file)
+    # Group commit: the journal is fsynced every N moves or after M ms, whichever comes first
+    if "UNDO_JOURNAL_SYNC_EVERY" in os.environ:
+        organizer.undo_journal.sync_every = int(os.environ["UNDO_JOURNAL_SYNC_EVERY"])
+    if "UNDO_JOURNAL_SYNC_INTERVAL_MS" in os.environ:
+        organizer.undo_journal.sync_interval_ms = int(os.environ["UNDO_JOURNAL_SYNC_INTERVAL_MS"])
+    # Loads the undo index and recovers runs interrupted in this journal
+    organizer.load_state()
+
+    if args.rebuild_hash_cache:
+        print(f"Rebuilding hash cache for {source_path}...")
+        count = organizer.rebuild_hash_cache(source_path, log_callback=print, workers=args.hash_workers)
+        print(f"Done. {count} files hashed.")
+        return
 
     if args.undo:
         print(f"Undoing last changes in {source_path}...")
@@ -42,8 +112,15 @@ def main():
     options = OrganizationOptions(
         source_path=source_path,
         recursive=args.recursive,
+        scan_workers=args.scan_workers,
+        hash_workers=args.hash_workers,
         use_ml=args.ml,
+        ml_batch_size=args.ml_batch_size,
+        extract_workers=args.extract_workers,
+        extract_timeout=args.extract_timeout,
         dry_run=args.dry_run,
+        detect_duplicates=args.duplicates,
+        streaming=args.stream,
         log_callback=print,
         progress_callback=lambda curr, total, name: print(f"[{curr}/{total}] Processing: {name}", end="\r"),
     )
@@ -59,6 +136,8 @@ def main():
     print(f"Renamed:     {result.get('renamed', 0)}")
     print(f"Duplicates:  {result.get('duplicates', 0)}")
     print(f"Errors:      {result.get('errors', 0)}")
+    for stage, counters in result.get("stages", {}).items():
+        print(f"  {stage:<11} {counters['items']} files in {counters['seconds']:.2f}s ({counters['per_second']}/s)")
 
     if result.get("errors", 0) > 0:
         print("\nReview the logs for error details.")
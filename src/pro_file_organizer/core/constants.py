@@ -20,12 +20,23 @@ def init_app_dirs():
 
 
 MAX_UNDO_STACK = 5
+HASH_CACHE_MAX_MB = 64
+EMBEDDING_CACHE_MAX_MB = 256
+# Undo journal group commit: fsync after this many moves or milliseconds, whichever comes first
+JOURNAL_SYNC_EVERY = 256
+JOURNAL_SYNC_INTERVAL_MS = 200
 
 DEFAULT_CONFIG_FILE = str(CONFIG_DIR / "config.json")
 DEFAULT_BATCH_CONFIG_FILE = str(CONFIG_DIR / "batch_config.json")
 DEFAULT_STATS_FILE = str(DATA_DIR / "stats.json")
 DEFAULT_RECENT_FILE = str(DATA_DIR / "recent.json")
+# Pre-journal undo history, migrated into DEFAULT_UNDO_JOURNAL_DIR on first load
 DEFAULT_UNDO_STACK_FILE = str(DATA_DIR / "undo_stack.json")
+DEFAULT_UNDO_JOURNAL_DIR = str(DATA_DIR / "undo_journal")
+DEFAULT_HASH_CACHE_FILE = str(DATA_DIR / "hash_cache.sqlite3")
+DEFAULT_EMBEDDING_CACHE_DIR = str(DATA_DIR / "embeddings")
+# Exported ONNX graphs for the "onnx" ML backend
+DEFAULT_ONNX_DIR = str(DATA_DIR / "onnx")
 
 DEFAULT_DIRECTORIES = {
     "Images": [".jpeg", ".jpg", ".tiff", ".gif", ".bmp", ".png", ".bpg", ".svg", ".heif", ".psd"],
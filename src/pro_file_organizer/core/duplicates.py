@@ -0,0 +1,183 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from .scanner import FileRecord
+
+# Bytes read from each end of a file for the partial hash. Files up to twice this size are read
+# completely, which makes their partial hash conclusive.
+PARTIAL_HASH_BLOCK = 16 * 1024
+
+HashFunc = Callable[[Path, Optional[FileRecord]], str]
+
+
+class _Entry:
+    __slots__ = ("record", "path", "size", "partial", "full", "moving")
+
+    def __init__(self, record: FileRecord, path: Path):
+        # record is dropped once the file moves, so hashes of the new location bypass the cache
+        self.record: Optional[FileRecord] = record
+        self.path = path
+        self.size = record.size
+        # Each stage holds None (not computed), a digest, or a Future while a hash worker computes it. A failed
+        # hash ("") is never kept, so a transient read error doesn't make the file unmatchable for the run.
+        self.partial: Union[None, str, Future] = None
+        self.full: Union[None, str, Future] = None
+        # Set while the file is being moved; its path is about to vanish, so hash workers leave it alone
+        self.moving = False
+
+
+class DuplicateIndex:
+    """
+    Staged duplicate detection: files are bucketed by byte size, a size collision triggers a hash of the
+    first and last PARTIAL_HASH_BLOCK bytes, and only files whose partial hashes also collide get a
+    full-content hash. Known files are never hashed unless a new file lands in their size bucket.
+
+    With `workers` > 1, prefetch() hashes upcoming files on a thread pool while the caller is busy with the
+    current one. Lookups still run in the caller's order, so the duplicates found are the same as serially.
+    """
+
+    def __init__(self, full_hash: HashFunc, partial_hash: HashFunc, workers: int = 1):
+        self._full_hash = full_hash
+        self._partial_hash = partial_hash
+        self._by_size: dict[int, list[_Entry]] = {}
+        self._by_identity: dict[tuple[int, int], _Entry] = {}
+        self._prefetched: dict[FileRecord, _Entry] = {}
+        self._lock = threading.Lock()
+        self._executor = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash-worker") if workers > 1 else None
+        )
+        self.partial_hashes = 0
+        self.full_hashes = 0
+
+    def __len__(self) -> int:
+        return len(self._by_identity)
+
+    def add(self, record: FileRecord, path: Optional[Path] = None) -> None:
+        """Registers a file as already present, without reading it."""
+        self._insert(_Entry(record, path or record.path), record)
+
+    def _insert(self, entry: _Entry, record: FileRecord):
+        self._by_size.setdefault(entry.size, []).append(entry)
+        self._by_identity[(record.device, record.inode)] = entry
+
+    def _compute(self, entry: _Entry, kind: str) -> str:
+        with self._lock:
+            if kind == "partial":
+                self.partial_hashes += 1
+            else:
+                self.full_hashes += 1
+        func = self._partial_hash if kind == "partial" else self._full_hash
+        return func(entry.path, entry.record)
+
+    def _get(self, entry: _Entry, kind: str) -> str:
+        if kind == "full" and entry.size <= 2 * PARTIAL_HASH_BLOCK:
+            # The partial hash already covered the whole file
+            return self._get(entry, "partial")
+        with self._lock:
+            value = getattr(entry, kind)
+        if value is None:
+            value = self._compute(entry, kind)
+        elif isinstance(value, Future):
+            value = value.result()
+        setattr(entry, kind, value or None)
+        return value
+
+    def _schedule(self, entry: _Entry, kind: str, func: Callable[..., str]):
+        assert self._executor is not None
+        with self._lock:
+            if getattr(entry, kind) is None and not entry.moving:
+                setattr(entry, kind, self._executor.submit(func, entry, kind))
+
+    def _prefetch_task(self, entry: _Entry, bucket: list[_Entry]) -> str:
+        """
+        Hashes an upcoming file and, if its partial hash matches a known file, both full hashes.
+        Waiting on the bucket's futures cannot deadlock: they were submitted first and the pool runs tasks in
+        submission order, so they are already running or done.
+        """
+        partial = self._compute(entry, "partial")
+        if not partial or entry.size <= 2 * PARTIAL_HASH_BLOCK:
+            return partial
+        matches = [e for e in bucket if not e.moving and self._get(e, "partial") == partial]
+        if matches:
+            for candidate in matches:
+                self._schedule(candidate, "full", self._compute)
+            full = self._compute(entry, "full")
+            if full:
+                with self._lock:
+                    entry.full = full
+        return partial
+
+    def prefetch(self, record: FileRecord) -> None:
+        """Starts hashing a file that find_duplicate() will be asked about soon. No-op without workers."""
+        if self._executor is None or record in self._prefetched:
+            return
+        bucket = self._by_size.get(record.size)
+        if not bucket:
+            return
+        for known in bucket:
+            self._schedule(known, "partial", self._compute)
+        entry = _Entry(record, record.path)
+        entry.partial = self._executor.submit(self._prefetch_task, entry, list(bucket))
+        self._prefetched[record] = entry
+
+    def find_duplicate(self, record: FileRecord) -> Optional[Path]:
+        """
+        Returns the path of a known file with identical content, or None.
+        Non-duplicates are registered so later files can match them. Files that cannot be read are
+        neither matched nor registered.
+        """
+        entry = self._prefetched.pop(record, None) or _Entry(record, record.path)
+        bucket = self._by_size.get(record.size)
+        if not bucket:
+            self._insert(entry, record)
+            return None
+
+        partial = self._get(entry, "partial")
+        if not partial:
+            return None
+        candidates = [e for e in bucket if self._get(e, "partial") == partial]
+        if candidates:
+            full = self._get(entry, "full")
+            if not full:
+                return None
+            for candidate in candidates:
+                if self._get(candidate, "full") == full:
+                    return candidate.path
+
+        self._insert(entry, record)
+        return None
+
+    def set_moving(self, record: FileRecord, moving: bool = True) -> None:
+        """
+        Marks the file registered for `record` as being moved, so prefetch() doesn't hash it at a path that is
+        about to disappear. relocate() clears the mark; call this with moving=False if the move fails instead.
+        """
+        entry = self._by_identity.get((record.device, record.inode))
+        if entry is not None:
+            with self._lock:
+                entry.moving = moving
+
+    def relocate(self, record: FileRecord, new_path: Path) -> None:
+        """Points the entry registered for `record` at the place the file was moved to."""
+        entry = self._by_identity.get((record.device, record.inode))
+        if entry is None:
+            return
+        with self._lock:
+            entry.path = new_path
+            entry.record = None
+            entry.moving = False
+            # A digest of the old path is still valid for the same content; a hash that failed or is still
+            # running there (and may fail once the file is gone) is redone at the new path
+            for kind in ("partial", "full"):
+                value = getattr(entry, kind)
+                if isinstance(value, Future):
+                    value = value.result() if value.done() and not value.cancelled() and not value.exception() else None
+                setattr(entry, kind, value or None)
+
+    def close(self):
+        """Stops the hash workers; pending prefetches are dropped."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,182 @@
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from .logger import logger
+from .scanner import FileRecord
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    slot INTEGER NOT NULL UNIQUE,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (device, inode)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+"""
+
+# Rows allocated when the vector file is created; it doubles from there up to the size limit
+_INITIAL_ROWS = 1024
+
+
+def model_key(model_id: str, revision: Optional[str], variant: str = "") -> str:
+    """Directory-safe name for one model revision (plus e.g. the embedding kind)."""
+    raw = f"{model_id}@{revision or 'unknown'}{'-' + variant if variant else ''}"
+    return re.sub(r"[^A-Za-z0-9._@-]+", "_", raw)
+
+
+class EmbeddingStore:
+    """
+    Disk-backed per-file embedding vectors for one model revision, keyed on (device, inode, size, mtime_ns).
+
+    Vectors live in a memory-mapped float16 matrix (``vectors.f16``), one row per file, and a small SQLite index
+    maps each file to its row. A row only answers while the file's size and mtime still match. Once `max_bytes`
+    worth of rows are in use, the least recently used row is reused. Needs numpy, which the ML extra provides.
+    """
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int):
+        import numpy as np
+
+        self._np = np
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._touched: dict[tuple[int, int], int] = {}
+        self._lock = threading.Lock()
+        self._vectors: Any = None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = self.directory / "vectors.f16"
+        self._conn = sqlite3.connect(str(self.directory / "index.sqlite3"), check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        self.dim: Optional[int] = int(row[0]) if row else None
+        if self.dim is not None:
+            self._open_vectors()
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of rows allowed by max_bytes."""
+        return max(1, self.max_bytes // (2 * (self.dim or 1)))
+
+    def _open_vectors(self, rows: Optional[int] = None):
+        assert self.dim is not None
+        row_bytes = 2 * self.dim
+        existing = self._vectors_path.stat().st_size // row_bytes if self._vectors_path.exists() else 0
+        rows = max(rows or 0, existing, min(_INITIAL_ROWS, self.capacity))
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+        with open(self._vectors_path, "ab") as f:
+            f.truncate(rows * row_bytes)
+        self._vectors = self._np.memmap(self._vectors_path, dtype=self._np.float16, mode="r+", shape=(rows, self.dim))
+
+    def _reset(self, dim: int):
+        """Starts over with a new vector width (a different model output)."""
+        self._conn.execute("DELETE FROM entries")
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('dim', ?)", (str(dim),))
+        self._conn.commit()
+        self._vectors = None
+        self._vectors_path.unlink(missing_ok=True)
+        self._touched.clear()
+        self.dim = dim
+        self._open_vectors()
+
+    def get(self, record: FileRecord) -> Optional[Any]:
+        """Returns the stored vector (float32) for an unchanged file, or None."""
+        key = (record.device, record.inode)
+        with self._lock:
+            if self._vectors is None:
+                self.misses += 1
+                return None
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, slot FROM entries WHERE device = ? AND inode = ?", key
+            ).fetchone()
+            if row is None or row[0] != record.size or row[1] != record.mtime_ns:
+                self.misses += 1
+                return None
+            self._touched[key] = time.time_ns()
+            self.hits += 1
+            return self._np.array(self._vectors[row[2]], dtype=self._np.float32)
+
+    def contains(self, record: FileRecord) -> bool:
+        """Whether get() would return a vector, without counting a hit or touching the entry."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns FROM entries WHERE device = ? AND inode = ?", (record.device, record.inode)
+            ).fetchone()
+            return row is not None and self._vectors is not None and tuple(row) == (record.size, record.mtime_ns)
+
+    def put(self, record: FileRecord, vector: Any):
+        vector = self._np.asarray(vector, dtype=self._np.float16).reshape(-1)
+        key = (record.device, record.inode)
+        with self._lock:
+            if self.dim != vector.shape[0]:
+                self._reset(vector.shape[0])
+
+            row = self._conn.execute("SELECT slot FROM entries WHERE device = ? AND inode = ?", key).fetchone()
+            if row is not None:
+                slot = row[0]
+            else:
+                slot = self._free_slot()
+            if slot >= self._vectors.shape[0]:
+                self._open_vectors(max(slot + 1, min(self.capacity, self._vectors.shape[0] * 2)))
+            self._vectors[slot] = vector
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (device, inode, size, mtime_ns, slot, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (record.device, record.inode, record.size, record.mtime_ns, slot, time.time_ns()),
+            )
+
+    def _free_slot(self) -> int:
+        count = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        if count < self.capacity:
+            # Rows are only ever freed by eviction, which reuses them at once, so slots stay dense
+            return count
+        # Full: reuse the least recently used row
+        self._write_touched()
+        device, inode, slot = self._conn.execute(
+            "SELECT device, inode, slot FROM entries ORDER BY last_used LIMIT 1"
+        ).fetchone()
+        self._conn.execute("DELETE FROM entries WHERE device = ? AND inode = ?", (device, inode))
+        self._touched.pop((device, inode), None)
+        return slot
+
+    def _write_touched(self):
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE entries SET last_used = ? WHERE device = ? AND inode = ?",
+                [(ts, *key) for key, ts in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def flush(self):
+        """Writes vectors, access times and index changes to disk."""
+        with self._lock:
+            try:
+                self._write_touched()
+                self._conn.commit()
+                if self._vectors is not None:
+                    self._vectors.flush()
+            except (sqlite3.Error, OSError) as e:
+                logger.error(f"Error flushing embedding cache: {e}")
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._vectors = None
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
@@ -0,0 +1,159 @@
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from pathlib import Path
+from typing import Any, Optional
+
+from .logger import logger
+
+PLAIN_TEXT_EXTENSIONS = {".txt", ".md", ".py", ".js", ".html", ".css", ".json", ".xml"}
+
+# Extra time the parent waits past the worker's own deadline before giving up on a file
+_TIMEOUT_GRACE = 2.0
+
+
+class ExtractionTimeoutError(BaseException):
+    """Raised by the worker's alarm; a BaseException so the parsers' broad `except Exception` can't swallow it."""
+
+
+def extract_text(file_path: Path, pypdf: Any = None, docx: Any = None) -> str:
+    """Extracts text from plain-text files, PDFs (first 3 pages, needs pypdf) and DOCX (needs python-docx)."""
+    ext = file_path.suffix.lower()
+    content = ""
+
+    try:
+        if ext in PLAIN_TEXT_EXTENSIONS:
+            with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+                content = f.read(5000)  # Limit to first 5KB
+
+        elif ext == ".pdf" and pypdf:
+            try:
+                reader = pypdf.PdfReader(file_path)
+                # Extract text from first few pages
+                for i in range(min(3, len(reader.pages))):
+                    page_text = reader.pages[i].extract_text()
+                    if page_text:
+                        content += page_text + "\n"
+            except Exception as e:
+                logger.error(f"PDF extraction error: {e}")
+
+        elif ext == ".docx" and docx:
+            try:
+                doc = docx.Document(file_path)
+                # Limit paragraphs
+                paragraphs = [p.text for p in doc.paragraphs[:50]]
+                content = "\n".join(paragraphs)
+            except Exception as e:
+                logger.error(f"Docx extraction error: {e}")
+
+    except Exception as e:
+        logger.error(f"Error extracting text from {file_path}: {e}")
+
+    return content
+
+
+def _on_alarm(signum, frame):
+    raise ExtractionTimeoutError()
+
+
+def _extract_in_worker(path: str, timeout: float) -> tuple[str, float, bool]:
+    """
+    Worker-process entry point. Returns (text, seconds spent, timed out). On POSIX the worker interrupts
+    itself after `timeout` seconds, so one pathological PDF cannot hold a pool slot.
+    """
+    try:
+        import pypdf
+    except ImportError:
+        pypdf = None  # type: ignore[assignment]
+    try:
+        import docx
+    except ImportError:
+        docx = None  # type: ignore[assignment]
+
+    start = time.perf_counter()
+    alarm = hasattr(signal, "setitimer") and timeout > 0
+    if alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        text = extract_text(Path(path), pypdf, docx)
+        timed_out = False
+    except ExtractionTimeoutError:
+        text, timed_out = "", True
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    return text, time.perf_counter() - start, timed_out
+
+
+class TextExtractor:
+    """
+    Extracts document text on a process pool, off the inference thread and outside its GIL.
+    `submit()` queues a file as soon as the scan reaches it; `get()` waits for its text, giving up after
+    `timeout` seconds (the file is then categorized by extension). Workers use the "spawn" start method,
+    which is safe next to the scanner, hashing and UI threads.
+    """
+
+    def __init__(self, workers: int, timeout: float = 30.0):
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.extracted = 0
+        self.timeouts = 0
+        self.errors = 0
+        # Worker time spent extracting, summed over processes
+        self.seconds = 0.0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending: dict[str, Future] = {}
+
+    def submit(self, path: Path):
+        key = str(path)
+        if key in self._pending:
+            return
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self._pending[key] = self._pool.submit(_extract_in_worker, key, self.timeout)
+
+    def get(self, path: Path) -> str:
+        """Text of `path`, submitting it now if it was not queued ahead of time."""
+        self.submit(path)
+        future = self._pending.pop(str(path))
+        deadline = self.timeout + _TIMEOUT_GRACE if self.timeout > 0 else None
+        try:
+            text, seconds, timed_out = future.result(timeout=deadline)
+        except FutureTimeout:
+            future.cancel()
+            self.timeouts += 1
+            logger.warning(f"Text extraction timed out after {self.timeout:.0f}s: {path}")
+            return ""
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Error extracting text from {path}: {e}")
+            return ""
+        self.seconds += seconds
+        if timed_out:
+            self.timeouts += 1
+            logger.warning(f"Text extraction timed out after {self.timeout:.0f}s: {path}")
+        else:
+            self.extracted += 1
+        return text
+
+    def discard(self, path: Path):
+        """Drops a submitted file whose text is no longer needed, cancelling it if it has not started."""
+        future = self._pending.pop(str(path), None)
+        if future is not None:
+            future.cancel()
+
+    def close(self):
+        """Drops queued work. Workers still stuck on a file (no SIGALRM on Windows) are terminated."""
+        if self._pool is None:
+            return
+        stuck = any(not f.done() for f in self._pending.values()) or self.timeouts > 0
+        self._pending.clear()
+        if stuck and os.name == "nt":
+            for process in list(getattr(self._pool, "_processes", {}).values()):
+                process.terminate()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pool = None
@@ -0,0 +1,135 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+from .logger import logger
+from .scanner import FileRecord
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (device, inode, algorithm)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS hashes_last_used ON hashes (last_used);
+"""
+
+
+class HashCache:
+    """
+    Persistent content-hash index keyed on (device, inode, size, mtime_ns).
+
+    A row only answers a lookup while the file's size and mtime still match; otherwise it is dropped and the
+    file is hashed again. Access times are tracked in memory and written on flush(), which also evicts the
+    least recently used rows once the database grows past `max_bytes`.
+    """
+
+    def __init__(self, path: Union[str, Path], max_bytes: int):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._touched: dict[tuple[int, int, str], int] = {}
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Runs move between worker threads; every access goes through self._lock
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def get(self, record: FileRecord, algorithm: str) -> Optional[str]:
+        key = (record.device, record.inode, algorithm)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, digest FROM hashes WHERE device = ? AND inode = ? AND algorithm = ?", key
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            size, mtime_ns, digest = row
+            if size != record.size or mtime_ns != record.mtime_ns:
+                # File changed (or the inode was reused) since it was hashed
+                self._conn.execute("DELETE FROM hashes WHERE device = ? AND inode = ? AND algorithm = ?", key)
+                self._touched.pop(key, None)
+                self.misses += 1
+                return None
+            self._touched[key] = time.time_ns()
+            self.hits += 1
+            return digest
+
+    def put(self, record: FileRecord, algorithm: str, digest: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO hashes (device, inode, algorithm, size, mtime_ns, digest, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (record.device, record.inode, algorithm, record.size, record.mtime_ns, digest, time.time_ns()),
+            )
+
+    def flush(self):
+        """Commits pending writes and access times, then enforces the size limit."""
+        with self._lock:
+            try:
+                if self._touched:
+                    self._conn.executemany(
+                        "UPDATE hashes SET last_used = ? WHERE device = ? AND inode = ? AND algorithm = ?",
+                        [(ts, *key) for key, ts in self._touched.items()],
+                    )
+                    self._touched.clear()
+                self._conn.commit()
+                self._evict()
+            except sqlite3.Error as e:
+                logger.error(f"Error flushing hash cache: {e}")
+
+    def _db_bytes(self) -> int:
+        page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        pages = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        free = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return (pages - free) * page_size
+
+    def _evict(self):
+        used = self._db_bytes()
+        if used <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+        if not rows:
+            return
+        # Drop the oldest rows down to 90% of the limit, estimated from the average row size
+        keep = int(rows * (self.max_bytes * 0.9) / used)
+        self._conn.execute(
+            "DELETE FROM hashes WHERE (device, inode, algorithm) IN "
+            "(SELECT device, inode, algorithm FROM hashes ORDER BY last_used LIMIT ?)",
+            (rows - keep,),
+        )
+        self._conn.commit()
+        self._conn.execute("PRAGMA incremental_vacuum").fetchall()
+        logger.info(f"Hash cache evicted {rows - keep} entries")
+
+    def clear(self):
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM hashes")
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+
+    @property
+    def size_bytes(self) -> int:
+        with self._lock:
+            return self._db_bytes()
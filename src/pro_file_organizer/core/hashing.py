@@ -0,0 +1,118 @@
+import hashlib
+import mmap
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Union
+
+from .logger import logger
+
+DEFAULT_HASH_ALGORITHM = "blake2b"
+
+# Read buffer for streamed hashing; files at least MMAP_THRESHOLD bytes long are mapped instead
+READ_BUFFER_SIZE = 1024 * 1024
+MMAP_THRESHOLD = 64 * 1024 * 1024
+
+_local = threading.local()
+
+
+def _xxh3_128():
+    import xxhash
+
+    return xxhash.xxh3_128()
+
+
+def _blake3():
+    from blake3 import blake3
+
+    return blake3()
+
+
+# Name -> hasher factory. Optional backends are imported on first use.
+_FACTORIES: dict[str, Callable[[], Any]] = {
+    "sha256": hashlib.sha256,
+    "blake2b": hashlib.blake2b,
+    "xxh3_128": _xxh3_128,
+    "blake3": _blake3,
+}
+
+HASH_ALGORITHMS = tuple(_FACTORIES)
+
+
+def available_algorithms() -> list[str]:
+    """Returns the configured algorithms that can be used in this environment."""
+    available = []
+    for name, factory in _FACTORIES.items():
+        try:
+            factory()
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+
+@lru_cache(maxsize=None)
+def resolve_algorithm(name: str) -> str:
+    """Returns `name` if it can be used, otherwise logs a warning and falls back to the default."""
+    if name in _FACTORIES:
+        try:
+            _FACTORIES[name]()
+            return name
+        except ImportError:
+            logger.warning(f"Hash algorithm '{name}' is not installed, using {DEFAULT_HASH_ALGORITHM}")
+            return DEFAULT_HASH_ALGORITHM
+    logger.warning(f"Unknown hash algorithm '{name}', using {DEFAULT_HASH_ALGORITHM}")
+    return DEFAULT_HASH_ALGORITHM
+
+
+def _buffer() -> bytearray:
+    # One reusable buffer per thread, so hashing threads never share it
+    buf = getattr(_local, "buffer", None)
+    if buf is None:
+        buf = _local.buffer = bytearray(READ_BUFFER_SIZE)
+    return buf
+
+
+def _tag(algorithm: str, hasher) -> str:
+    return f"{algorithm}:{hasher.hexdigest()}"
+
+
+def hash_file(path: Union[str, Path], algorithm: str = DEFAULT_HASH_ALGORITHM) -> str:
+    """
+    Hashes a whole file and returns the digest tagged with its algorithm ("blake2b:<hex>").
+    Raises OSError if the file cannot be read.
+    """
+    hasher = _FACTORIES[algorithm]()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher.update(mm)
+            return _tag(algorithm, hasher)
+
+        buf = _buffer()
+        view = memoryview(buf)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            hasher.update(view[:n])
+    return _tag(algorithm, hasher)
+
+
+def hash_file_ends(path: Union[str, Path], block: int, algorithm: str = DEFAULT_HASH_ALGORITHM) -> str:
+    """
+    Hashes the first and last `block` bytes of a file (the whole file if it is at most 2 * block long).
+    The digest is tagged like hash_file(). Raises OSError if the file cannot be read.
+    """
+    hasher = _FACTORIES[algorithm]()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= 2 * block:
+            hasher.update(f.read())
+        else:
+            hasher.update(f.read(block))
+            f.seek(-block, os.SEEK_END)
+            hasher.update(f.read(block))
+    return _tag(algorithm, hasher)
@@ -0,0 +1,79 @@
+from pathlib import Path
+from typing import Any
+
+from .logger import logger
+
+# "torch": full-precision PyTorch on the best device (CUDA/MPS/CPU).
+# "torch-int8": dynamic int8 quantization of the Linear layers, CPU only.
+# "onnx": ONNX Runtime on CPU; needs the `onnx` extra.
+ML_BACKENDS = ("torch", "torch-int8", "onnx")
+DEFAULT_ML_BACKEND = "torch"
+
+# Opset supported by the onnxruntime versions the `onnx` extra allows
+ONNX_OPSET = 17
+
+
+def resolve_backend(name: str) -> str:
+    """Returns `name` if its dependencies are installed, otherwise warns and falls back to the default."""
+    if name not in ML_BACKENDS:
+        logger.warning(f"Unknown ML backend '{name}', using {DEFAULT_ML_BACKEND}")
+        return DEFAULT_ML_BACKEND
+    if name == "onnx":
+        try:
+            import onnxruntime  # noqa: F401
+        except ImportError:
+            logger.warning("ML backend 'onnx' needs onnxruntime (pip install .[onnx]); using torch")
+            return DEFAULT_ML_BACKEND
+    return name
+
+
+def quantize_dynamic(torch: Any, model: Any) -> Any:
+    """int8 dynamic quantization: Linear weights are stored as int8, activations are quantized on the fly."""
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class OnnxImageEncoder:
+    """
+    SigLIP vision tower exported to ONNX: pixel values in, unnormalized image features out, as a torch tensor
+    so the rest of the scoring code is unchanged.
+    """
+
+    def __init__(self, model_path: Path, torch: Any, threads: int = 0):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.torch = torch
+        self.session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+
+    def __call__(self, pixel_values: Any) -> Any:
+        (features,) = self.session.run(None, {"pixel_values": pixel_values.cpu().numpy()})
+        return self.torch.from_numpy(features)
+
+
+def export_image_encoder(torch: Any, model: Any, image_size: int, path: Path):
+    """Exports `model.get_image_features` with a dynamic batch axis. Written to a temp file, then renamed."""
+
+    class _VisionFeatures(torch.nn.Module):
+        def __init__(self, wrapped):
+            super().__init__()
+            self.wrapped = wrapped
+
+        def forward(self, pixel_values):
+            return self.wrapped.get_image_features(pixel_values=pixel_values)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    dummy = torch.zeros(1, 3, image_size, image_size)
+    with torch.no_grad():
+        torch.onnx.export(
+            _VisionFeatures(model.cpu().eval()),
+            (dummy,),
+            str(tmp),
+            input_names=["pixel_values"],
+            output_names=["image_features"],
+            dynamic_axes={"pixel_values": {0: "batch"}, "image_features": {0: "batch"}},
+            opset_version=ONNX_OPSET,
+        )
+    tmp.replace(path)
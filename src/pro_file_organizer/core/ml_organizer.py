@@ -1,17 +1,50 @@
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Union
 
+from .constants import DEFAULT_ONNX_DIR, EMBEDDING_CACHE_MAX_MB
+from .extraction import extract_text
 from .logger import logger
+from .ml_backends import DEFAULT_ML_BACKEND, OnnxImageEncoder, export_image_encoder, quantize_dynamic, resolve_backend
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"}
+TEXT_EXTENSIONS = {".txt", ".md", ".py", ".js", ".html", ".pdf", ".docx", ".css", ".json"}
+TEXT_INSTRUCTION = "Instruct: Classify this content into file categories\nQuery:"
+
+TEXT_MODEL_ID = "Qwen/Qwen3-Embedding-0.6B"
+IMAGE_MODEL_ID = "google/siglip2-base-patch32-256"
+
+# Files per forward pass in the batch API
+DEFAULT_BATCH_SIZE = 16
 
 
 class MultimodalFileOrganizer:
-    def __init__(self, categories_config: Optional[Dict[str, Any]] = None):
+    def __init__(
+        self,
+        categories_config: Optional[Dict[str, Any]] = None,
+        embedding_cache_dir: Optional[Union[str, Path]] = None,
+        embedding_cache_max_mb: float = EMBEDDING_CACHE_MAX_MB,
+        backend: str = DEFAULT_ML_BACKEND,
+    ):
         self.device = self._get_device_early()
+        # Inference backend, see ml_backends.ML_BACKENDS; checked against installed packages in load_models()
+        self.backend = backend
+        self.onnx_dir = Path(DEFAULT_ONNX_DIR)
+        # ONNX Runtime session replacing the SigLIP vision tower with the "onnx" backend
+        self.image_encoder: Any = None
         self.categories_config = categories_config or {}
         self.text_model: Any = None
         self.image_model: Any = None
         self.image_processor: Any = None
         self.text_category_embeddings: Dict[str, Any] = {}
+        self.batch_size = DEFAULT_BATCH_SIZE
+        # SigLIP label text features, see _get_label_features()
+        self._label_features: Any = None
+        self._label_features_key: Optional[tuple] = None
+        # Per-file embeddings kept across runs (see embedding_cache.py); opened by load_models()
+        self.embedding_cache_dir = embedding_cache_dir
+        self.embedding_cache_max_mb = embedding_cache_max_mb
+        self.image_embeddings: Any = None
+        self.text_embeddings: Any = None
 
         # Lazy modules
         self.docx: Any = None
@@ -55,14 +88,14 @@ class MultimodalFileOrganizer:
             from huggingface_hub import try_to_load_from_cache
 
             # Check SigLIP 2 weights
-            siglip = try_to_load_from_cache("google/siglip2-base-patch32-256", "model.safetensors")
+            siglip = try_to_load_from_cache(IMAGE_MODEL_ID, "model.safetensors")
             if siglip is None:
-                siglip = try_to_load_from_cache("google/siglip2-base-patch32-256", "pytorch_model.bin")
+                siglip = try_to_load_from_cache(IMAGE_MODEL_ID, "pytorch_model.bin")
 
             # Check Qwen weights
-            qwen = try_to_load_from_cache("Qwen/Qwen3-Embedding-0.6B", "model.safetensors")
+            qwen = try_to_load_from_cache(TEXT_MODEL_ID, "model.safetensors")
             if qwen is None:
-                qwen = try_to_load_from_cache("Qwen/Qwen3-Embedding-0.6B", "pytorch_model.bin")
+                qwen = try_to_load_from_cache(TEXT_MODEL_ID, "pytorch_model.bin")
 
             return siglip is not None and qwen is not None
         except Exception:
@@ -101,8 +134,9 @@ class MultimodalFileOrganizer:
             self.AutoTokenizer = AutoTokenizer_cls
             self.cosine_similarity = cosine_similarity_func
 
-            # Update device now that torch is loaded
-            self.device = self._get_device()
+            # Update device now that torch is loaded; quantized and ONNX backends run on the CPU
+            self.backend = resolve_backend(self.backend)
+            self.device = self._get_device() if self.backend == "torch" else "cpu"
 
         except Exception as e:
             logger.error(f"Failed to import ML dependencies: {e}")
@@ -113,9 +147,7 @@ class MultimodalFileOrganizer:
                 progress_callback("Loading Text Model (Qwen)...", 0.1)
 
             # Load Text Model
-            self.text_model = self.SentenceTransformer(
-                "Qwen/Qwen3-Embedding-0.6B", device=self.device, trust_remote_code=True
-            )
+            self.text_model = self._load_text_model()
 
             if progress_callback:
                 progress_callback("Loading Image Model (SigLIP)...", 0.4)
@@ -123,18 +155,28 @@ class MultimodalFileOrganizer:
             # Load Image Model
             self.image_model = (
                 self.AutoModel.from_pretrained(
-                    "google/siglip2-base-patch32-256",
+                    IMAGE_MODEL_ID,
                 )
                 .to(self.device)
                 .eval()
             )
 
-            self.image_processor = self.AutoProcessor.from_pretrained("google/siglip2-base-patch32-256")
+            self.image_processor = self.AutoProcessor.from_pretrained(IMAGE_MODEL_ID)
+
+            if self.backend == "torch-int8":
+                self.image_model = quantize_dynamic(self.torch, self.image_model)
+            elif self.backend == "onnx":
+                if progress_callback:
+                    progress_callback("Preparing ONNX image encoder...", 0.7)
+                self.image_encoder = self._load_onnx_image_encoder()
+                self._drop_vision_tower()
 
             if progress_callback:
                 progress_callback("Precomputing embeddings...", 0.8)
 
             self._precompute_text_embeddings()
+            self._get_label_features()
+            self._open_embedding_caches()
 
             if progress_callback:
                 progress_callback("Models loaded.", 1.0)
@@ -146,10 +188,89 @@ class MultimodalFileOrganizer:
             logger.error(f"Error loading ML models: {e}")
             return False
 
+    def _load_text_model(self):
+        if self.backend == "onnx":
+            try:
+                # sentence-transformers exports the model through optimum when the repo has no ONNX file
+                return self.SentenceTransformer(TEXT_MODEL_ID, device="cpu", trust_remote_code=True, backend="onnx")
+            except Exception as e:
+                logger.warning(f"ONNX text model unavailable ({e}); using PyTorch for text")
+        text_model = self.SentenceTransformer(TEXT_MODEL_ID, device=self.device, trust_remote_code=True)
+        if self.backend == "torch-int8":
+            text_model = quantize_dynamic(self.torch, text_model)
+        return text_model
+
+    def _load_onnx_image_encoder(self):
+        """
+        Loads the exported SigLIP vision tower, exporting it on first use (cached per model revision).
+        The PyTorch text tower stays loaded for the label features; the vision tower is freed afterwards.
+        """
+        from .embedding_cache import model_key
+
+        revision = self._model_revision(getattr(self.image_model, "config", None))
+        path = self.onnx_dir / model_key(IMAGE_MODEL_ID, revision) / "vision.onnx"
+        if not path.exists():
+            image_size = getattr(getattr(self.image_model.config, "vision_config", None), "image_size", 256)
+            export_image_encoder(self.torch, self.image_model, image_size, path)
+        return OnnxImageEncoder(path, self.torch)
+
+    def _drop_vision_tower(self):
+        """
+        Frees the PyTorch vision tower once the ONNX encoder has replaced it. Only the text tower (for the label
+        features) and logit_scale/logit_bias (for scoring) are used after that.
+        """
+        if getattr(self.image_model, "vision_model", None) is None:
+            return
+        self.image_model.vision_model = None
+        import gc
+
+        gc.collect()
+
+    @staticmethod
+    def _model_revision(config) -> Optional[str]:
+        """Hub commit the weights were loaded from, when transformers recorded it."""
+        revision = getattr(config, "_commit_hash", None)
+        return revision if isinstance(revision, str) else None
+
+    def _open_embedding_caches(self):
+        """
+        Opens one EmbeddingStore per model revision. A new model or revision gets a fresh store, so vectors
+        from different weights never mix. Errors only disable the cache.
+        """
+        if self.embedding_cache_dir is None or self.embedding_cache_max_mb <= 0:
+            return
+        from .embedding_cache import EmbeddingStore, model_key
+
+        root = Path(self.embedding_cache_dir)
+        max_bytes = int(self.embedding_cache_max_mb * 1024 * 1024)
+        try:
+            image_revision = self._model_revision(getattr(self.image_model, "config", None))
+            # Quantized and ONNX outputs differ slightly from fp32, so each backend keeps its own vectors
+            suffix = "" if self.backend == DEFAULT_ML_BACKEND else f"-{self.backend}"
+            self.image_embeddings = EmbeddingStore(
+                root / model_key(IMAGE_MODEL_ID, image_revision, "image" + suffix), max_bytes // 2
+            )
+            try:
+                text_config = self.text_model[0].auto_model.config
+            except Exception:
+                text_config = None
+            self.text_embeddings = EmbeddingStore(
+                root / model_key(TEXT_MODEL_ID, self._model_revision(text_config), "text" + suffix), max_bytes // 2
+            )
+        except Exception as e:
+            logger.error(f"Embedding cache unavailable: {e}")
+            self.image_embeddings = None
+            self.text_embeddings = None
+
+    def flush_embedding_cache(self):
+        for store in (self.image_embeddings, self.text_embeddings):
+            if store is not None:
+                store.flush()
+
     def _precompute_text_embeddings(self):
         """Precompute category embeddings for text"""
         self.text_category_embeddings = {}
-        instruction = "Instruct: Classify this content into file categories\nQuery:"
+        instruction = TEXT_INSTRUCTION
 
         if not self.categories_config:
             return
@@ -162,38 +283,73 @@ class MultimodalFileOrganizer:
 
     def extract_text(self, file_path: Path):
         """Extracts text from various file formats."""
-        ext = file_path.suffix.lower()
-        content = ""
+        return extract_text(file_path, self.pypdf, self.docx)
 
-        try:
-            if ext in [".txt", ".md", ".py", ".js", ".html", ".css", ".json", ".xml"]:
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read(5000)  # Limit to first 5KB
+    def needs_text(self, record) -> bool:
+        """Whether smart_categorize_many() will extract this file's text, i.e. its embedding is not cached."""
+        if record.suffix.lower() not in TEXT_EXTENSIONS:
+            return False
+        return self.text_embeddings is None or not self.text_embeddings.contains(record)
 
-            elif ext == ".pdf" and self.pypdf:
-                try:
-                    reader = self.pypdf.PdfReader(file_path)
-                    # Extract text from first few pages
-                    for i in range(min(3, len(reader.pages))):
-                        page_text = reader.pages[i].extract_text()
-                        if page_text:
-                            content += page_text + "\n"
-                except Exception as e:
-                    logger.error(f"PDF extraction error: {e}")
+    def _visual_labels(self) -> tuple[list[str], dict[str, str]]:
+        """Collects all visual descriptions and the category each belongs to."""
+        all_labels = []
+        label_to_category = {}
 
-            elif ext == ".docx" and self.docx:
-                try:
-                    doc = self.docx.Document(file_path)
-                    # Limit paragraphs
-                    paragraphs = [p.text for p in doc.paragraphs[:50]]
-                    content = "\n".join(paragraphs)
-                except Exception as e:
-                    logger.error(f"Docx extraction error: {e}")
+        for cat, desc in self.categories_config.items():
+            if "visual" in desc:
+                visual_descs = desc["visual"]
+                if isinstance(visual_descs, str):
+                    visual_descs = [visual_descs]
 
-        except Exception as e:
-            logger.error(f"Error extracting text from {file_path}: {e}")
+                for label in visual_descs:
+                    all_labels.append(label)
+                    label_to_category[label] = cat
+
+        return all_labels, label_to_category
 
-        return content
+    def _get_label_features(self) -> tuple[list[str], dict[str, str], Any]:
+        """
+        Returns (labels, label -> category, label text features). The SigLIP text features are encoded once and
+        cached as a normalized (labels x dim) tensor; they are recomputed only when the visual labels change.
+        """
+        all_labels, label_to_category = self._visual_labels()
+        key = tuple((label, label_to_category[label]) for label in all_labels)
+        if key != self._label_features_key:
+            features = None
+            if all_labels:
+                text_inputs = self.image_processor(text=all_labels, return_tensors="pt", padding="max_length").to(
+                    self.device
+                )
+                with self.torch.no_grad():
+                    features = self.image_model.get_text_features(**text_inputs)
+                    features = features / features.norm(p=2, dim=-1, keepdim=True)
+            self._label_features = features
+            self._label_features_key = key
+        return all_labels, label_to_category, self._label_features
+
+    def _image_label_probs(self, images: list, label_features) -> Any:
+        """
+        Sigmoid scores (images x labels) from a vision-tower pass and one matrix product against the cached
+        label features, using the model's logit scale and bias exactly like the full SigLIP forward.
+        """
+        return self._label_probs(self._image_features(images), label_features)
+
+    def _image_features(self, images: list) -> Any:
+        """Normalized SigLIP image features (images x dim) from the vision tower."""
+        inputs = self.image_processor(images=images, return_tensors="pt").to(self.device)
+        with self.torch.no_grad():
+            if self.image_encoder is not None:
+                image_features = self.image_encoder(inputs["pixel_values"])
+            else:
+                image_features = self.image_model.get_image_features(**inputs)
+            return image_features / image_features.norm(p=2, dim=-1, keepdim=True)
+
+    def _label_probs(self, image_features, label_features) -> Any:
+        with self.torch.no_grad():
+            scale = self.image_model.logit_scale.exp()
+            logits = image_features @ label_features.T * scale + self.image_model.logit_bias
+            return self.torch.sigmoid(logits)
 
     def categorize_image(self, image_path):
         """Categorize image using SigLIP 2"""
@@ -203,32 +359,12 @@ class MultimodalFileOrganizer:
         try:
             image = self.Image.open(image_path).convert("RGB")
 
-            # Collect all visual descriptions
-            all_labels = []
-            label_to_category = {}
-
-            for cat, desc in self.categories_config.items():
-                if "visual" in desc:
-                    visual_descs = desc["visual"]
-                    if isinstance(visual_descs, str):
-                        visual_descs = [visual_descs]
-
-                    for label in visual_descs:
-                        all_labels.append(label)
-                        label_to_category[label] = cat
-
+            all_labels, label_to_category, label_features = self._get_label_features()
             if not all_labels:
                 return None, 0.0
 
-            # Prepare inputs
-            inputs = self.image_processor(images=image, text=all_labels, return_tensors="pt", padding="max_length").to(
-                self.device
-            )
-
             # Get predictions
-            with self.torch.no_grad():
-                outputs = self.image_model(**inputs)
-                probs = self.torch.sigmoid(outputs.logits_per_image[0])
+            probs = self._image_label_probs([image], label_features)[0]
 
             # Find best match
             best_idx = probs.argmax().item()
@@ -248,7 +384,7 @@ class MultimodalFileOrganizer:
             return None, 0.0
 
         try:
-            instruction = "Instruct: Classify this content into file categories\nQuery:"
+            instruction = TEXT_INSTRUCTION
             # Qwen embedding
             content_emb = self.text_model.encode(
                 f"{instruction}{content[:2000]}", prompt_name="query", convert_to_numpy=True
@@ -286,13 +422,13 @@ class MultimodalFileOrganizer:
         file_ext = file_path.suffix.lower()
 
         # Image files
-        if file_ext in [".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"]:
+        if file_ext in IMAGE_EXTENSIONS:
             category, confidence = self.categorize_image(file_path)
             if category:
                 return category, confidence, "image-ml"
 
         # Text-extractable files
-        elif file_ext in [".txt", ".md", ".py", ".js", ".html", ".pdf", ".docx", ".css", ".json"]:
+        elif file_ext in TEXT_EXTENSIONS:
             content = self.extract_text(file_path)
             if content:
                 category, confidence = self.categorize_text_file(file_path, content)
@@ -300,3 +436,163 @@ class MultimodalFileOrganizer:
                     return category, confidence, "text-ml"
 
         return None, 0.0, "extension"
+
+    def categorize_images(self, image_paths: list, records: Optional[list] = None) -> list[tuple[Optional[str], float]]:
+        """
+        Batched categorize_image: runs SigLIP on up to batch_size images per forward pass.
+        With `records` (FileRecords matching `image_paths`) and the embedding cache open, unchanged images are
+        scored from their stored features without being decoded.
+        """
+        results: list[tuple[Optional[str], float]] = [(None, 0.0)] * len(image_paths)
+        if not self.models_loaded or not self.Image or not image_paths:
+            return results
+
+        try:
+            all_labels, label_to_category, label_features = self._get_label_features()
+        except Exception as e:
+            logger.error(f"Error encoding visual labels: {e}")
+            return results
+        if not all_labels:
+            return results
+
+        def _fill(rows, probs):
+            best = probs.argmax(dim=1)
+            for row, i in enumerate(rows):
+                best_idx = best[row].item()
+                results[i] = (label_to_category[all_labels[best_idx]], probs[row, best_idx].item())
+
+        store = self.image_embeddings
+        pending = list(range(len(image_paths)))
+        if store is not None and records is not None:
+            cached_rows, vectors, pending = self._lookup(store, records, pending)
+            if cached_rows:
+                try:
+                    features = self.torch.from_numpy(self.np.stack(vectors)).to(self.device, label_features.dtype)
+                    _fill(cached_rows, self._label_probs(features, label_features))
+                except Exception as e:
+                    logger.error(f"Error scoring cached image embeddings: {e}")
+
+        for start in range(0, len(pending), self.batch_size):
+            # Decode one batch at a time to keep memory bounded
+            images = []
+            rows = []
+            for i in pending[start : start + self.batch_size]:
+                try:
+                    images.append(self.Image.open(image_paths[i]).convert("RGB"))
+                    rows.append(i)
+                except Exception as e:
+                    logger.error(f"Error categorizing image {image_paths[i]}: {e}")
+            if not images:
+                continue
+
+            try:
+                features = self._image_features(images)
+                _fill(rows, self._label_probs(features, label_features))
+                if store is not None and records is not None:
+                    vectors = features.float().cpu().numpy()
+                    for row, i in enumerate(rows):
+                        store.put(records[i], vectors[row])
+            except Exception as e:
+                logger.error(f"Error categorizing image batch: {e}")
+
+        return results
+
+    @staticmethod
+    def _lookup(store, records: list, rows: list[int]) -> tuple[list[int], list, list[int]]:
+        """Splits `rows` into cache hits (with their vectors) and misses."""
+        hits, vectors, misses = [], [], []
+        for i in rows:
+            vector = store.get(records[i])
+            if vector is None:
+                misses.append(i)
+            else:
+                hits.append(i)
+                vectors.append(vector)
+        return hits, vectors, misses
+
+    def _score_text_embeddings(self, content_embs) -> list[tuple[str, float]]:
+        """Best category and cosine similarity for each row of `content_embs`."""
+        categories = list(self.text_category_embeddings)
+        category_matrix = self.np.stack([self.text_category_embeddings[c] for c in categories])
+        norms = self.np.linalg.norm(content_embs, axis=1)[:, None] * self.np.linalg.norm(category_matrix, axis=1)
+        similarities = content_embs @ category_matrix.T / (norms + 1e-9)
+        best = similarities.argmax(axis=1)
+        return [(categories[int(b)], float(similarities[row, int(b)])) for row, b in enumerate(best)]
+
+    def categorize_text_files(self, items: list, records: Optional[list] = None) -> list[tuple[Optional[str], float]]:
+        """
+        Batched categorize_text_file for a list of (file_path, content) pairs.
+        All contents are embedded in one encode() call (batched by the model) and scored against the category
+        embeddings with a single matrix product. With `records`, the embeddings are stored in the cache.
+        """
+        results: list[tuple[Optional[str], float]] = [(None, 0.0)] * len(items)
+        if not self.models_loaded or not self.text_category_embeddings:
+            return results
+
+        rows = [i for i, (_, content) in enumerate(items) if content and len(content.strip()) >= 10]
+        if not rows:
+            return results
+
+        try:
+            content_embs = self.text_model.encode(
+                [f"{TEXT_INSTRUCTION}{items[i][1][:2000]}" for i in rows],
+                prompt_name="query",
+                convert_to_numpy=True,
+                batch_size=self.batch_size,
+            )
+            for i, result in zip(rows, self._score_text_embeddings(content_embs)):
+                results[i] = result
+            if records is not None and self.text_embeddings is not None:
+                for row, i in enumerate(rows):
+                    self.text_embeddings.put(records[i], content_embs[row])
+        except Exception as e:
+            logger.error(f"Error categorizing text batch: {e}")
+
+        return results
+
+    def smart_categorize_many(
+        self,
+        file_paths: list,
+        threshold=0.3,
+        records: Optional[list] = None,
+        extract: Optional[Callable[[Path], str]] = None,
+    ) -> list[tuple[Optional[str], float, str]]:
+        """
+        Batch version of smart_categorize. Images and text documents are grouped into batches of
+        `batch_size`; results come back in the order of `file_paths`.
+        Passing the matching FileRecords as `records` enables the embedding cache: files whose size and mtime
+        are unchanged since a previous run skip decoding, text extraction and the model forward pass.
+        `extract` replaces extract_text(), e.g. with TextExtractor.get to read documents on a process pool.
+        """
+        if not self.models_loaded:
+            return [(None, 0.0, "ml-not-loaded")] * len(file_paths)
+
+        results: list[tuple[Optional[str], float, str]] = [(None, 0.0, "extension")] * len(file_paths)
+        image_rows = [i for i, p in enumerate(file_paths) if p.suffix.lower() in IMAGE_EXTENSIONS]
+        text_rows = [i for i, p in enumerate(file_paths) if p.suffix.lower() in TEXT_EXTENSIONS]
+
+        image_records = [records[i] for i in image_rows] if records is not None else None
+        image_results = self.categorize_images([file_paths[i] for i in image_rows], image_records)
+        for i, (category, confidence) in zip(image_rows, image_results):
+            if category:
+                results[i] = (category, confidence, "image-ml")
+
+        if records is not None and self.text_embeddings is not None and self.text_category_embeddings:
+            cached_rows, vectors, text_rows = self._lookup(self.text_embeddings, records, text_rows)
+            if cached_rows:
+                try:
+                    for i, (category, confidence) in zip(
+                        cached_rows, self._score_text_embeddings(self.np.stack(vectors))
+                    ):
+                        results[i] = (category, confidence, "text-ml")
+                except Exception as e:
+                    logger.error(f"Error scoring cached text embeddings: {e}")
+
+        extract = extract or self.extract_text
+        texts = [(file_paths[i], extract(file_paths[i])) for i in text_rows]
+        text_records = [records[i] for i in text_rows] if records is not None else None
+        for i, (category, confidence) in zip(text_rows, self.categorize_text_files(texts, text_records)):
+            if category:
+                results[i] = (category, confidence, "text-ml")
+
+        return results
@@ -1,23 +1,40 @@
-import hashlib
 import json
 import os
-import shutil
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, Iterable, Optional, TypedDict, Union
+from typing import Any, Callable, Iterable, Iterator, Optional, TypedDict, Union
 
 from .constants import (
     DEFAULT_CATEGORY,
     DEFAULT_CONFIG_FILE,
     DEFAULT_DIRECTORIES,
+    DEFAULT_EMBEDDING_CACHE_DIR,
+    DEFAULT_HASH_CACHE_FILE,
     DEFAULT_ML_CATEGORIES,
+    DEFAULT_UNDO_JOURNAL_DIR,
     DEFAULT_UNDO_STACK_FILE,
+    EMBEDDING_CACHE_MAX_MB,
     EXCLUDED_NAMES,
+    HASH_CACHE_MAX_MB,
+    JOURNAL_SYNC_EVERY,
+    JOURNAL_SYNC_INTERVAL_MS,
     MAX_UNDO_STACK,
     init_app_dirs,
 )
+from .duplicates import PARTIAL_HASH_BLOCK, DuplicateIndex
+from .extraction import TextExtractor
+from .hash_cache import HashCache
+from .hashing import DEFAULT_HASH_ALGORITHM, HASH_ALGORITHMS, hash_file, hash_file_ends, resolve_algorithm
 from .logger import logger
+from .ml_backends import DEFAULT_ML_BACKEND, ML_BACKENDS
+from .pipeline import BoundedBuffer, StageMeter, lookahead
+from .scanner import FileRecord, ParallelWalker, _is_excluded_file, list_dir, walk_records
+from .transfer import MoveExecutor, NameIndex, move_no_clobber
+from .undo_journal import JournalRun, UndoJournal
 
 
 class OrganizationResult(TypedDict, total=False):
@@ -27,6 +44,12 @@ class OrganizationResult(TypedDict, total=False):
     duplicates: int
     rolled_back: bool
     report: list[dict]
+    # Per-stage throughput: {"scan" | "extract" | "categorize" | "move": {"items", "seconds", "per_second"}}
+    stages: dict[str, dict]
+    # Dry runs: the folders the files would be moved into, to pass back as OrganizationOptions.planned_dirs
+    target_dirs: list[Path]
+    # Move throughput: {"files", "bytes", "seconds", "files_per_second", "mb_per_second"}
+    transfer: dict
 
 
 @dataclass
@@ -40,77 +63,313 @@ class OrganizationOptions:
     dry_run: bool = False
     use_ml: bool = False
     detect_duplicates: bool = False
+    # Reuse hashes from the persistent cache for files whose (device, inode, size, mtime) is unchanged
+    use_hash_cache: bool = True
     rollback_on_error: bool = False
+    # Streaming mode moves files while the scan is still running. Progress then reports
+    # (processed, discovered so far, name) instead of a fixed total.
+    streaming: bool = False
+    stream_buffer_size: int = 1024
+    # Recursive scans list directories on this many threads when > 1 (see ParallelWalker)
+    scan_workers: int = 1
+    # Duplicate detection hashes upcoming files on this many threads when > 1
+    hash_workers: int = 1
+    # Files per ML inference batch; 1 categorizes each file on its own
+    ml_batch_size: int = 16
+    # With ML batches, PDF/DOCX/text extraction runs ahead on this many processes; 0 extracts inline
+    extract_workers: int = 0
+    # Seconds before a file's extraction is abandoned and it falls back to its extension
+    extract_timeout: float = 30.0
+    # Files are moved on this many threads when > 1, with at most moves_per_device at a time on any one device
+    move_workers: int = 1
+    moves_per_device: int = 2
     progress_callback: Optional[Callable] = None
     log_callback: Optional[Callable] = None
     event_callback: Optional[Callable] = None
     check_stop: Optional[Callable] = None
+    # Folders to create in one pass before the first move, e.g. the target_dirs of a preceding dry run. Any
+    # that end up unused are removed again.
+    planned_dirs: Iterable[Path] = ()
+
+
+class TargetResolver:
+    """
+    Resolves and safety-checks target folders for one run. Path.resolve() costs a syscall per path component
+    (more for symlinks), which adds up on network mounts when it is repeated for every file although a run
+    only has a few dozen distinct target folders. Targets are cached by (category, date folder) and the
+    folders files are moved out of by their path.
+    """
+
+    def __init__(self, source_path: Path):
+        self.source_path = source_path
+        self.root = source_path.resolve()
+        self._targets: dict[tuple[str, str], tuple[Path, Optional[Path]]] = {}
+        self._parents: dict[str, Path] = {}
+        # Folders known to exist, so each target costs one mkdir per run
+        self._existing: set[Path] = set()
+        self._devices: dict[Path, int] = {}
+
+    def target(self, category: str, relative_dir: str = "") -> tuple[Path, Optional[Path]]:
+        """(target folder, its resolved path); the resolved path is None if it lies outside the source folder."""
+        key = (category, relative_dir)
+        cached = self._targets.get(key)
+        if cached is None:
+            target_dir = self.source_path / category
+            if relative_dir:
+                target_dir = target_dir / relative_dir
+            resolved = target_dir.resolve()
+            try:
+                resolved.relative_to(self.root)
+                cached = (target_dir, resolved)
+            except ValueError:
+                cached = (target_dir, None)
+            self._targets[key] = cached
+        return cached
+
+    def resolve_parent(self, parent: str) -> Path:
+        resolved = self._parents.get(parent)
+        if resolved is None:
+            resolved = self._parents[parent] = Path(parent).resolve()
+        return resolved
+
+    def ensure_dir(self, directory: Path):
+        """mkdir -p, skipped if this run already created or found the folder."""
+        if directory not in self._existing:
+            directory.mkdir(parents=True, exist_ok=True)
+            self._existing.add(directory)
+
+    def device(self, directory: Path) -> int:
+        """st_dev of a target folder, stat-ed once per run."""
+        device = self._devices.get(directory)
+        if device is None:
+            device = self._devices[directory] = os.stat(directory).st_dev
+        return device
+
+    def create_dirs(self, directories: Iterable[Path]) -> list[Path]:
+        """
+        Creates planned target folders up front, parents first, skipping any that would resolve outside the
+        source folder. Returns the ones that did not exist before.
+        """
+        created: list[Path] = []
+        for directory in sorted(set(directories), key=lambda d: len(d.parts)):
+            try:
+                directory.resolve().relative_to(self.root)
+            except ValueError:
+                continue
+            missing = []
+            ancestor = directory
+            while ancestor not in self._existing and not ancestor.is_dir():
+                missing.append(ancestor)
+                ancestor = ancestor.parent
+            if missing:
+                directory.mkdir(parents=True, exist_ok=True)
+                created.extend(reversed(missing))
+            self._existing.update(missing)
+            self._existing.add(directory)
+        return created
 
 
 class FileOrganizer:
-    def __init__(self):
+    def __init__(self, defer_state: bool = False):
+        """
+        With `defer_state`, app directories and the undo index are not touched here; the caller runs
+        load_state() (e.g. on a background thread) and anything that needs the undo stack waits for it.
+        """
         self.directories = DEFAULT_DIRECTORIES.copy()
         self.ml_categories = DEFAULT_ML_CATEGORIES.copy()
         self.extension_map = self._build_extension_map()
-        # undo_stack is a list of history records. Each record is a tuple: (history_list, last_source_path)
-        # history_list is [(new_path, old_path), ...]
-        self.undo_stack = []
+        # undo_stack lists the undoable runs, oldest first: {"source_path", "segment", "moves"}.
+        # A run's moves [(new_path, old_path), ...] stay in its journal segment until it is undone.
+        self.undo_stack: list[dict] = []
+        self.undo_journal = UndoJournal(
+            DEFAULT_UNDO_JOURNAL_DIR,
+            legacy_file=DEFAULT_UNDO_STACK_FILE,
+            sync_every=JOURNAL_SYNC_EVERY,
+            sync_interval_ms=JOURNAL_SYNC_INTERVAL_MS,
+        )
         self.max_undo_stack = MAX_UNDO_STACK
         self.theme_mode = "System"
-        self.ml_categorizer = None
+        self.ml_categorizer: Any = None
         self.ml_confidence = 0.3
 
+        # Persistent hash cache for duplicate detection, opened on first use
+        self.hash_cache_file: Union[str, Path] = DEFAULT_HASH_CACHE_FILE
+        self.hash_cache_max_mb = HASH_CACHE_MAX_MB
+        self._hash_cache: Optional[HashCache] = None
+        # Hash workers reach the cache concurrently; only one of them may open the database
+        self._hash_cache_lock = threading.Lock()
+        # Content hash used for duplicate detection; digests are stored as "<algorithm>:<hex>"
+        self.hash_algorithm = DEFAULT_HASH_ALGORITHM
+        # Per-file ML embeddings kept across runs; None disables the cache
+        self.embedding_cache_dir: Optional[Union[str, Path]] = DEFAULT_EMBEDDING_CACHE_DIR
+        self.embedding_cache_max_mb = EMBEDDING_CACHE_MAX_MB
+        # Inference backend for the ML categorizer: "torch", "torch-int8" or "onnx"
+        self.ml_backend = DEFAULT_ML_BACKEND
+
         # Exclusions
         self.excluded_names = EXCLUDED_NAMES.copy()
-        self.excluded_extensions = set()  # e.g., {".tmp", ".log"}
+        self.excluded_extensions: set[str] = set()  # e.g., {".tmp", ".log"}
         self.excluded_folders = EXCLUDED_NAMES.copy()
 
-        # Ensure app directories exist on init
-        init_app_dirs()
-        self._load_undo_stack()
+        self._state_loaded = threading.Event()
+        self._state_lock = threading.Lock()
+        if not defer_state:
+            self.load_state()
+
+    def load_state(self):
+        """Creates the app directories and loads the undo index. Safe to call more than once."""
+        with self._state_lock:
+            if self._state_loaded.is_set():
+                return
+            try:
+                init_app_dirs()
+                self._load_undo_stack()
+                self.recover_interrupted_runs()
+            finally:
+                self._state_loaded.set()
+
+    def wait_for_state(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until load_state() has finished, loading it on this thread if nobody has started it."""
+        if not self._state_loaded.is_set() and not self._state_lock.locked():
+            self.load_state()
+        return self._state_loaded.wait(timeout)
 
     def _build_extension_map(self) -> dict[str, str]:
         return {ext: category for category, exts in self.directories.items() for ext in exts}
 
     def _load_undo_stack(self):
-        """Loads the undo stack from a JSON file."""
-        if os.path.exists(DEFAULT_UNDO_STACK_FILE):
-            try:
-                with open(DEFAULT_UNDO_STACK_FILE, "r") as f:
-                    data = json.load(f)
-                    self.undo_stack = []
-                    for item in data:
-                        history = [(Path(p1), Path(p2)) for p1, p2 in item["history"]]
-                        self.undo_stack.append({"history": history, "source_path": Path(item["source_path"])})
-            except Exception as e:
-                logger.error(f"Error loading undo stack: {e}")
-                self.undo_stack = []
+        """Loads the undo journal index. Run histories are read on demand."""
+        try:
+            self.undo_stack = self.undo_journal.load_index()
+        except Exception as e:
+            logger.error(f"Error loading undo stack: {e}")
+            self.undo_stack = []
 
     def _save_undo_stack(self):
-        """Saves the undo stack to a JSON file."""
+        """Writes the undo journal index."""
         try:
-            data = []
-            for item in self.undo_stack:
-                history = [(str(p1), str(p2)) for p1, p2 in item["history"]]
-                data.append({"history": history, "source_path": str(item["source_path"])})
-            with open(DEFAULT_UNDO_STACK_FILE, "w") as f:
-                json.dump(data, f, indent=4)
+            self.undo_journal.save_index(self.undo_stack)
         except Exception as e:
             logger.error(f"Error saving undo stack: {e}")
 
-    def _get_file_hash(self, file_path: Path) -> str:
-        """Calculates SHA-256 hash of a file."""
-        sha256_hash = hashlib.sha256()
+    def recover_interrupted_runs(self, rollback: bool = False, log_callback: Optional[Callable] = None) -> int:
+        """
+        Finds runs that were killed before they finished (journal segments missing from the index).
+        By default they are finished: added to the undo stack so their moves can be undone like any other run.
+        With rollback=True their moves are reversed right away. Returns the number of runs recovered.
+        """
+        try:
+            interrupted = self.undo_journal.find_interrupted(self.undo_stack)
+        except Exception as e:
+            logger.error(f"Error scanning undo journal: {e}")
+            return 0
+        if not interrupted:
+            return 0
+
+        for run in interrupted:
+            msg = f"Recovering interrupted run in {run['source_path']} ({run['moves']} journaled moves)"
+            if log_callback:
+                log_callback(msg)
+            logger.warning(msg)
+            try:
+                history = self.undo_journal.read_history(run)
+            except Exception as e:
+                logger.error(f"Error reading interrupted run {run['segment']}: {e}")
+                continue
+
+            # The last moves may have been cut short mid-copy; never delete either side automatically
+            for current_path, original_path in history[-max(1, self.undo_journal.sync_every) :]:
+                if current_path.exists() and original_path.exists():
+                    logger.warning(f"Incomplete move: both {original_path} and {current_path} exist, keeping both")
+
+            if rollback:
+                self._undo_history(history, run["source_path"], log_callback)
+                self.undo_journal.remove_segment(run)
+            else:
+                self.undo_stack.append(run)
+
+        while len(self.undo_stack) > self.max_undo_stack:
+            self.undo_journal.remove_segment(self.undo_stack.pop(0))
+        self._save_undo_stack()
+        return len(interrupted)
+
+    def _get_hash_cache(self) -> Optional[HashCache]:
+        """Opens the persistent hash cache lazily. Returns None if it cannot be used."""
+        if self._hash_cache is None:
+            with self._hash_cache_lock:
+                if self._hash_cache is None:
+                    try:
+                        self._hash_cache = HashCache(self.hash_cache_file, int(self.hash_cache_max_mb * 1024 * 1024))
+                    except Exception as e:
+                        logger.error(f"Error opening hash cache: {e}")
+                        return None
+        return self._hash_cache
+
+    def _hash_with_cache(self, file_path: Path, record: Optional[FileRecord], kind: str, compute: Callable) -> str:
+        """
+        Runs `compute(path, algorithm)` for the configured hash algorithm, serving and storing the result through
+        the persistent hash cache when the file's scan record is given. Returns "" if the file cannot be read.
+        """
+        algorithm = resolve_algorithm(self.hash_algorithm)
+        cache_key = algorithm if kind == "full" else f"{algorithm}-{kind}"
+        cache = self._get_hash_cache() if record is not None else None
+        if cache is not None and record is not None:
+            cached = cache.get(record, cache_key)
+            # Rows written before digests were tagged are ignored and overwritten
+            if cached and cached.startswith(f"{algorithm}:"):
+                return cached
+
         try:
-            with open(file_path, "rb") as f:
-                # Read in 64KB chunks
-                for byte_block in iter(lambda: f.read(65536), b""):
-                    sha256_hash.update(byte_block)
-            return sha256_hash.hexdigest()
+            digest = compute(file_path, algorithm)
         except Exception as e:
             logger.error(f"Error hashing file {file_path}: {e}")
             return ""
 
+        if cache is not None and record is not None:
+            cache.put(record, cache_key, digest)
+        return digest
+
+    def _get_file_hash(self, file_path: Path, record: Optional[FileRecord] = None) -> str:
+        """Calculates the tagged content hash of a file with the configured algorithm."""
+        return self._hash_with_cache(file_path, record, "full", hash_file)
+
+    def _get_partial_hash(self, file_path: Path, record: Optional[FileRecord] = None) -> str:
+        """
+        Hashes the first and last PARTIAL_HASH_BLOCK bytes of a file, the cheap middle stage of duplicate
+        detection. Small files are hashed whole.
+        """
+        return self._hash_with_cache(
+            file_path, record, "partial", lambda path, algorithm: hash_file_ends(path, PARTIAL_HASH_BLOCK, algorithm)
+        )
+
+    def rebuild_hash_cache(self, source_path: Path, log_callback: Optional[Callable] = None, workers: int = 1) -> int:
+        """
+        Clears the persistent hash cache and re-hashes every file in the category folders of source_path,
+        on `workers` threads.
+        """
+        cache = self._get_hash_cache()
+        if cache is None:
+            return 0
+        cache.clear()
+        count = 0
+        for category in self.directories.keys():
+            target_dir = source_path / category
+            if not target_dir.is_dir():
+                continue
+            if log_callback:
+                log_callback(f"Hashing {target_dir}...")
+            existing_files = walk_records(target_dir, (), self.excluded_names, self.excluded_extensions)
+            if workers > 1:
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hash-worker") as pool:
+                    digests = list(pool.map(lambda r: self._get_file_hash(r.path, r), existing_files))
+            else:
+                digests = [self._get_file_hash(r.path, r) for r in existing_files]
+            count += sum(1 for digest in digests if digest)
+        cache.flush()
+        if log_callback:
+            log_callback(f"Hash cache rebuilt: {count} files ({cache.size_bytes / 1024:.0f} KB).")
+        return count
+
     def validate_config(self) -> list[str]:
         """
         Validates the current configuration.
@@ -139,6 +398,12 @@ class FileOrganizer:
                 else:
                     all_exts[ext] = cat
 
+        if self.hash_algorithm not in HASH_ALGORITHMS:
+            choices = ", ".join(HASH_ALGORITHMS)
+            errors.append(f"Unknown hash algorithm '{self.hash_algorithm}'. Choose one of: {choices}")
+        if self.ml_backend not in ML_BACKENDS:
+            errors.append(f"Unknown ML backend '{self.ml_backend}'. Choose one of: {', '.join(ML_BACKENDS)}")
+
         return errors
 
     def load_config(self, config_path: Union[str, Path] = DEFAULT_CONFIG_FILE) -> bool:
@@ -157,6 +422,10 @@ class FileOrganizer:
                         self.theme_mode = data.get("theme_mode", "System")
                         self.ml_confidence = data.get("ml_confidence", 0.3)
                         self.max_undo_stack = data.get("max_undo_stack", MAX_UNDO_STACK)
+                        self.hash_cache_max_mb = data.get("hash_cache_max_mb", HASH_CACHE_MAX_MB)
+                        self.hash_algorithm = data.get("hash_algorithm", DEFAULT_HASH_ALGORITHM)
+                        self.embedding_cache_max_mb = data.get("embedding_cache_max_mb", EMBEDDING_CACHE_MAX_MB)
+                        self.ml_backend = data.get("ml_backend", DEFAULT_ML_BACKEND)
                     else:
                         # Fallback for old format
                         self.directories = data
@@ -196,6 +465,10 @@ class FileOrganizer:
                         "theme_mode": self.theme_mode,
                         "ml_confidence": self.ml_confidence,
                         "max_undo_stack": self.max_undo_stack,
+                        "hash_cache_max_mb": self.hash_cache_max_mb,
+                        "hash_algorithm": self.hash_algorithm,
+                        "embedding_cache_max_mb": self.embedding_cache_max_mb,
+                        "ml_backend": self.ml_backend,
                     },
                     f,
                     indent=4,
@@ -224,46 +497,116 @@ class FileOrganizer:
         """Generates a unique path by appending a counter if the file exists."""
         if not path.exists():
             return path
-        counter = 1
+        return NameIndex().reserve(path)
+
+    def _move_unique(self, item: Path, dest_path: Path, names: NameIndex, journal_run: JournalRun) -> Path:
+        """
+        Moves `item` to `dest_path`, or the next free name next to it, without ever replacing a file. Returns
+        where it landed. If something else created the name since the folder was listed, the next one is tried.
+        """
         while True:
-            new_path = path.with_name(f"{path.stem}_{counter}{path.suffix}")
-            if not new_path.exists():
-                return new_path
-            counter += 1
+            final_dest_path = names.reserve(dest_path)
+            # Write-ahead: journal the move before making it, so a killed run can still be undone. A record for
+            # an attempt that lost the race is harmless, since undo does not overwrite either.
+            journal_run.append(final_dest_path, item)
+            try:
+                move_no_clobber(item, final_dest_path)
+                return final_dest_path
+            except FileExistsError:
+                continue
+            except BaseException:
+                names.release(final_dest_path)
+                raise
+
+    def _journal_parts(self, source_path: Path) -> tuple[str, ...]:
+        """
+        The undo journal's directory relative to source_path, or () if it lies elsewhere. When the journal is
+        kept inside the organized folder (e.g. UNDO_JOURNAL_PATH in the sandbox image), its files are skipped.
+        """
+        try:
+            journal_dir = Path(os.path.abspath(self.undo_journal.directory))
+            return journal_dir.relative_to(os.path.abspath(source_path)).parts
+        except ValueError:
+            return ()
 
-    def scan_files(self, source_path: Path, recursive: bool = False) -> Iterable[Path]:
-        """Scans for files to process, respecting exclusions."""
+    def scan_records(self, source_path: Path, recursive: bool = False, workers: int = 1) -> Iterable[FileRecord]:
+        """
+        Scans for files to process with os.scandir, respecting exclusions. Yields FileRecords.
+        With workers > 1, recursive scans list directories in parallel; the order is unchanged.
+        """
         # Check if source_path itself is excluded (though unlikely to be passed if selected by user, good safety)
         if source_path.name in self.excluded_folders:
             return
 
         if recursive:
-            # use os.walk to properly exclude directories
-            for root, dirs, files in os.walk(source_path):
-                # Filter dirs in-place to prevent walking into excluded directories
-                dirs[:] = [d for d in dirs if d not in self.excluded_folders]
-
-                for file in files:
-                    if file in self.excluded_names:
-                        continue
-
-                    file_path = Path(root) / file
-                    if file_path.suffix.lower() in self.excluded_extensions:
-                        continue
-
-                    yield file_path
+            exclusions = (self.excluded_folders, self.excluded_names, self.excluded_extensions)
+            records: Iterable[FileRecord] = (
+                ParallelWalker(source_path, workers, *exclusions)
+                if workers > 1
+                else walk_records(source_path, *exclusions)
+            )
+            journal_parts = self._journal_parts(source_path)
+            if journal_parts:
+                journal_dir = os.path.join(str(source_path), *journal_parts)
+                records = (
+                    r for r in records if r.parent != journal_dir and not r.parent.startswith(journal_dir + os.sep)
+                )
+            yield from records
         else:
-            for item in source_path.iterdir():
-                if item.is_file():
-                    if item.name in self.excluded_names:
-                        continue
-                    if item.suffix.lower() in self.excluded_extensions:
-                        continue
-                    yield item
+            # Sub-directories are ignored here; excluded_folders only matters for recursion
+            files, _ = list_dir(source_path, (), self.excluded_names, self.excluded_extensions)
+            yield from files
+
+    def path_records(
+        self, paths: Iterable[Union[str, Path]], source_path: Path, recursive: bool = False
+    ) -> list[FileRecord]:
+        """
+        FileRecords for those of `paths` that scan_records(source_path, recursive) would yield: existing regular
+        files directly in source_path (or below it when recursive, outside excluded folders) that are not
+        excluded themselves. Each path is stat-ed once; duplicates and everything else are dropped.
+        """
+        if source_path.name in self.excluded_folders:
+            return []
+
+        journal_parts = self._journal_parts(source_path)
+        records: list[FileRecord] = []
+        seen: set[Path] = set()
+        for path in map(Path, paths):
+            if path in seen:
+                continue
+            seen.add(path)
+            try:
+                parts = path.relative_to(source_path).parts
+            except ValueError:
+                continue
+            if not parts or (len(parts) > 1 and not recursive):
+                continue
+            if any(part in self.excluded_folders for part in parts[:-1]):
+                continue
+            if journal_parts and parts[: len(journal_parts)] == journal_parts and len(parts) > len(journal_parts):
+                continue
+            if _is_excluded_file(path.name, self.excluded_names, self.excluded_extensions):
+                continue
+            try:
+                record = FileRecord.from_path(path)
+            except OSError:
+                # Already moved or deleted again
+                continue
+            if record.file_type == stat.S_IFREG:
+                records.append(record)
+        return records
+
+    def scan_files(self, source_path: Path, recursive: bool = False, workers: int = 1) -> Iterable[Path]:
+        """Scans for files to process, respecting exclusions."""
+        for record in self.scan_records(source_path, recursive, workers):
+            yield record.path
 
-    def get_category(self, file_path: Path, use_ml: bool = False) -> tuple[str, float, str, Optional[str], float, str]:
+    def get_category(
+        self, file_path: Path, use_ml: bool = False, ai_result: Optional[tuple[Optional[str], float, str]] = None
+    ) -> tuple[str, float, str, Optional[str], float, str]:
         """
         Determines the target category for a file.
+        `ai_result` is a precomputed smart_categorize() result, e.g. from a smart_categorize_many() batch.
         Returns: (effective_category, confidence, method, ai_category, ai_confidence, extension_category)
         """
         # 1. Get Extension Category (always needed as fallback)
@@ -276,11 +619,12 @@ class FileOrganizer:
 
         # 2. Try ML if enabled
         if use_ml:
-            if not self.ml_categorizer:
-                from .ml_organizer import MultimodalFileOrganizer
-                self.ml_categorizer = MultimodalFileOrganizer(self.ml_categories)
+            if ai_result is None:
+                if not self.ml_categorizer:
+                    self.ml_categorizer = self._create_ml_categorizer()
 
-            ai_category, ai_confidence, ai_method = self.ml_categorizer.smart_categorize(file_path, threshold=0.0)
+                ai_result = self.ml_categorizer.smart_categorize(file_path, threshold=0.0)
+            ai_category, ai_confidence, ai_method = ai_result
 
             # If ML returned a valid result and meets current threshold
             if ai_category and ai_method != "extension" and ai_method != "ml-not-loaded":
@@ -290,10 +634,110 @@ class FileOrganizer:
         # 3. Fallback to Extension
         return ext_category, 1.0, "extension", ai_category, ai_confidence, ext_category
 
+    def _create_ml_categorizer(self):
+        from .ml_organizer import MultimodalFileOrganizer
+
+        return MultimodalFileOrganizer(
+            self.ml_categories,
+            embedding_cache_dir=self.embedding_cache_dir,
+            embedding_cache_max_mb=self.embedding_cache_max_mb,
+            backend=self.ml_backend,
+        )
+
+    def _categorize_stage(
+        self,
+        records: Iterable[FileRecord],
+        use_ml: bool,
+        landed: Optional[set[str]] = None,
+        ml_batch_size: int = 1,
+        meter: Optional[StageMeter] = None,
+        extractor: Optional[TextExtractor] = None,
+    ) -> Iterator[tuple[FileRecord, Union[tuple, Exception]]]:
+        """
+        Pipeline stage pairing each scanned record with its get_category() result (or the error it raised).
+        With ML and ml_batch_size > 1, records are read ahead in windows and categorized with one
+        smart_categorize_many() call per window, so the models run on full batches. An `extractor` then gets
+        each document one window ahead of inference, so its text is ready by the time the batch runs.
+        """
+        meter = meter or StageMeter()
+        if not (use_ml and ml_batch_size > 1 and self.ml_categorizer):
+            for record in records:
+                if landed is not None and str(record.path) in landed:
+                    continue
+                with meter.measure():
+                    try:
+                        categorized: Union[tuple, Exception] = self.get_category(record.path, use_ml)
+                    except Exception as e:
+                        categorized = e
+                yield record, categorized
+            return
+
+        ml = self.ml_categorizer
+        ml.batch_size = ml_batch_size
+        # A window spans several batches since it mixes images, documents and files the models skip
+        window_size = ml_batch_size * 4
+        if extractor is not None:
+
+            def submit(record: FileRecord):
+                if (landed is None or str(record.path) not in landed) and ml.needs_text(record):
+                    extractor.submit(record.path)
+
+            records = lookahead(records, window_size, submit)
+        window: list[FileRecord] = []
+        for record in records:
+            if landed is not None and str(record.path) in landed:
+                if extractor is not None:
+                    # Landed while it was in the look-ahead window
+                    extractor.discard(record.path)
+                continue
+            window.append(record)
+            if len(window) >= window_size:
+                yield from self._categorize_window(window, use_ml, meter, extractor)
+                window = []
+        if window:
+            yield from self._categorize_window(window, use_ml, meter, extractor)
+
+    def _categorize_window(
+        self, window: list[FileRecord], use_ml: bool, meter: StageMeter, extractor: Optional[TextExtractor] = None
+    ) -> Iterator[tuple[FileRecord, Union[tuple, Exception]]]:
+        assert self.ml_categorizer is not None
+        results: list[Union[tuple, Exception]] = []
+        with meter.measure(len(window)):
+            try:
+                ai_results = self.ml_categorizer.smart_categorize_many(
+                    [r.path for r in window],
+                    threshold=0.0,
+                    records=window,
+                    extract=extractor.get if extractor is not None else None,
+                )
+            except Exception as e:
+                ai_results = None
+                results = [e] * len(window)
+            if ai_results is not None:
+                for record, ai_result in zip(window, ai_results):
+                    try:
+                        results.append(self.get_category(record.path, use_ml, ai_result))
+                    except Exception as e:
+                        results.append(e)
+        yield from zip(window, results)
+
     def organize_files(self, options: OrganizationOptions) -> OrganizationResult:
         """
         Organizes files based on provided options.
         """
+        return self._organize(options)
+
+    def organize_paths(self, paths: Iterable[Union[str, Path]], options: OrganizationOptions) -> OrganizationResult:
+        """
+        Organizes only `paths`, e.g. the files a folder watcher saw change, instead of scanning the whole source
+        folder. Paths a full scan would skip are ignored. Duplicate detection only indexes existing files whose
+        size matches a changed file, and empty-folder cleanup only looks at the folders files were moved out of.
+        """
+        return self._organize(options, self.path_records(paths, options.source_path, options.recursive))
+
+    def _organize(self, options: OrganizationOptions, records: Optional[list[FileRecord]] = None) -> OrganizationResult:
+        """Runs an organization over `records`, or over a scan of the source folder if None."""
+        self.wait_for_state()
         source_path = options.source_path
         recursive = options.recursive
         date_sort = options.date_sort
@@ -308,42 +752,57 @@ class FileOrganizer:
         check_stop = options.check_stop
 
         current_history = []
+        # Undo journal segment for this run, opened on the first move
+        journal_run: Optional[JournalRun] = None
         report: list[dict] = []
         moved_count = 0
         renamed_count = 0
         errors = 0
         duplicates_count = 0
 
-        # Known file hashes in the target tree to detect duplicates
-        known_hashes: dict[str, Path] = {}
+        # Target folders are resolved and safety-checked once per run, not once per file
+        targets = TargetResolver(source_path)
+        # Names taken in each destination folder, so collisions are resolved without probing the disk
+        names = NameIndex()
+        # Files already in the target tree, bucketed by size; contents are only hashed on size collisions
+        known_files: Optional[DuplicateIndex] = None
 
-        # Pre-hash destination tree if requested
+        # Index destination tree if requested
         if detect_duplicates:
             if log_callback:
                 log_callback("Pre-scanning destination for duplicates...")
 
+            if options.use_hash_cache:
+                # Open the cache here rather than on the first hash, which may come from a worker thread
+                self._get_hash_cache()
+                known_files = DuplicateIndex(self._get_file_hash, self._get_partial_hash, options.hash_workers)
+            else:
+                known_files = DuplicateIndex(
+                    lambda path, _record: self._get_file_hash(path),
+                    lambda path, _record: self._get_partial_hash(path),
+                    options.hash_workers,
+                )
+
+            # Only a file of the same size can be a duplicate of one we are about to move
+            sizes = {record.size for record in records} if records is not None else None
             for category in self.directories.keys():
                 target_dir = source_path / category
                 if target_dir.is_dir():
                     # Scan recursively for existing files
-                    for root, _, files in os.walk(target_dir):
-                        for file in files:
-                            if file in self.excluded_names:
-                                continue
-                            file_path = Path(root) / file
-                            if file_path.suffix.lower() in self.excluded_extensions:
-                                continue
-
-                            f_hash = self._get_file_hash(file_path)
-                            if f_hash:
-                                known_hashes[f_hash] = file_path
+                    exclusions = ((), self.excluded_names, self.excluded_extensions)
+                    existing_files = (
+                        ParallelWalker(target_dir, options.scan_workers, *exclusions)
+                        if options.scan_workers > 1
+                        else walk_records(target_dir, *exclusions)
+                    )
+                    for existing in existing_files:
+                        if sizes is None or existing.size in sizes:
+                            known_files.add(existing)
 
         # Ensure ML is ready if requested
         if use_ml and not self.ml_categorizer:
             # Lazy init
-            from .ml_organizer import MultimodalFileOrganizer
-
-            self.ml_categorizer = MultimodalFileOrganizer(self.ml_categories)
+            self.ml_categorizer = self._create_ml_categorizer()
             if not self.ml_categorizer.models_loaded:
                 if log_callback:
                     log_callback("Initializing ML models (this may take a while)...")
@@ -364,84 +823,296 @@ class FileOrganizer:
         if log_callback:
             log_callback(f"--- Starting {'Dry Run ' if dry_run else ''}Organization ---")
 
-        # Collect files into a list once — avoids double directory scan
-        try:
-            all_files = list(self.scan_files(source_path, recursive))
-        except Exception as e:
+        # Folders each file was (or would be) moved into
+        used_dirs: set[Path] = set()
+        pre_created: list[Path] = []
+        if options.planned_dirs and not dry_run:
+            try:
+                pre_created = targets.create_dirs(options.planned_dirs)
+            except OSError as e:
+                # Not fatal: each move still creates its folder
+                logger.warning(f"Could not create planned folders: {e}")
+
+        meters = {stage: StageMeter() for stage in ("scan", "extract", "categorize", "move")}
+        scan_buffer: Optional[BoundedBuffer[FileRecord]] = None
+        scanned: Iterable[FileRecord]
+        total_files = 0
+        if records is not None:
+            scanned = records
+            total_files = len(records)
+        elif options.streaming:
+            # Scan on a background thread; the bounded buffer lets the first move start right away
+            scan_buffer = BoundedBuffer(
+                meters["scan"].producer(self.scan_records(source_path, recursive, options.scan_workers)),
+                options.stream_buffer_size,
+                name="organizer-scan",
+            )
+            scanned = scan_buffer
+        else:
+            # Collect files into a list once — avoids double directory scan
+            try:
+                scanned = list(meters["scan"].producer(self.scan_records(source_path, recursive, options.scan_workers)))
+            except Exception as e:
+                if log_callback:
+                    log_callback(f"Error scanning files: {e}")
+                return {"moved": 0, "errors": 1}
+            total_files = len(scanned)
+
+        # A streaming recursive walk can reach folders we are moving into; never pick up a file twice
+        landed: Optional[set[str]] = set() if options.streaming and recursive else None
+
+        extractor = (
+            TextExtractor(options.extract_workers, options.extract_timeout)
+            if use_ml and options.extract_workers > 0 and options.ml_batch_size > 1
+            else None
+        )
+        stage: Iterable[tuple[FileRecord, Union[tuple, Exception]]] = self._categorize_stage(
+            scanned, use_ml, landed, options.ml_batch_size, meters["categorize"], extractor
+        )
+        if known_files is not None and options.hash_workers > 1:
+            # Hash the next few files on the pool while the current one is being moved
+            dup_index = known_files
+            stage = lookahead(stage, options.hash_workers * 4, lambda entry: dup_index.prefetch(entry[0]))
+        stage = meters["move"].consumer(stage)
+
+        # Moves run on the executor; finished ones are recorded in the order they were submitted
+        mover = None if dry_run else MoveExecutor(options.move_workers, options.moves_per_device, move_no_clobber)
+
+        def record_move(record: FileRecord, final_dest_path: Path, target_dir: Path, relative_dir: str, categorized):
+            """Logs, reports and counts a file that was moved (or, in a dry run, would be moved)."""
+            nonlocal moved_count, renamed_count
+            item = record.path
+            category, confidence, method, ai_cat, ai_conf, ext_cat = categorized
+
+            # Show relative path for logging
+            rel_dest: Union[Path, str]
+            try:
+                rel_dest = final_dest_path.relative_to(source_path)
+            except ValueError:
+                rel_dest = final_dest_path.name
+
+            used_dirs.add(target_dir)
+            log_prefix = "[Dry Run] " if dry_run else ""
+            log_suffix = f" (ML: {method}, {confidence:.2f})" if use_ml and method != "extension" else ""
+
+            event_data = {
+                "type": "move",
+                "file": item.name,
+                "source": str(item),
+                "destination": str(final_dest_path),
+                "relative_dir": relative_dir,
+                "category": category,
+                "method": method,
+                "confidence": confidence,
+                "dry_run": dry_run,
+                "renamed": final_dest_path.name != item.name,
+                "ai_category": ai_cat,
+                "ai_confidence": ai_conf,
+                "ai_method": method if method != "extension" else "ml",
+                "ext_category": ext_cat,
+            }
+
+            if dry_run:
+                if log_callback:
+                    log_callback(f"{log_prefix}would move: {item.name} -> {rel_dest}{log_suffix}")
+                if event_callback:
+                    event_callback(event_data)
+
+                report.append(
+                    {
+                        "file": item.name,
+                        "status": "dry_run",
+                        "source": str(item),
+                        "destination": str(final_dest_path),
+                        "size": record.size,
+                        "category": category,
+                        "method": method,
+                        "confidence": confidence,
+                        "ai_category": ai_cat,
+                        "ai_confidence": ai_conf,
+                        "ext_category": ext_cat,
+                    }
+                )
+            else:
+                current_history.append((final_dest_path, item))
+                if known_files is not None:
+                    known_files.relocate(record, final_dest_path)
+
+                if final_dest_path.name != item.name:
+                    event_data["new_name"] = final_dest_path.name
+                    renamed_count += 1
+
+                if log_callback:
+                    msg = f"Moved: {item.name} -> {rel_dest}{log_suffix}"
+                    if final_dest_path.name != item.name:
+                        msg = f"Renamed & Moved: {item.name} -> {final_dest_path.name} (in {rel_dest}){log_suffix}"
+                    log_callback(msg)
+
+                if event_callback:
+                    event_callback(event_data)
+
+                report.append(
+                    {
+                        "file": item.name,
+                        "status": "moved",
+                        "source": str(item),
+                        "destination": str(final_dest_path),
+                        "size": record.size,
+                        "category": category,
+                        "method": method,
+                        "confidence": confidence,
+                        "renamed": final_dest_path.name != item.name,
+                    }
+                )
+
+            moved_count += 1
+
+        def record_error(item: Path, e: Exception) -> bool:
+            """Logs and reports a file that failed. Returns True if the run must now be rolled back."""
+            nonlocal errors
+            errors += 1
+            if isinstance(e, PermissionError):
+                error_type = "PermissionError"
+                msg = f"PERMISSION ERROR: Cannot move {item.name} (file may be in use): {e}"
+            elif isinstance(e, OSError):
+                error_type = "OSError"
+                msg = f"OS ERROR moving {item.name}: {e}"
+            else:
+                error_type = type(e).__name__
+                msg = f"UNEXPECTED ERROR moving {item.name}: {error_type}: {e}"
             if log_callback:
-                log_callback(f"Error scanning files: {e}")
-            return {"moved": 0, "errors": 1}
+                log_callback(msg)
+            logger.error(msg)
+
+            report.append({"file": item.name, "status": "error", "error_type": error_type, "error": str(e)})
+
+            if event_callback:
+                event_callback({"type": "error", "file": item.name, "error": str(e), "error_type": error_type})
+
+            return rollback_on_error and not dry_run
 
-        total_files = len(all_files)
+        def finish_moves(wait: bool = False, size: Optional[int] = None) -> bool:
+            """Records the moves the executor has finished (see MoveExecutor.results). True means roll back."""
+            if mover is None:
+                return False
+            for (record, final_dest_path, dest_path, target_dir, relative_dir, categorized), error in mover.results(
+                wait, size
+            ):
+                if isinstance(error, FileExistsError) and journal_run is not None:
+                    # Something else created the name after the folder was listed; take the next free one
+                    try:
+                        final_dest_path = self._move_unique(record.path, dest_path, names, journal_run)
+                        error = None
+                    except Exception as e:
+                        error = e
+                    if landed is not None and error is None:
+                        landed.add(str(final_dest_path))
+                elif error is not None:
+                    names.release(final_dest_path)
+                if error is not None and known_files is not None:
+                    known_files.set_moving(record, False)
+
+                if error is None:
+                    # The file's old name is free again, in case its folder is also a destination
+                    names.release(record.path)
+                    record_move(record, final_dest_path, target_dir, relative_dir, categorized)
+                elif record_error(record.path, error):
+                    return True
+            return False
 
-        for i, item in enumerate(all_files, 1):
+        def roll_back() -> OrganizationResult:
+            if log_callback:
+                log_callback("Critical error encountered. Rolling back changes...")
+            if mover is not None:
+                # Moves still in flight when the error came up are undone too
+                for (record, final_dest_path, *_), error in mover.results(wait=True):
+                    if error is None:
+                        current_history.append((final_dest_path, record.path))
+                mover.close()
+            # Stop the background scan and hashing, as the normal exit does
+            close_stage = getattr(stage, "close", None)
+            if close_stage is not None:
+                close_stage()
+            if scan_buffer is not None:
+                scan_buffer.close()
+            if known_files is not None:
+                known_files.close()
+            # Rollback only current partial history
+            self._undo_history(current_history, source_path, log_callback)
+            if journal_run is not None:
+                journal_run.discard()
+            if extractor is not None:
+                extractor.close()
+            return {
+                "moved": moved_count,
+                "errors": errors,
+                "renamed": renamed_count,
+                "duplicates": duplicates_count,
+                "rolled_back": True,
+                "report": report,
+            }
+
+        for i, (record, categorized) in enumerate(stage, 1):
+            item = record.path
             if check_stop and check_stop():
                 if log_callback:
                     log_callback("Operation stopped by user.")
                 break
 
             if progress_callback:
-                progress_callback(i, total_files, item.name)
+                progress_callback(i, scan_buffer.produced if scan_buffer else total_files, item.name)
 
             try:
-                # Get Category Logic
-                category, confidence, method, ai_cat, ai_conf, ext_cat = self.get_category(item, use_ml)
+                # Category comes from the categorize stage; re-raise its failure inside this file's handler
+                if isinstance(categorized, Exception):
+                    raise categorized
+                category = categorized[0]
 
                 # DUPLICATE DETECTION
-                if detect_duplicates:
-                    file_hash = self._get_file_hash(item)
-                    if file_hash:
-                        if file_hash in known_hashes:
-                            duplicates_count += 1
-                            orig_path = known_hashes[file_hash]
-                            if log_callback:
-                                log_callback(f"SKIP DUPLICATE: {item.name} (already at {orig_path.name})")
-
-                            report.append(
+                if known_files is not None:
+                    # A file of the same size still being moved may be the original; let it land first
+                    if mover is not None and mover.in_flight(record.size) and finish_moves(size=record.size):
+                        return roll_back()
+                    orig_path = known_files.find_duplicate(record)
+                    if orig_path is not None:
+                        duplicates_count += 1
+                        if log_callback:
+                            log_callback(f"SKIP DUPLICATE: {item.name} (already at {orig_path.name})")
+
+                        report.append(
+                            {
+                                "file": item.name,
+                                "status": "duplicate",
+                                "source": str(item),
+                                "duplicate_of": str(orig_path),
+                            }
+                        )
+
+                        if event_callback:
+                            event_callback(
                                 {
+                                    "type": "duplicate",
                                     "file": item.name,
-                                    "status": "duplicate",
                                     "source": str(item),
                                     "duplicate_of": str(orig_path),
                                 }
                             )
-
-                            if event_callback:
-                                event_callback(
-                                    {
-                                        "type": "duplicate",
-                                        "file": item.name,
-                                        "source": str(item),
-                                        "duplicate_of": str(orig_path),
-                                    }
-                                )
-                            continue
-                        else:
-                            known_hashes[file_hash] = item
-
-                # If ML is used, category might be a nested path string "Images/Personal"
-                target_dir = source_path / category
+                        continue
 
                 # Calculate relative destination dir to allow UI to rebuild paths
-                relative_dir_parts = []
+                relative_dir = ""
                 if date_sort:
                     try:
-                        mtime = item.stat().st_mtime
-                        dt = datetime.fromtimestamp(mtime)
-                        year = dt.strftime("%Y")
-                        month = dt.strftime("%B")
-                        target_dir = target_dir / year / month
-                        relative_dir_parts = [year, month]
+                        dt = datetime.fromtimestamp(record.mtime)
+                        relative_dir = f"{dt.strftime('%Y')}/{dt.strftime('%B')}"
                     except Exception as e:
                         if log_callback:
                             log_callback(f"Date error for {item.name}: {e}")
 
-                relative_dir = "/".join(relative_dir_parts) if relative_dir_parts else ""
-
-                # SAFETY CHECK: Ensure the target directory is WITHIN the source_path
-                try:
-                    target_dir.resolve().relative_to(source_path.resolve())
-                except ValueError:
+                # If ML is used, category might be a nested path string "Images/Personal"
+                # SAFETY CHECK: Ensure the target directory is WITHIN the source_path (checked once per folder)
+                target_dir, resolved_target = targets.target(category, relative_dir)
+                if resolved_target is None:
                     msg = f"SAFETY BREACH: Target {target_dir} is outside source {source_path}. Skipping {item.name}."
                     if log_callback:
                         log_callback(msg)
@@ -450,199 +1121,110 @@ class FileOrganizer:
                     continue
 
                 # SKIP ALREADY ORGANIZED FILES
-                if item.parent.resolve() == target_dir.resolve():
+                if targets.resolve_parent(record.parent) == resolved_target:
                     continue
 
                 dest_path = target_dir / item.name
 
-                # Determine final path
-                if dry_run:
-                    final_dest_path = dest_path
+                if mover is None:
+                    record_move(record, dest_path, target_dir, relative_dir, categorized)
                 else:
                     # Ensure target directory exists
-                    dest_path.parent.mkdir(parents=True, exist_ok=True)
-                    # Calculate unique path once right before the move
-                    final_dest_path = self.get_unique_path(dest_path)
-
-                # Show relative path for logging
-                rel_dest: Union[Path, str]
-                try:
-                    rel_dest = final_dest_path.relative_to(source_path)
-                except ValueError:
-                    rel_dest = final_dest_path.name
-
-                log_prefix = "[Dry Run] " if dry_run else ""
-                log_suffix = f" (ML: {method}, {confidence:.2f})" if use_ml and method != "extension" else ""
-
-                event_data = {
-                    "type": "move",
-                    "file": item.name,
-                    "source": str(item),
-                    "destination": str(final_dest_path),
-                    "relative_dir": relative_dir,
-                    "category": category,
-                    "method": method,
-                    "confidence": confidence,
-                    "dry_run": dry_run,
-                    "renamed": final_dest_path.name != item.name,
-                    "ai_category": ai_cat,
-                    "ai_confidence": ai_conf,
-                    "ai_method": method if method != "extension" else "ml",
-                    "ext_category": ext_cat,
-                }
-
-                if dry_run:
-                    if log_callback:
-                        log_callback(f"{log_prefix}would move: {item.name} -> {rel_dest}{log_suffix}")
-                    if event_callback:
-                        event_callback(event_data)
-
-                    report.append(
-                        {
-                            "file": item.name,
-                            "status": "dry_run",
-                            "source": str(item),
-                            "destination": str(final_dest_path),
-                            "category": category,
-                            "method": method,
-                            "confidence": confidence,
-                            "ai_category": ai_cat,
-                            "ai_confidence": ai_conf,
-                            "ext_category": ext_cat,
-                        }
-                    )
-                else:
-                    shutil.move(str(item), final_dest_path)
-                    current_history.append((final_dest_path, item))
-
-                    if final_dest_path.name != item.name:
-                        event_data["new_name"] = final_dest_path.name
-                        renamed_count += 1
-
-                    if log_callback:
-                        msg = f"Moved: {item.name} -> {rel_dest}{log_suffix}"
-                        if final_dest_path.name != item.name:
-                            msg = f"Renamed & Moved: {item.name} -> {final_dest_path.name} (in {rel_dest}){log_suffix}"
-                        log_callback(msg)
-
-                    if event_callback:
-                        event_callback(event_data)
-
-                    report.append(
-                        {
-                            "file": item.name,
-                            "status": "moved",
-                            "source": str(item),
-                            "destination": str(final_dest_path),
-                            "category": category,
-                            "method": method,
-                            "confidence": confidence,
-                            "renamed": final_dest_path.name != item.name,
-                        }
-                    )
-
-                moved_count += 1
-
-            except PermissionError as e:
-                errors += 1
-                msg = f"PERMISSION ERROR: Cannot move {item.name} (file may be in use): {e}"
-                if log_callback:
-                    log_callback(msg)
-                logger.error(msg)
-
-                report.append({"file": item.name, "status": "error", "error_type": "PermissionError", "error": str(e)})
-
-                if event_callback:
-                    event_callback(
-                        {"type": "error", "file": item.name, "error": str(e), "error_type": "PermissionError"}
+                    targets.ensure_dir(target_dir)
+                    if journal_run is None:
+                        journal_run = self.undo_journal.begin_run(source_path)
+                    # Names are taken here, in scan order, so collisions resolve the same way however moves finish
+                    final_dest_path = names.reserve(dest_path)
+                    # Write-ahead: journal the move before making it, so a killed run can still be undone
+                    journal_run.append(final_dest_path, item)
+                    if landed is not None:
+                        landed.add(str(final_dest_path))
+                    if known_files is not None:
+                        known_files.set_moving(record)
+                    mover.submit(
+                        item,
+                        final_dest_path,
+                        (record.device, targets.device(target_dir)),
+                        record.size,
+                        (record, final_dest_path, dest_path, target_dir, relative_dir, categorized),
                     )
-
-                if rollback_on_error and not dry_run:
-                    if log_callback:
-                        log_callback("Critical error encountered. Rolling back changes...")
-                    self._undo_history(current_history, source_path, log_callback)
-                    return {
-                        "moved": moved_count,
-                        "errors": errors,
-                        "renamed": renamed_count,
-                        "duplicates": duplicates_count,
-                        "rolled_back": True,
-                        "report": report,
-                    }
-
-            except OSError as e:
-                errors += 1
-                msg = f"OS ERROR moving {item.name}: {e}"
-                if log_callback:
-                    log_callback(msg)
-                logger.error(msg)
-
-                report.append({"file": item.name, "status": "error", "error_type": "OSError", "error": str(e)})
-
-                if event_callback:
-                    event_callback({"type": "error", "file": item.name, "error": str(e), "error_type": "OSError"})
-
-                if rollback_on_error and not dry_run:
-                    if log_callback:
-                        log_callback("Critical error encountered. Rolling back changes...")
-                    self._undo_history(current_history, source_path, log_callback)
-                    return {
-                        "moved": moved_count,
-                        "errors": errors,
-                        "renamed": renamed_count,
-                        "duplicates": duplicates_count,
-                        "rolled_back": True,
-                        "report": report,
-                    }
+                    if finish_moves():
+                        return roll_back()
 
             except Exception as e:
+                if record_error(item, e):
+                    return roll_back()
+
+        transfer_stats: Optional[dict] = None
+        if mover is not None:
+            if finish_moves(wait=True):
+                return roll_back()
+            mover.close()
+            transfer_stats = mover.as_dict()
+            logger.info(
+                f"Moved {transfer_stats['files']} files ({transfer_stats['bytes'] / 1_000_000:.1f} MB) "
+                f"in {transfer_stats['seconds']:.2f}s: {transfer_stats['files_per_second']} files/s, "
+                f"{transfer_stats['mb_per_second']} MB/s"
+            )
+
+        if scan_buffer:
+            scan_buffer.close()
+            if scan_buffer.error:
                 errors += 1
-                msg = f"UNEXPECTED ERROR moving {item.name}: {type(e).__name__}: {e}"
                 if log_callback:
-                    log_callback(msg)
-                logger.error(msg)
-
-                report.append({"file": item.name, "status": "error", "error_type": type(e).__name__, "error": str(e)})
-
-                if event_callback:
-                    event_callback(
-                        {"type": "error", "file": item.name, "error": str(e), "error_type": type(e).__name__}
-                    )
-
-                if rollback_on_error and not dry_run:
-                    if log_callback:
-                        log_callback("Critical error encountered. Rolling back changes...")
-                    # Rollback only current partial history
-                    self._undo_history(current_history, source_path, log_callback)
-                    return {
-                        "moved": moved_count,
-                        "errors": errors,
-                        "renamed": renamed_count,
-                        "duplicates": duplicates_count,
-                        "rolled_back": True,
-                        "report": report,
-                    }
+                    log_callback(f"Error scanning files: {scan_buffer.error}")
+
+        if known_files is not None:
+            known_files.close()
+            logger.info(
+                f"Duplicate check: {len(known_files)} files indexed, "
+                f"{known_files.partial_hashes} partial and {known_files.full_hashes} full hashes"
+            )
+            if options.use_hash_cache and self._hash_cache is not None:
+                self._hash_cache.flush()
+
+        if use_ml and self.ml_categorizer:
+            self.ml_categorizer.flush_embedding_cache()
+
+        if extractor is not None:
+            extractor.close()
+            meters["extract"].add(extractor.extracted + extractor.timeouts, extractor.seconds)
+            if extractor.timeouts or extractor.errors:
+                logger.warning(f"Text extraction: {extractor.timeouts} timed out, {extractor.errors} failed")
+        stages = {name: meter.as_dict() for name, meter in meters.items()}
+        throughput = (f"{name} {m['items']} in {m['seconds']:.2f}s ({m['per_second']}/s)" for name, m in stages.items())
+        logger.info("Stage throughput: " + ", ".join(throughput))
+
+        # Planned folders the run ended up not using (the plan was stale, or the run stopped early)
+        for directory in reversed(pre_created):
+            try:
+                directory.rmdir()
+            except OSError:
+                pass
 
         # Delete Empty Folders
         if del_empty and not dry_run:
             if log_callback:
                 log_callback("Cleaning up empty folders...")
             deleted_folders = 0
-            for root_dir, dirs, files in os.walk(source_path, topdown=False):
-                for name in dirs:
-                    # Don't delete excluded folders even if empty (though we shouldn't have entered them)
-                    if name in self.excluded_folders:
-                        continue
+            if records is not None:
+                deleted_folders = self._delete_empty_parents(source_path, (source for _, source in current_history))
+            else:
+                for root_dir, dirs, files in os.walk(source_path, topdown=False):
+                    for name in dirs:
+                        # Don't delete excluded folders even if empty (though we shouldn't have entered them)
+                        if name in self.excluded_folders:
+                            continue
 
-                    d = os.path.join(root_dir, name)
-                    try:
-                        # Convert to absolute path to be safe
-                        d_path = Path(d).resolve()
-                        if d_path.is_dir() and not any(d_path.iterdir()):
-                            os.rmdir(d)
-                            deleted_folders += 1
-                    except Exception:
-                        pass
+                        d = os.path.join(root_dir, name)
+                        try:
+                            # Convert to absolute path to be safe
+                            d_path = Path(d).resolve()
+                            if d_path.is_dir() and not any(d_path.iterdir()):
+                                os.rmdir(d)
+                                deleted_folders += 1
+                        except Exception:
+                            pass
             if deleted_folders > 0 and log_callback:
                 log_callback(f"Removed {deleted_folders} empty folders.")
 
@@ -653,23 +1235,55 @@ class FileOrganizer:
             summary += f". ({errors} errors) ---"
             log_callback(summary)
 
-        if not dry_run and moved_count > 0:
-            self.undo_stack.append({"history": current_history, "source_path": source_path})
+        if journal_run is not None and moved_count == 0:
+            # Every journaled move failed
+            journal_run.discard()
+        elif journal_run is not None:
+            journal_run.close()
+            self.undo_stack.append(
+                {"source_path": source_path, "segment": journal_run.segment, "moves": journal_run.moves}
+            )
             # Enforce max undo stack size
-            if len(self.undo_stack) > self.max_undo_stack:
-                self.undo_stack.pop(0)
+            while len(self.undo_stack) > self.max_undo_stack:
+                self.undo_journal.remove_segment(self.undo_stack.pop(0))
             self._save_undo_stack()
 
-        return {
+        result: OrganizationResult = {
             "moved": moved_count,
             "errors": errors,
             "renamed": renamed_count,
             "duplicates": duplicates_count,
             "report": report,
+            "stages": stages,
+            "target_dirs": sorted(used_dirs),
         }
+        if transfer_stats is not None:
+            result["transfer"] = transfer_stats
+        return result
+
+    def _delete_empty_parents(self, source_path: Path, moved_from: Iterable[Path]) -> int:
+        """
+        Removes the folders below source_path that moving files out of left empty, walking up from each file's
+        old folder. Excluded folders are kept. Returns the number of folders removed.
+        """
+        deleted = 0
+        for directory in sorted({Path(path).parent for path in moved_from}, key=lambda d: len(d.parts), reverse=True):
+            while directory != source_path and directory.is_relative_to(source_path):
+                if directory.name in self.excluded_folders:
+                    break
+                try:
+                    if any(directory.iterdir()):
+                        break
+                    os.rmdir(directory)
+                    deleted += 1
+                except OSError:
+                    break
+                directory = directory.parent
+        return deleted
 
     def undo_changes(self, log_callback: Optional[Callable] = None) -> int:
         """Reverses the last organization run."""
+        self.wait_for_state()
         if not self.undo_stack:
             if log_callback:
                 log_callback("Nothing to undo.")
@@ -677,7 +1291,17 @@ class FileOrganizer:
 
         # Pop the last operation
         last_op = self.undo_stack.pop()
-        result = self._undo_history(last_op["history"], last_op["source_path"], log_callback)
+        try:
+            history = last_op["history"] if "history" in last_op else self.undo_journal.read_history(last_op)
+        except Exception as e:
+            msg = f"Error reading undo journal: {e}"
+            if log_callback:
+                log_callback(msg)
+            logger.error(msg)
+            self.undo_stack.append(last_op)
+            return 0
+        result = self._undo_history(history, last_op["source_path"], log_callback)
+        self.undo_journal.remove_segment(last_op)
         self._save_undo_stack()
         return result
 
@@ -704,7 +1328,7 @@ class FileOrganizer:
 
                 if current_path.exists():
                     original_path.parent.mkdir(parents=True, exist_ok=True)
-                    shutil.move(str(current_path), str(original_path))
+                    move_no_clobber(current_path, original_path)
                     folders_to_check.add(current_path.parent)
                     count += 1
             except Exception as e:
@@ -0,0 +1,122 @@
+import queue
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Generic, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class BoundedBuffer(Generic[T]):
+    """
+    Runs an iterable on a background thread and hands its items to the consumer through a bounded queue.
+    The producer blocks once `maxsize` items are waiting, so memory stays flat however large the source is.
+    Errors raised by the source end the iteration and are kept in `error` instead of propagating.
+    """
+
+    def __init__(self, source: Iterable[T], maxsize: int = 1024, name: str = "pipeline-stage"):
+        self.produced = 0
+        self.error: Optional[BaseException] = None
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, maxsize))
+        self._stop = threading.Event()
+        self._source = source
+        self._thread = threading.Thread(target=self._produce, name=name, daemon=True)
+        self._started = False
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self):
+        try:
+            for item in self._source:
+                self.produced += 1
+                if not self._put(item):
+                    return
+        except BaseException as e:
+            self.error = e
+        self._put(_DONE)
+
+    def __iter__(self) -> Iterator[T]:
+        if not self._started:
+            self._started = True
+            self._thread.start()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _DONE:
+                    return
+                yield item
+        finally:
+            self.close()
+
+    def close(self):
+        """Stops the producer, e.g. when the consumer bails out early."""
+        self._stop.set()
+
+
+def lookahead(source: Iterable[T], size: int, on_enter: Callable[[T], None]) -> Iterator[T]:
+    """
+    Yields `source` unchanged while keeping up to `size` items read ahead, calling `on_enter` for each item as
+    it enters the window. Lets a stage start work (e.g. hashing) for items the consumer will reach soon.
+    """
+    window: deque = deque()
+    for item in source:
+        on_enter(item)
+        window.append(item)
+        if len(window) > size:
+            yield window.popleft()
+    while window:
+        yield window.popleft()
+
+
+class StageMeter:
+    """Throughput counter for one pipeline stage: items handled and the time spent handling them."""
+
+    def __init__(self):
+        self.items = 0
+        self.seconds = 0.0
+
+    def add(self, items: int, seconds: float):
+        self.items += items
+        self.seconds += seconds
+
+    @contextmanager
+    def measure(self, items: int = 1):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(items, time.perf_counter() - start)
+
+    def producer(self, source: Iterable[T]) -> Iterator[T]:
+        """Yields `source` unchanged, timing how long it takes to produce each item."""
+        iterator = iter(source)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.seconds += time.perf_counter() - start
+                return
+            self.add(1, time.perf_counter() - start)
+            yield item
+
+    def consumer(self, source: Iterable[T]) -> Iterator[T]:
+        """Yields `source` unchanged, timing how long the consumer spends on each item before asking for the next."""
+        for item in source:
+            start = time.perf_counter()
+            yield item
+            self.add(1, time.perf_counter() - start)
+
+    def as_dict(self) -> dict:
+        rate = self.items / self.seconds if self.seconds > 0 else 0.0
+        return {"items": self.items, "seconds": round(self.seconds, 3), "per_second": round(rate, 1)}
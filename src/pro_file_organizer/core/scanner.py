@@ -0,0 +1,247 @@
+import os
+import stat
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional, Union
+
+
+class FileRecord(NamedTuple):
+    """
+    Compact per-file record captured from a single ``os.scandir`` entry.
+    Later pipeline stages read size/mtime/inode from here instead of stat-ing the file again.
+    """
+
+    name: str
+    parent: str
+    size: int
+    mtime_ns: int
+    inode: int
+    device: int
+    file_type: int  # stat.S_IFMT bits of the (followed) entry
+
+    @property
+    def path(self) -> Path:
+        return Path(self.parent, self.name)
+
+    @property
+    def suffix(self) -> str:
+        return os.path.splitext(self.name)[1]
+
+    @property
+    def mtime(self) -> float:
+        return self.mtime_ns / 1_000_000_000
+
+    @classmethod
+    def from_entry(cls, entry: os.DirEntry, parent: str) -> "FileRecord":
+        st = entry.stat()
+        return cls(
+            name=entry.name,
+            parent=parent,
+            size=st.st_size,
+            mtime_ns=st.st_mtime_ns,
+            inode=st.st_ino,
+            device=st.st_dev,
+            file_type=stat.S_IFMT(st.st_mode),
+        )
+
+    @classmethod
+    def from_path(cls, path: Union[str, Path]) -> "FileRecord":
+        p = Path(path)
+        st = p.stat()
+        return cls(
+            name=p.name,
+            parent=str(p.parent),
+            size=st.st_size,
+            mtime_ns=st.st_mtime_ns,
+            inode=st.st_ino,
+            device=st.st_dev,
+            file_type=stat.S_IFMT(st.st_mode),
+        )
+
+
+def _is_excluded_file(name: str, excluded_names: Iterable[str], excluded_extensions: Iterable[str]) -> bool:
+    if name in excluded_names:
+        return True
+    return os.path.splitext(name)[1].lower() in excluded_extensions
+
+
+def list_dir(
+    directory: Union[str, Path],
+    excluded_folders: Iterable[str] = (),
+    excluded_names: Iterable[str] = (),
+    excluded_extensions: Iterable[str] = (),
+) -> tuple[list[FileRecord], list[str]]:
+    """
+    Lists one directory with a single scandir pass.
+    Returns (file records, sub-directory paths). Symlinked directories are not followed, matching os.walk.
+    """
+    parent = str(directory)
+    files: list[FileRecord] = []
+    subdirs: list[str] = []
+    with os.scandir(parent) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in excluded_folders:
+                        subdirs.append(entry.path)
+                    continue
+                if not entry.is_file():
+                    continue
+                if _is_excluded_file(entry.name, excluded_names, excluded_extensions):
+                    continue
+                files.append(FileRecord.from_entry(entry, parent))
+            except OSError:
+                # Entry vanished or is unreadable between listing and stat
+                continue
+    return files, subdirs
+
+
+def walk_records(
+    root: Union[str, Path],
+    excluded_folders: Iterable[str] = (),
+    excluded_names: Iterable[str] = (),
+    excluded_extensions: Iterable[str] = (),
+) -> Iterator[FileRecord]:
+    """
+    Depth-first, top-down walk yielding FileRecords in the same order as os.walk.
+    Unreadable sub-directories are skipped silently, like os.walk without onerror.
+    """
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            files, subdirs = list_dir(directory, excluded_folders, excluded_names, excluded_extensions)
+        except OSError:
+            continue
+        yield from files
+        stack.extend(reversed(subdirs))
+
+
+class ParallelWalker:
+    """
+    Lists directories concurrently with a pool of threads and yields FileRecords in walk_records() order.
+
+    Each worker owns a deque of directories: it pushes the sub-directories it discovers onto its own deque,
+    pops from the same end (depth-first, good locality) and steals from the opposite end of the other workers'
+    deques when it runs dry. Listings are handed to the consumer, which replays them in serial depth-first
+    order, so the output is deterministic regardless of which worker listed what.
+
+    At most `max_listings` finished listings wait for the consumer; workers pause once that many are buffered,
+    so a slow consumer (e.g. a streaming organize) keeps memory bounded however large the tree is. If the
+    directory the consumer needs next is not being listed yet, the consumer lists it itself.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        workers: int = 8,
+        excluded_folders: Iterable[str] = (),
+        excluded_names: Iterable[str] = (),
+        excluded_extensions: Iterable[str] = (),
+        max_listings: int = 256,
+    ):
+        self.root = str(root)
+        self.workers = max(1, workers)
+        self.max_listings = max(1, max_listings)
+        self._exclusions = (excluded_folders, excluded_names, excluded_extensions)
+        self._deques: list[deque] = [deque() for _ in range(self.workers)]
+        self._results: dict[str, tuple[list[FileRecord], list[str]]] = {}
+        # Directories a worker is listing or has listed, until the consumer takes the result
+        self._taken: set[str] = set()
+        # Directories the consumer listed itself; their deque entries are dropped when a worker pops them
+        self._listed_inline: set[str] = set()
+        self._pending = 0
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+
+    def _next_task(self, idx: int) -> Optional[str]:
+        try:
+            return self._deques[idx].pop()
+        except IndexError:
+            pass
+        for offset in range(1, self.workers):
+            try:
+                return self._deques[(idx + offset) % self.workers].popleft()
+            except IndexError:
+                continue
+        return None
+
+    def _list(self, directory: str) -> tuple[list[FileRecord], list[str]]:
+        try:
+            return list_dir(directory, *self._exclusions)
+        except Exception:
+            # Unreadable directories are skipped, like the serial walk
+            return [], []
+
+    def _worker(self, idx: int):
+        while not self._stop.is_set():
+            with self._cond:
+                # Backpressure: wait for the consumer to take some listings
+                while len(self._results) >= self.max_listings and not self._stop.is_set():
+                    self._cond.wait(0.05)
+            directory = self._next_task(idx)
+            if directory is None:
+                with self._cond:
+                    if self._pending == 0:
+                        return
+                    self._cond.wait(0.05)
+                continue
+
+            with self._cond:
+                if directory in self._listed_inline:
+                    self._listed_inline.discard(directory)
+                    continue
+                self._taken.add(directory)
+
+            files, subdirs = self._list(directory)
+
+            if subdirs:
+                # Count new work before publishing it so _pending never reaches zero early
+                with self._cond:
+                    self._pending += len(subdirs)
+                self._deques[idx].extend(subdirs)
+
+            with self._cond:
+                self._pending -= 1
+                self._results[directory] = (files, subdirs)
+                self._cond.notify_all()
+
+    def _wait_for(self, directory: str) -> tuple[list[FileRecord], list[str]]:
+        with self._cond:
+            while directory not in self._results:
+                if directory not in self._taken and len(self._results) >= self.max_listings:
+                    # The workers are paused and none of them has this one: list it here
+                    self._listed_inline.add(directory)
+                    break
+                self._cond.wait()
+            else:
+                self._taken.discard(directory)
+                result = self._results.pop(directory)
+                self._cond.notify_all()
+                return result
+
+        files, subdirs = self._list(directory)
+        with self._cond:
+            self._pending += len(subdirs) - 1
+        self._deques[0].extend(subdirs)
+        return files, subdirs
+
+    def __iter__(self) -> Iterator[FileRecord]:
+        self._pending = 1
+        self._deques[0].append(self.root)
+        threads = [
+            threading.Thread(target=self._worker, args=(i,), name=f"scan-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in threads:
+            t.start()
+
+        try:
+            stack = [self.root]
+            while stack:
+                files, subdirs = self._wait_for(stack.pop())
+                yield from files
+                stack.extend(reversed(subdirs))
+        finally:
+            self._stop.set()
@@ -0,0 +1,385 @@
+"""
+Moving files into the organized tree: free destination names are handed out from an in-memory index, moves
+never overwrite an existing file, and MoveExecutor runs them in parallel with a limit per device.
+"""
+
+import errno
+import os
+import shutil
+import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Union
+
+PathLike = Union[str, Path]
+
+# renameat2() flag and "relative to the working directory" fd, from <linux/fs.h> and <fcntl.h>
+RENAME_NOREPLACE = 1
+AT_FDCWD = -100
+# ioctl that makes a file share another file's blocks (reflink; btrfs, XFS, ...), from <linux/fs.h>
+FICLONE = 0x40049409
+
+# Bytes per read/write when the kernel can't copy for us; copy_file_range/sendfile calls ask for at most
+# COPY_MAX_CALL at a time, which also keeps the count within a 32-bit ssize_t
+COPY_CHUNK = 1024 * 1024
+COPY_MAX_CALL = 1 << 30
+
+# Errors meaning "this way of moving is not available here", as opposed to a real failure
+_UNSUPPORTED = {errno.EINVAL, errno.ENOSYS, errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EOPNOTSUPP}
+# Same for the copy primitives, which also report ENOTTY (no FICLONE ioctl) or EBADF (fd type not supported)
+_NO_FAST_COPY = _UNSUPPORTED | {errno.ENOTTY, errno.EBADF}
+
+_renameat2: Any = None
+_renameat2_loaded = False
+
+
+def _load_renameat2() -> Any:
+    """libc's renameat2(), or None where it is missing (non-Linux, old glibc)."""
+    global _renameat2, _renameat2_loaded
+    if not _renameat2_loaded:
+        _renameat2_loaded = True
+        if sys.platform.startswith("linux"):
+            import ctypes
+
+            try:
+                func = ctypes.CDLL(None, use_errno=True).renameat2
+            except (OSError, AttributeError):
+                func = None
+            if func is not None:
+                func.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint]
+                func.restype = ctypes.c_int
+            _renameat2 = func
+    return _renameat2
+
+
+def _rename_noreplace(src: str, dst: str) -> bool:
+    """Atomic rename that fails if `dst` exists. Returns False if the kernel or filesystem can't do it."""
+    func = _load_renameat2()
+    if func is None:
+        return False
+    if func(AT_FDCWD, os.fsencode(src), AT_FDCWD, os.fsencode(dst), RENAME_NOREPLACE) == 0:
+        return True
+    import ctypes
+
+    err = ctypes.get_errno()
+    if err in _UNSUPPORTED:
+        return False
+    raise OSError(err, os.strerror(err), src, None, dst)
+
+
+def _link_noreplace(src: str, dst: str) -> bool:
+    """Hard-links `src` as `dst` (which fails if `dst` exists), then unlinks `src`. False if links don't work."""
+    try:
+        os.link(src, dst, follow_symlinks=False)
+    except FileExistsError:
+        raise
+    except (NotImplementedError, OSError) as e:
+        if isinstance(e, NotImplementedError) or e.errno in _UNSUPPORTED:
+            return False
+        raise
+    os.unlink(src)
+    return True
+
+
+def _clone(src_fd: int, dst_fd: int) -> bool:
+    """Reflinks the whole file: no data is copied at all. False if the filesystem can't share blocks."""
+    if not sys.platform.startswith("linux"):
+        return False
+    import fcntl
+
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+    except OSError as e:
+        if e.errno in _NO_FAST_COPY:
+            return False
+        raise
+    return True
+
+
+def _copy_in_kernel(copy: Callable[[int, int, int, int], int], src_fd: int, dst_fd: int, size: int) -> bool:
+    """
+    Copies `size` bytes with copy_file_range() or sendfile(), without the data passing through Python. False
+    if the call is not supported for these files, which is only ever found out before anything was written.
+    """
+    offset = 0
+    while offset < size:
+        try:
+            copied = copy(src_fd, dst_fd, offset, min(size - offset, COPY_MAX_CALL))
+        except OSError as e:
+            if offset == 0 and e.errno in _NO_FAST_COPY:
+                return False
+            raise
+        if copied == 0:
+            # Some filesystems report 0 instead of an error; after the first call it means the source shrank
+            if offset == 0:
+                return False
+            break
+        offset += copied
+    return True
+
+
+def _copy_chunked(src_fd: int, dst_fd: int):
+    while True:
+        data = os.read(src_fd, COPY_CHUNK)
+        if not data:
+            return
+        view = memoryview(data)
+        while view:
+            view = view[os.write(dst_fd, view) :]
+
+
+def _copy_contents(src_fd: int, dst_fd: int, size: int) -> str:
+    """Copies an open file's data into an empty one with the fastest primitive that works. Returns its name."""
+    if size == 0:
+        return "empty"
+    if _clone(src_fd, dst_fd):
+        return "reflink"
+    copy_file_range = getattr(os, "copy_file_range", None)
+    if copy_file_range is not None and _copy_in_kernel(
+        lambda s, d, _offset, count: copy_file_range(s, d, count), src_fd, dst_fd, size
+    ):
+        return "copy_file_range"
+    # sendfile() takes the source offset explicitly, so the source position is still 0 for the next fallback
+    if sys.platform.startswith("linux") and _copy_in_kernel(
+        lambda s, d, offset, count: os.sendfile(d, s, offset, count), src_fd, dst_fd, size
+    ):
+        return "sendfile"
+    _copy_chunked(src_fd, dst_fd)
+    return "chunked"
+
+
+def copy_file_noreplace(src: PathLike, dst: PathLike) -> str:
+    """
+    Copies a regular file to `dst`, which must not exist yet: the name is claimed with O_EXCL and the data is
+    written into that same file descriptor. The data is reflinked if the filesystem can share blocks, else
+    copied in the kernel with copy_file_range() or sendfile(), and only as a last resort read and written in
+    chunks. Permissions and timestamps are copied as shutil.copy2 does. The copy is checked to have the
+    source's size; on any failure the partial copy is removed. Returns the method used.
+    """
+    binary = getattr(os, "O_BINARY", 0)
+    src_fd = os.open(src, os.O_RDONLY | binary)
+    try:
+        size = os.fstat(src_fd).st_size
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_EXCL | binary, 0o600)
+        try:
+            try:
+                method = _copy_contents(src_fd, dst_fd, size)
+                copied = os.fstat(dst_fd).st_size
+            finally:
+                os.close(dst_fd)
+            if copied != size:
+                raise OSError(errno.EIO, f"Copied {copied} of {size} bytes; the file changed during the move", src)
+            shutil.copystat(src, dst)
+        except BaseException:
+            os.unlink(dst)
+            raise
+    finally:
+        os.close(src_fd)
+    return method
+
+
+def _copy_noreplace(src: str, dst: str):
+    """Cross-device move: copies to `dst` without replacing anything (see copy_file_noreplace), then removes `src`."""
+    if os.path.islink(src):
+        # Symlinks move as links, like shutil.move; creating one never replaces an existing file
+        os.symlink(os.readlink(src), dst)
+    else:
+        copy_file_noreplace(src, dst)
+    os.unlink(src)
+
+
+def move_no_clobber(src: PathLike, dst: PathLike):
+    """
+    Moves a file to `dst`, raising FileExistsError instead of replacing a file that is already there. The
+    check and the move are one atomic step: renameat2(RENAME_NOREPLACE) on Linux, rename on Windows (which
+    never replaces), otherwise a hard link plus unlink. Across filesystems the file is copied with
+    copy_file_noreplace() and the original removed once the copy is complete.
+    """
+    src, dst = os.fspath(src), os.fspath(dst)
+    if os.name == "nt":
+        try:
+            os.rename(src, dst)
+            return
+        except FileExistsError:
+            raise
+        except OSError as e:
+            # ERROR_NOT_SAME_DEVICE
+            if getattr(e, "winerror", None) != 17:
+                raise
+    elif _rename_noreplace(src, dst) or _link_noreplace(src, dst):
+        return
+    _copy_noreplace(src, dst)
+
+
+class _Directory:
+    __slots__ = ("names", "next_suffix")
+
+    def __init__(self, names: set[str]):
+        self.names = names
+        # (stem, suffix) -> lowest counter that might still be free
+        self.next_suffix: dict[tuple[str, str], int] = {}
+
+
+class NameIndex:
+    """
+    Names taken in each destination directory, listed once with scandir and updated as files are placed, so
+    a free name is found without probing the disk. Collisions get the same `name_1`, `name_2`, ... suffixes as
+    before; a per-name counter remembers the last one handed out, so 20k files called IMG_0001.jpg cost one
+    listing instead of a quadratic number of exists() calls. Names are compared with os.path.normcase.
+    Thread-safe.
+    """
+
+    def __init__(self):
+        self._dirs: dict[str, _Directory] = {}
+        self._lock = threading.Lock()
+
+    def _directory(self, directory: str) -> _Directory:
+        entry = self._dirs.get(directory)
+        if entry is None:
+            try:
+                with os.scandir(directory) as it:
+                    names = {os.path.normcase(e.name) for e in it}
+            except FileNotFoundError:
+                names = set()
+            entry = self._dirs[directory] = _Directory(names)
+        return entry
+
+    def reserve(self, path: Path) -> Path:
+        """Returns `path`, or the first free `stem_N` variant of it, and marks that name as taken."""
+        with self._lock:
+            directory = self._directory(str(path.parent))
+            name = os.path.normcase(path.name)
+            if name not in directory.names:
+                directory.names.add(name)
+                return path
+
+            stem, suffix = path.stem, path.suffix
+            counter = directory.next_suffix.get((stem, suffix), 1)
+            while os.path.normcase(f"{stem}_{counter}{suffix}") in directory.names:
+                counter += 1
+            directory.names.add(os.path.normcase(f"{stem}_{counter}{suffix}"))
+            directory.next_suffix[(stem, suffix)] = counter + 1
+            return path.with_name(f"{stem}_{counter}{suffix}")
+
+    def release(self, path: Path):
+        """Marks a name as free again, e.g. after the file was moved away."""
+        with self._lock:
+            directory: Optional[_Directory] = self._dirs.get(str(path.parent))
+            if directory is not None:
+                directory.names.discard(os.path.normcase(path.name))
+
+
+class MoveExecutor:
+    """
+    Runs moves on `workers` threads, with at most `per_device` of them touching any one device (as source or
+    destination) at a time. Renames within a filesystem wait on metadata updates and cross-device moves on
+    copying; a few at once keep an SSD or a network share busy, while the per-device limit stops many small
+    moves from piling onto one slow disk. With one worker, moves run inline in submit().
+
+    Results come back in submission order, so whatever is built from them (undo history, report) is the same
+    however the moves interleave. Destination names must be reserved before submitting; a move that finds its
+    name taken reports FileExistsError like move_no_clobber().
+    """
+
+    def __init__(
+        self, workers: int = 1, per_device: int = 2, move: Callable = move_no_clobber, window: Optional[int] = None
+    ):
+        self.workers = max(1, workers)
+        self.per_device = max(1, per_device)
+        self._move = move
+        # Submitted but not yet returned by results(); bounds memory and how far moves run ahead
+        self._window = window or self.workers * 4
+        self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="organizer-move") if self.workers > 1 else None
+        self._limits: dict[int, threading.Semaphore] = {}
+        self._limits_lock = threading.Lock()
+        self._pending: deque[tuple[Any, int, Future]] = deque()
+        self._pending_sizes: Counter[int] = Counter()
+        self.files = 0
+        self.bytes = 0
+        # Wall time during which at least one move was outstanding
+        self.seconds = 0.0
+        self._busy_since = 0.0
+        self._last_done = 0.0
+
+    def _limit(self, device: int) -> threading.Semaphore:
+        with self._limits_lock:
+            limit = self._limits.get(device)
+            if limit is None:
+                limit = self._limits[device] = threading.Semaphore(self.per_device)
+            return limit
+
+    def _run(self, src: PathLike, dst: PathLike, devices: tuple[int, ...]) -> tuple[Optional[BaseException], float]:
+        # Sorted, so two moves between the same pair of devices never wait on each other's slot
+        limits = [self._limit(device) for device in sorted(set(devices))]
+        for limit in limits:
+            limit.acquire()
+        try:
+            self._move(src, dst)
+            error = None
+        except Exception as e:
+            error = e
+        finally:
+            for limit in reversed(limits):
+                limit.release()
+        return error, time.perf_counter()
+
+    def submit(self, src: PathLike, dst: PathLike, devices: tuple[int, ...], size: int = 0, tag: Any = None):
+        """Queues moving `src` to `dst`; `devices` are the st_dev of both ends. `tag` is returned with the result."""
+        if not self._pending:
+            self._busy_since = time.perf_counter()
+        future: Future
+        if self._pool is not None:
+            future = self._pool.submit(self._run, src, dst, devices)
+        else:
+            future = Future()
+            future.set_result(self._run(src, dst, devices))
+        self._pending.append((tag, size, future))
+        self._pending_sizes[size] += 1
+
+    def in_flight(self, size: int) -> bool:
+        """Whether a submitted move of a file of this size has not been returned by results() yet."""
+        return self._pending_sizes[size] > 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def results(self, wait: bool = False, size: Optional[int] = None) -> Iterator[tuple[Any, Optional[Exception]]]:
+        """
+        Yields (tag, error) for finished moves in submission order, error being None on success. Stops at the
+        first unfinished move, unless `wait` is set, more than `window` moves are outstanding, or `size` is
+        given and a move of that size is still outstanding.
+        """
+        while self._pending:
+            tag, item_size, future = self._pending[0]
+            must_wait = wait or len(self._pending) > self._window or (size is not None and self.in_flight(size))
+            if not (must_wait or future.done()):
+                return
+            error, done = future.result()
+            self._pending.popleft()
+            self._pending_sizes[item_size] -= 1
+            self._last_done = max(self._last_done, done)
+            if not self._pending:
+                self.seconds += self._last_done - self._busy_since
+            if error is None:
+                self.files += 1
+                self.bytes += item_size
+            yield tag, error
+
+    def close(self):
+        """Waits for outstanding moves and stops the threads. Results not collected yet are dropped."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+
+    def as_dict(self) -> dict:
+        files_rate = self.files / self.seconds if self.seconds > 0 else 0.0
+        mb_rate = self.bytes / 1_000_000 / self.seconds if self.seconds > 0 else 0.0
+        return {
+            "files": self.files,
+            "bytes": self.bytes,
+            "seconds": round(self.seconds, 3),
+            "files_per_second": round(files_rate, 1),
+            "mb_per_second": round(mb_rate, 1),
+        }
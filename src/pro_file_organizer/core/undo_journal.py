@@ -0,0 +1,248 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+from .logger import logger
+
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+
+
+def _relative(path: Path, prefix: str) -> str:
+    """Stores paths inside the run's source folder relative to it; anything else stays absolute."""
+    s = str(path)
+    return s[len(prefix) :] if s.startswith(prefix) else s
+
+
+def _process_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        import ctypes
+
+        # PROCESS_QUERY_LIMITED_INFORMATION; os.kill(pid, 0) would terminate the process on Windows
+        handle = ctypes.windll.kernel32.OpenProcess(0x1000, False, pid)  # type: ignore[attr-defined]
+        if not handle:
+            return False
+        ctypes.windll.kernel32.CloseHandle(handle)  # type: ignore[attr-defined]
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JournalRun:
+    """
+    Write-ahead segment of a single organize run. Each move is appended *before* it happens, one JSON line
+    per move: ``["<new path>", "<original path>"]`` relative to the source folder. The first line is a header
+    with the run's source folder and process id, so a segment can be recovered without the index.
+
+    Every record is flushed to the OS before the move, which survives the process being killed. fsync is
+    batched (group commit) every `sync_every` records or `sync_interval_ms`, whichever comes first, bounding
+    what a power loss can drop. A record whose move never happened is harmless: undo skips paths that do
+    not exist.
+    """
+
+    def __init__(self, segment: Path, source_path: Path, sync_every: int = 256, sync_interval_ms: int = 200):
+        self.segment = segment
+        self.source_path = source_path
+        self.moves = 0
+        self.syncs = 0
+        self.sync_every = max(1, sync_every)
+        self.sync_interval = sync_interval_ms / 1000
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._prefix = str(source_path) + os.sep
+        self._file = open(segment, "w", encoding="utf-8")
+        header = {"source_path": str(source_path), "created": time.time(), "pid": os.getpid()}
+        self._file.write(json.dumps(header) + "\n")
+        self._sync()
+
+    def append(self, new_path: Path, original_path: Path):
+        self._file.write(json.dumps([_relative(new_path, self._prefix), _relative(original_path, self._prefix)]))
+        self._file.write("\n")
+        self._file.flush()
+        self.moves += 1
+        self._unsynced += 1
+        if self._unsynced >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+            self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.syncs += 1
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            if self._unsynced:
+                self._sync()
+            self._file.close()
+
+    def discard(self):
+        """Drops the segment, e.g. after the run was rolled back."""
+        self.close()
+        try:
+            self.segment.unlink()
+        except OSError as e:
+            logger.error(f"Error removing undo segment {self.segment}: {e}")
+
+
+class UndoJournal:
+    """
+    Append-only undo log: one segment file per organize run plus a small index listing the runs that can still
+    be undone. Startup only reads the index; a run's moves are read from its segment when it is undone.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        legacy_file: Optional[Union[str, Path]] = None,
+        sync_every: int = 256,
+        sync_interval_ms: int = 200,
+    ):
+        self.directory = Path(directory)
+        self.legacy_file = Path(legacy_file) if legacy_file else None
+        self.sync_every = sync_every
+        self.sync_interval_ms = sync_interval_ms
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / INDEX_FILE
+
+    def begin_run(self, source_path: Path) -> JournalRun:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        segment = self.directory / f"run-{time.time_ns()}.jsonl"
+        run = JournalRun(segment, source_path, self.sync_every, self.sync_interval_ms)
+        self._sync_directory()
+        return run
+
+    def _sync_directory(self):
+        """Makes the new segment's directory entry durable (POSIX only)."""
+        if os.name == "nt":
+            return
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def find_interrupted(self, known: list[dict]) -> list[dict]:
+        """
+        Returns segments that are not in the index and whose process has exited, i.e. runs that were killed
+        before they finished, oldest first. Each has "source_path", "segment" and "moves".
+        """
+        if not self.directory.is_dir():
+            return []
+        listed = {Path(run["segment"]).name for run in known if "segment" in run}
+        interrupted = []
+        for segment in sorted(self.directory.glob("run-*.jsonl")):
+            if segment.name in listed:
+                continue
+            try:
+                with open(segment, "r", encoding="utf-8") as f:
+                    header = json.loads(f.readline())
+                    moves = sum(1 for line in f if line.strip())
+            except (OSError, ValueError) as e:
+                logger.error(f"Unreadable undo segment {segment}: {e}")
+                continue
+            pid = header.get("pid")
+            if pid is not None and _process_alive(pid):
+                # A run in progress, possibly in another instance
+                continue
+            interrupted.append({"source_path": Path(header["source_path"]), "segment": segment, "moves": moves})
+        return interrupted
+
+    def load_index(self) -> list[dict]:
+        """
+        Returns the undoable runs, oldest first, as dicts with "source_path", "segment" and "moves".
+        A legacy undo_stack.json is converted to segments the first time.
+        """
+        if not self.index_path.exists() and self.legacy_file is not None and self.legacy_file.exists():
+            self._migrate_legacy()
+        if not self.index_path.exists():
+            return []
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return [
+            {"source_path": Path(run["source_path"]), "segment": self.directory / run["segment"], "moves": run["moves"]}
+            for run in data.get("runs", [])
+        ]
+
+    def save_index(self, runs: list[dict]):
+        """Rewrites the index (a few lines per run) atomically. Runs without a segment are written out first."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for run in runs:
+            if "segment" not in run:
+                self._write_segment(run)
+            entries.append(
+                {"source_path": str(run["source_path"]), "segment": run["segment"].name, "moves": run["moves"]}
+            )
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "runs": entries}, f)
+        os.replace(tmp, self.index_path)
+
+    def _write_segment(self, run: dict):
+        journal_run = self.begin_run(run["source_path"])
+        for new_path, original_path in run["history"]:
+            journal_run.append(new_path, original_path)
+        journal_run.close()
+        run["segment"] = journal_run.segment
+        run["moves"] = journal_run.moves
+
+    def read_history(self, run: dict) -> list[tuple[Path, Path]]:
+        """Loads the (new path, original path) pairs of a run, in the order they were moved."""
+        source_path = Path(run["source_path"])
+        history = []
+        with open(run["segment"], "r", encoding="utf-8") as f:
+            f.readline()  # header
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    new_rel, original_rel = json.loads(line)
+                except ValueError:
+                    # Torn final record of an interrupted run
+                    logger.warning(f"Skipping damaged record in {run['segment']}")
+                    break
+                # Joining keeps absolute paths (moves outside the source folder) as they are
+                history.append((source_path / new_rel, source_path / original_rel))
+        return history
+
+    def remove_segment(self, run: dict):
+        segment = run.get("segment")
+        if segment is None:
+            return
+        try:
+            Path(segment).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.error(f"Error removing undo segment {segment}: {e}")
+
+    def _migrate_legacy(self):
+        assert self.legacy_file is not None
+        try:
+            with open(self.legacy_file, "r") as f:
+                data = json.load(f)
+            runs = [
+                {
+                    "source_path": Path(item["source_path"]),
+                    "history": [(Path(p1), Path(p2)) for p1, p2 in item["history"]],
+                }
+                for item in data
+            ]
+            self.save_index(runs)
+            self.legacy_file.replace(self.legacy_file.with_name(self.legacy_file.name + ".migrated"))
+            logger.info(f"Migrated {len(runs)} undo runs from {self.legacy_file}")
+        except Exception as e:
+            logger.error(f"Error migrating undo stack {self.legacy_file}: {e}")
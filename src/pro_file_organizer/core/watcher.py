@@ -1,36 +1,150 @@
+import os
+import threading
 import time
 from pathlib import Path
+from typing import Callable, Optional
 
 from .logger import logger
 
+# Seconds without new events before pending files are checked
+WATCH_DEBOUNCE = 2.0
+# Upper bound on how long a steady stream of events can hold back files that are already complete
+WATCH_MAX_LATENCY = 30.0
+# Seconds between the size/mtime checks that decide whether a file is still being written
+WATCH_POLL_INTERVAL = 1.0
+
 
 class FolderWatcherHandler:
-    """Logic for handling file system events."""
+    """
+    Logic for handling file system events.
+
+    Created, modified and moved-in file paths are collected into a set, so a file touched many times is
+    organized once. Nothing fires while events keep arriving: pending files are checked once the folder has
+    been quiet for `debounce` seconds, or `max_latency` seconds after the first pending event at the latest.
+    A file is only handed to `callback` once its size and mtime are unchanged across two checks
+    `poll_interval` apart, so downloads and copies in progress are left alone until they finish. Files that
+    vanished meanwhile are dropped. `callback` receives every ready path of one check as a single set.
+    """
 
-    def __init__(self, callback, debounce=2.0):
+    def __init__(
+        self,
+        callback: Callable[[set[Path]], None],
+        debounce: float = WATCH_DEBOUNCE,
+        max_latency: float = WATCH_MAX_LATENCY,
+        poll_interval: float = WATCH_POLL_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         self.callback = callback
         self.debounce = debounce
-        self.last_triggered = 0.0
+        self.max_latency = max_latency
+        self.poll_interval = poll_interval
+        self.clock = clock
+        # Pending path -> (size, mtime_ns) seen at the last check, None if not checked yet
+        self._pending: dict[Path, Optional[tuple[int, int]]] = {}
+        self._first_event: Optional[float] = None
+        self._last_event = 0.0
+        self._last_poll: Optional[float] = None
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
 
     def dispatch(self, event):
         """Called by watchdog."""
         if not event.is_directory:
             if event.event_type in ("modified", "created"):
-                self._trigger()
+                self._collect(event.src_path)
+            elif event.event_type == "moved":
+                self._collect(event.dest_path)
+
+    def _collect(self, path):
+        now = self.clock()
+        with self._cond:
+            self._pending.setdefault(Path(path), None)
+            self._last_event = now
+            if self._first_event is None:
+                self._first_event = now
+            self._cond.notify()
+
+    def next_poll(self) -> Optional[float]:
+        """Clock time of the next check, or None if nothing is pending."""
+        with self._cond:
+            return self._next_poll()
+
+    def _next_poll(self) -> Optional[float]:
+        if not self._pending or self._first_event is None:
+            return None
+        due = min(self._last_event + self.debounce, self._first_event + self.max_latency)
+        if self._last_poll is not None:
+            due = max(due, self._last_poll + self.poll_interval)
+        return due
+
+    def poll(self) -> set[Path]:
+        """
+        Checks the pending files now, whether or not they are due, and passes the complete ones to `callback`.
+        Returns them.
+        """
+        ready: set[Path] = set()
+        with self._cond:
+            self._last_poll = self.clock()
+            for path, seen in list(self._pending.items()):
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    # Deleted or moved on; a move reports its new path separately
+                    del self._pending[path]
+                    continue
+                current = (st.st_size, st.st_mtime_ns)
+                if current == seen:
+                    del self._pending[path]
+                    ready.add(path)
+                else:
+                    self._pending[path] = current
+            if not self._pending:
+                self._first_event = None
+        if ready:
+            self.callback(ready)
+        return ready
+
+    def start(self):
+        """Runs the checks on a background thread until stop()."""
+        with self._cond:
+            self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="folder-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
 
-    def _trigger(self):
-        current_time = time.time()
-        if current_time - self.last_triggered > self.debounce:
-            self.last_triggered = current_time
-            self.callback()
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._stopped:
+                    return
+                due = self._next_poll()
+                delay = None if due is None else due - self.clock()
+                if delay is None or delay > 0:
+                    # New events and stop() wake us early; the due time is recomputed either way
+                    self._cond.wait(delay)
+                    continue
+            try:
+                self.poll()
+            except Exception as e:
+                logger.error(f"Folder watcher check failed: {e}")
 
 
 class FolderWatcher:
     def __init__(self, folder_path, callback):
+        """`callback` is called on a background thread with each batch of changed files that finished writing."""
         self.folder_path = Path(folder_path)
         self.callback = callback
         self.observer = None
         self.handler = None
+        self.logic: Optional[FolderWatcherHandler] = None
 
     def start(self, recursive=False):
         try:
@@ -42,7 +156,7 @@ class FolderWatcher:
                 return False
 
             # Use composition: Create a real FileSystemEventHandler that delegates to our logic
-            our_logic = FolderWatcherHandler(self.callback)
+            our_logic = self.logic = FolderWatcherHandler(self.callback)
 
             class BridgeHandler(FileSystemEventHandler):
                 def on_any_event(self, event):
@@ -52,6 +166,7 @@ class FolderWatcher:
             self.observer = Observer()
             self.observer.schedule(self.handler, str(self.folder_path), recursive=recursive)
             self.observer.start()
+            our_logic.start()
             logger.info(f"Started watching folder: {self.folder_path} (recursive={recursive})")
             return True
         except ImportError:
@@ -63,3 +178,6 @@ class FolderWatcher:
             self.observer.stop()
             self.observer.join()
             logger.info(f"Stopped watching folder: {self.folder_path}")
+        if self.logic:
+            # Files still being written when the watch ends are left where they are
+            self.logic.stop()
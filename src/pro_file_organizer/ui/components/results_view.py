@@ -0,0 +1,288 @@
+import os
+from array import array
+from typing import Any, Iterable, Optional, Sequence
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, QRect, QSize, Qt
+from PySide6.QtGui import QColor, QFont, QPainter
+from PySide6.QtWidgets import QStyledItemDelegate
+
+from ..themes.themes import COLORS, FONTS, RADII
+
+# Row kinds, stored one byte per row
+KIND_MOVE, KIND_ERROR, KIND_DUPLICATE = 0, 1, 2
+_KINDS = {"error": KIND_ERROR, "duplicate": KIND_DUPLICATE}
+_KIND_NAMES = {KIND_MOVE: "move", KIND_ERROR: "error", KIND_DUPLICATE: "duplicate"}
+
+AI_ACCENT = "#9C27B0"
+
+
+def event_style(etype: str, method: str, confidence: float) -> tuple[str, str]:
+    """(accent color, badge text) for a result event."""
+    if etype == "error":
+        return COLORS["danger"], "ERR"
+    if etype == "duplicate":
+        return COLORS["warning"], "DUP"
+    if method != "extension" and method != "ml-not-loaded":
+        return AI_ACCENT, f"AI {int(confidence * 100)}%"
+    return COLORS["accent"], "EXT"
+
+
+class ResultStore:
+    """
+    Result events kept column by column instead of one dict (or widget) per file: the name, one byte each for
+    the kind and the AI flag, a float32 confidence, and interned ids for the category and the detail line
+    (destination folder, error message or duplicate name). A destination name is only stored when the move
+    renamed the file, so a row costs little more than its name.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.names: list[str] = []
+        self.kinds = bytearray()
+        self.ai = bytearray()
+        self.confidences = array("f")
+        self.categories = array("I")
+        self.details = array("I")
+        self.renamed: dict[int, str] = {}
+        self.strings: list[str] = []
+        self._string_ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self, value: str) -> int:
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+    def _columns(self, row: int, event: dict) -> tuple[str, int, bool, float, int, int]:
+        name = event.get("file", "Unknown")
+        kind = _KINDS.get(event.get("type", "move"), KIND_MOVE)
+        method = event.get("method", "extension")
+
+        self.renamed.pop(row, None)
+        if kind == KIND_ERROR:
+            detail = f"Error: {event.get('error')}"
+        elif kind == KIND_DUPLICATE:
+            detail = f"Duplicate of: {os.path.basename(str(event.get('duplicate_of', 'another file')))}"
+        else:
+            destination = str(event.get("destination", ""))
+            detail = os.path.basename(os.path.dirname(destination))
+            dest_name = os.path.basename(destination)
+            if destination and dest_name != name:
+                self.renamed[row] = dest_name
+
+        return (
+            name,
+            kind,
+            method != "extension" and method != "ml-not-loaded",
+            float(event.get("confidence", 1.0)),
+            self.intern(event.get("category", "")),
+            self.intern(detail),
+        )
+
+    def append(self, event: dict) -> int:
+        row = len(self.names)
+        name, kind, ai, confidence, category, detail = self._columns(row, event)
+        self.names.append(name)
+        self.kinds.append(kind)
+        self.ai.append(ai)
+        self.confidences.append(confidence)
+        self.categories.append(category)
+        self.details.append(detail)
+        return row
+
+    def update(self, row: int, event: dict):
+        """Replaces one row in place."""
+        (
+            self.names[row],
+            self.kinds[row],
+            self.ai[row],
+            self.confidences[row],
+            self.categories[row],
+            self.details[row],
+        ) = self._columns(row, event)
+
+    def category(self, row: int) -> str:
+        return self.strings[self.categories[row]]
+
+    def detail(self, row: int) -> str:
+        if self.kinds[row] != KIND_MOVE:
+            return self.strings[self.details[row]]
+        return f"→ {self.strings[self.details[row]]}/{self.renamed.get(row, self.names[row])}"
+
+    def style(self, row: int) -> tuple[str, str]:
+        method = "ml" if self.ai[row] else "extension"
+        return event_style(_KIND_NAMES[self.kinds[row]], method, self.confidences[row])
+
+    def event(self, row: int) -> dict:
+        """The stored fields of one row as an event dict."""
+        return {
+            "type": _KIND_NAMES[self.kinds[row]],
+            "file": self.names[row],
+            "category": self.category(row),
+            "confidence": self.confidences[row],
+            "ai": bool(self.ai[row]),
+            "detail": self.detail(row),
+        }
+
+
+class ResultsModel(QAbstractListModel):
+    """
+    List model over a ResultStore. The view shows `order` (row indices into the store), so sorting and
+    filtering swap one index array instead of touching rows. Rows appended while an order is set are
+    added at the end.
+    """
+
+    DetailRole = Qt.ItemDataRole.UserRole + 1
+    BadgeRole = Qt.ItemDataRole.UserRole + 2
+    AccentRole = Qt.ItemDataRole.UserRole + 3
+    ExecutedRole = Qt.ItemDataRole.UserRole + 4
+
+    def __init__(self, parent: Any = None):
+        super().__init__(parent)
+        self.store = ResultStore()
+        self.executed = False
+        self._order: Optional[array] = None
+
+    def rowCount(self, parent: Any = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._order) if self._order is not None else len(self.store)
+
+    def store_row(self, row: int) -> int:
+        return self._order[row] if self._order is not None else row
+
+    def data(self, index: Any, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        row = self.store_row(index.row())
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.store.names[row]
+        if role in (self.DetailRole, Qt.ItemDataRole.ToolTipRole):
+            return self.store.detail(row)
+        if role == self.BadgeRole:
+            return self.store.style(row)[1]
+        if role == self.AccentRole:
+            return self.store.style(row)[0]
+        if role == self.ExecutedRole:
+            return self.executed
+        return None
+
+    def append_events(self, events: Iterable[dict]):
+        """Adds rows with a single insert notification, however many there are."""
+        events = list(events)
+        if not events:
+            return
+        first = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first, first + len(events) - 1)
+        rows = [self.store.append(event) for event in events]
+        if self._order is not None:
+            self._order.extend(rows)
+        self.endInsertRows()
+
+    def update_events(self, events: dict[int, dict]):
+        """Replaces rows in place, keyed by store row, and repaints."""
+        if not events:
+            return
+        for row, event in events.items():
+            self.store.update(row, event)
+        self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1))
+
+    def set_order(self, order: Optional[Sequence[int]]):
+        """Shows only these store rows, in this order; None shows every row in insertion order."""
+        self.beginResetModel()
+        self._order = array("I", order) if order is not None else None
+        self.endResetModel()
+
+    def clear(self):
+        self.beginResetModel()
+        self.store.clear()
+        self._order = None
+        self.executed = False
+        self.endResetModel()
+
+    def set_executed(self, executed: bool = True):
+        """Rows are dimmed until the run that produced them has finished."""
+        self.executed = executed
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0), self.index(self.rowCount() - 1), [self.ExecutedRole])
+
+
+class ResultDelegate(QStyledItemDelegate):
+    """Paints a result row: accent stripe, file name, detail line and badge."""
+
+    ROW_HEIGHT = 54
+    BADGE_SIZE = QSize(65, 22)
+
+    def __init__(self, parent: Any = None):
+        super().__init__(parent)
+        self.name_font = self._font("label")
+        self.detail_font = self._font("small")
+
+    @staticmethod
+    def _font(key: str) -> QFont:
+        name, size, *weight = FONTS[key]
+        font = QFont(str(name))
+        font.setPixelSize(int(size))
+        font.setBold(bool(weight))
+        return font
+
+    def sizeHint(self, option: Any, index: Any) -> QSize:
+        return QSize(option.rect.width(), self.ROW_HEIGHT)
+
+    def paint(self, painter: QPainter, option: Any, index: Any):
+        accent = QColor(index.data(ResultsModel.AccentRole))
+        executed = index.data(ResultsModel.ExecutedRole)
+        card = option.rect.adjusted(10, 2, -10, -3)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor(COLORS["bg_card"]))
+        painter.drawRoundedRect(card, RADII["card"], RADII["card"])
+        painter.setBrush(accent)
+        painter.drawRect(QRect(card.left(), card.top(), 4, card.height()))
+
+        badge = QRect(
+            card.right() - 10 - self.BADGE_SIZE.width(),
+            card.center().y() - self.BADGE_SIZE.height() // 2,
+            self.BADGE_SIZE.width(),
+            self.BADGE_SIZE.height(),
+        )
+        text_left = card.left() + 14
+        text_width = badge.left() - 10 - text_left
+        half = card.height() // 2
+
+        painter.setFont(self.name_font)
+        painter.setPen(QColor(COLORS["text_main"] if executed else COLORS["text_dimmed"]))
+        name = painter.fontMetrics().elidedText(
+            index.data(Qt.ItemDataRole.DisplayRole), Qt.TextElideMode.ElideMiddle, text_width
+        )
+        painter.drawText(
+            QRect(text_left, card.top() + 5, text_width, half - 5),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            name,
+        )
+
+        painter.setFont(self.detail_font)
+        painter.setPen(QColor(COLORS["text_dimmed"]))
+        detail = painter.fontMetrics().elidedText(
+            index.data(ResultsModel.DetailRole), Qt.TextElideMode.ElideMiddle, text_width
+        )
+        painter.drawText(
+            QRect(text_left, card.top() + half, text_width, half - 5),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            detail,
+        )
+
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(accent)
+        painter.drawRoundedRect(badge, RADII["badge"], RADII["badge"])
+        painter.setPen(QColor("white"))
+        painter.drawText(badge, Qt.AlignmentFlag.AlignCenter, index.data(ResultsModel.BadgeRole))
+        painter.restore()
@@ -2,7 +2,6 @@ import os
 import shutil
 import sys
 import threading
-from pathlib import Path
 from typing import Callable, Optional
 
 from PySide6.QtCore import QObject, Qt, Signal
@@ -18,113 +17,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from ..themes.themes import COLORS, RADII, get_font_style
-
-
-class FileCard(QFrame):
-    """
-    A card representing a file operation (move, rename, error).
-    """
-
-    def __init__(self, event_data: dict, parent: Optional[QWidget] = None):
-        super().__init__(parent)
-        self.setObjectName("card")
-        self.event_data = event_data
-
-        # Initial state (dimmed)
-        self.executed = False
-
-        # Layout
-        self.main_layout = QHBoxLayout(self)
-        self.main_layout.setContentsMargins(0, 0, 10, 0)
-        self.main_layout.setSpacing(10)
-
-        # Left Accent Stripe & Badge Logic
-        method = event_data.get("method", "extension")
-        confidence = event_data.get("confidence", 1.0)
-        etype = event_data.get("type", "move")
-
-        accent_color = COLORS["accent"]
-        badge_text = "EXT"
-
-        if method != "extension" and method != "ml-not-loaded":
-            accent_color = "#9C27B0"  # AI Purple
-            badge_text = f"AI {int(confidence * 100)}%"
-
-        if etype == "error":
-            accent_color = COLORS["danger"]
-            badge_text = "ERR"
-        elif etype == "duplicate":
-            accent_color = COLORS["warning"]
-            badge_text = "DUP"
-
-        # Accent Stripe
-        self.stripe = QFrame(self)
-        self.stripe.setFixedWidth(4)
-        self.stripe.setStyleSheet(f"background-color: {accent_color}; border-radius: 0px;")
-        self.main_layout.addWidget(self.stripe)
-
-        # Content Layout
-        self.content_layout = QVBoxLayout()
-        self.content_layout.setContentsMargins(0, 5, 0, 5)
-        self.content_layout.setSpacing(2)
-        self.main_layout.addLayout(self.content_layout, 1)
-
-        # Filename
-        filename = event_data.get("file", "Unknown")
-        self.lbl_name = QLabel(filename)
-        self.lbl_name.setStyleSheet(get_font_style("label"))
-        self.content_layout.addWidget(self.lbl_name)
-
-        # Destination / Error Message
-        dest = event_data.get("destination", "")
-        try:
-            dest_path = Path(dest)
-            display_dest = f"→ {dest_path.parent.name}/{dest_path.name}"
-        except Exception:
-            display_dest = f"→ {dest}"
-
-        if etype == "error":
-            display_dest = f"Error: {event_data.get('error')}"
-
-        if etype == "duplicate":
-            dup_of = event_data.get("duplicate_of", "another file")
-            try:
-                display_dest = f"Duplicate of: {Path(dup_of).name}"
-            except Exception:
-                display_dest = f"Duplicate of: {dup_of}"
-
-        self.lbl_dest = QLabel(display_dest)
-        self.lbl_dest.setObjectName("dimmed")
-        self.lbl_dest.setStyleSheet(get_font_style("small"))
-        self.content_layout.addWidget(self.lbl_dest)
-
-        # Badge
-        self.lbl_badge = QLabel(badge_text)
-        self.lbl_badge.setFixedSize(65, 22)
-        self.lbl_badge.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.lbl_badge.setStyleSheet(f"""
-            background-color: {accent_color};
-            color: white;
-            border-radius: {RADII["badge"]}px;
-            {get_font_style("small")}
-        """)
-        self.main_layout.addWidget(self.lbl_badge)
-
-        self._apply_appearance()
-
-    def set_executed(self):
-        """Transition card to fully opaque executed state."""
-        self.executed = True
-        self._apply_appearance()
-
-    def _apply_appearance(self):
-        if not self.executed:
-            self.lbl_name.setObjectName("dimmed")
-        else:
-            self.lbl_name.setObjectName("")
-        self.lbl_name.style().unpolish(self.lbl_name)
-        self.lbl_name.style().polish(self.lbl_name)
+from ..themes.themes import COLORS, get_font_style
 
 
 class DownloadSignals(QObject):
@@ -0,0 +1,159 @@
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+from ..core.logger import logger
+
+# ~30 Hz: fast enough that progress looks live, slow enough that each tick carries a batch
+UI_DRAIN_INTERVAL_MS = 33
+
+_LOG, _EVENT, _CALL = 0, 1, 2
+
+
+class UIEventBridge:
+    """
+    Carries progress, log lines and result events from the organize worker to the GUI thread in batches.
+
+    The worker appends to a deque (append/popleft are atomic, so no lock is taken) and overwrites a single
+    latest-progress slot. While a run is active, the view's timer drains the queue every `interval_ms`: logs
+    and result rows arrive in bulk and only the newest progress value is applied. `finish()` queues the
+    completion callback behind everything else and stops the timer once it has run. Outside a run, calls are
+    forwarded one by one through `view.after_main`.
+    """
+
+    def __init__(self, view: Any, interval_ms: int = UI_DRAIN_INTERVAL_MS):
+        self.view = view
+        self.interval_ms = interval_ms
+        self.active = False
+        self._queue: deque = deque()
+        self._progress: Optional[tuple] = None
+        self._applied_progress: Optional[tuple] = None
+        self._timer: Any = None
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.started = 0.0
+        self.finished = 0.0
+        self.counts = {"progress": 0, "log": 0, "event": 0}
+        self.ticks = 0
+        self.busy_ticks = 0
+        self.dropped_frames = 0
+        self.max_batch = 0
+        self.max_drain_ms = 0.0
+        self._last_tick = 0.0
+
+    # --- Worker side ---
+
+    def progress(self, current: int, total: Any, filename: str):
+        self.counts["progress"] += 1
+        if not self.active:
+            self.view.after_main(0, lambda: self.view.update_progress(current, total, filename))
+            return
+        self._progress = (current, total, filename)
+
+    def log(self, message: str):
+        self.counts["log"] += 1
+        if not self.active:
+            self.view.after_main(0, lambda: self.view.append_log(message))
+            return
+        self._queue.append((_LOG, message))
+
+    def event(self, data: dict):
+        self.counts["event"] += 1
+        if not self.active:
+            self.view.after_main(0, lambda: self.view.add_result_card(data))
+            return
+        self._queue.append((_EVENT, data))
+
+    def finish(self, callback: Callable[[], None]):
+        """Runs `callback` on the GUI thread after everything queued before it, then stops draining."""
+        if not self.active:
+            self.view.after_main(0, callback)
+            return
+        self._queue.append((_CALL, callback))
+        self.view.after_main(0, self._finish)
+
+    # --- GUI side ---
+
+    def start(self):
+        self._queue.clear()
+        self._progress = self._applied_progress = None
+        self._reset_stats()
+        self.started = self._last_tick = time.perf_counter()
+        self.active = True
+        self._timer = self.view.start_timer(self.interval_ms, self._tick)
+
+    def _tick(self):
+        now = time.perf_counter()
+        late = (now - self._last_tick) * 1000 / self.interval_ms
+        # A tick that arrives two or more intervals late means the GUI thread missed frames
+        if late >= 2:
+            self.dropped_frames += int(late) - 1
+        self._last_tick = now
+        self.ticks += 1
+        self.drain()
+
+    def _finish(self):
+        self.drain()
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        self.active = False
+        self.finished = time.perf_counter()
+        logger.debug(f"UI event bridge: {self.stats()}")
+
+    def drain(self):
+        """Applies everything queued so far: the newest progress, then logs and rows in bulk, in order."""
+        start = time.perf_counter()
+        progress = self._progress
+        if progress is not None and progress is not self._applied_progress:
+            self._applied_progress = progress
+            self.view.update_progress(*progress)
+
+        batch = 0
+        logs: list = []
+        events: list = []
+        # Only what is queued now; the worker keeps appending behind us
+        for _ in range(len(self._queue)):
+            kind, item = self._queue.popleft()
+            batch += 1
+            if kind == _LOG:
+                if events:
+                    self.view.add_result_cards(events)
+                    events = []
+                logs.append(item)
+            elif kind == _EVENT:
+                if logs:
+                    self.view.append_logs(logs)
+                    logs = []
+                events.append(item)
+            else:
+                self._flush(logs, events)
+                logs, events = [], []
+                item()
+        self._flush(logs, events)
+
+        if batch:
+            self.busy_ticks += 1
+            self.max_batch = max(self.max_batch, batch)
+        self.max_drain_ms = max(self.max_drain_ms, (time.perf_counter() - start) * 1000)
+
+    def _flush(self, logs: list, events: list):
+        if logs:
+            self.view.append_logs(logs)
+        if events:
+            self.view.add_result_cards(events)
+
+    def stats(self) -> dict:
+        """Counters for tuning the drain interval: event rates, ticks, dropped frames and batch sizes."""
+        elapsed = ((self.finished if not self.active else time.perf_counter()) - self.started) if self.started else 0.0
+        total = sum(self.counts.values())
+        return {
+            **self.counts,
+            "events_per_second": round(total / elapsed, 1) if elapsed > 0 else 0.0,
+            "ticks": self.ticks,
+            "busy_ticks": self.busy_ticks,
+            "dropped_frames": self.dropped_frames,
+            "max_batch": self.max_batch,
+            "max_drain_ms": round(self.max_drain_ms, 2),
+        }
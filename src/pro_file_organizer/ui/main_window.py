@@ -1,6 +1,7 @@
+import importlib
 import os
 import sys
-from typing import List, Optional
+from typing import Any, Optional
 
 from PySide6.QtCore import Property, QEasingCurve, QPropertyAnimation, QSize, Qt, QTimer, Signal
 from PySide6.QtGui import QBrush, QColor, QDragEnterEvent, QDropEvent, QPainter, QPalette, QPen
@@ -13,12 +14,12 @@ from PySide6.QtWidgets import (
     QFrame,
     QHBoxLayout,
     QLabel,
+    QListView,
     QMainWindow,
     QMessageBox,
     QPlainTextEdit,
     QProgressBar,
     QPushButton,
-    QScrollArea,
     QSizePolicy,
     QSlider,
     QTabWidget,
@@ -26,14 +27,32 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from ..core.ml_organizer import MultimodalFileOrganizer
 from ..core.organizer import FileOrganizer
-from .components.ui_components import FileCard, ModelDownloadModal
-from .dialogs.batch_dialog import BatchDialog
-from .dialogs.settings_dialog import SettingsDialog
+from .components.results_view import ResultDelegate, ResultsModel
 from .main_window_controller import MainWindowController
 from .themes.themes import COLORS, RADII, apply_theme, build_stylesheet, get_font_style
 
+# Imported on first use rather than at startup; see __getattr__ and _lazy()
+_LAZY_IMPORTS = {
+    "MultimodalFileOrganizer": "..core.ml_organizer",
+    "BatchDialog": ".dialogs.batch_dialog",
+    "SettingsDialog": ".dialogs.settings_dialog",
+    "ModelDownloadModal": ".components.ui_components",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __package__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _lazy(name: str) -> Any:
+    """Looks a deferred name up through the module, so it is imported once and can be patched in tests."""
+    return getattr(sys.modules[__name__], name)
+
 
 class ToggleSwitch(QAbstractButton):
     def __init__(self, parent=None, track_radius=10, thumb_radius=8):
@@ -170,11 +189,9 @@ class OrganizerApp(QMainWindow):
         self.setWindowTitle("Pro File Organizer")
         self.resize(1100, 750)
 
-        # Track results for state updates
-        self.result_cards: List[FileCard] = []
-
-        self.organizer = FileOrganizer()
-        self.ml_organizer = MultimodalFileOrganizer()
+        # The undo index is loaded by the controller's startup thread, after the window is up
+        self.organizer = FileOrganizer(defer_state=True)
+        self._ml_organizer = None
 
         # Apply theme before UI setup
         theme_mode = self.organizer.get_theme_mode() or "Dark"
@@ -182,7 +199,9 @@ class OrganizerApp(QMainWindow):
 
         self._setup_ui()
 
-        self.controller = MainWindowController(self, self.organizer, self.ml_organizer)
+        self.controller = MainWindowController(
+            self, self.organizer, ml_organizer_factory=lambda: self.ml_organizer, load_in_background=True
+        )
 
         # Load initial state into UI
         self.update_recent_menu(self.controller.recent_folders)
@@ -191,6 +210,13 @@ class OrganizerApp(QMainWindow):
         if theme_mode and hasattr(self, "appearance_mode_menu"):
             self.appearance_mode_menu.setCurrentText(theme_mode)
 
+    @property
+    def ml_organizer(self):
+        """Created on first use, so the ML module is not imported before the window is shown."""
+        if self._ml_organizer is None:
+            self._ml_organizer = _lazy("MultimodalFileOrganizer")()
+        return self._ml_organizer
+
     def _apply_theme(self, mode: str):
         if mode == "System":
             is_dark = QApplication.palette().color(QPalette.ColorRole.Window).lightness() < 128
@@ -431,21 +457,16 @@ class OrganizerApp(QMainWindow):
         self.results_tabs.setObjectName("results_tabs")
         main_area_layout.addWidget(self.results_tabs, 1)
 
-        # Tab 1: Results (Cards)
-        self.results_scroll = QScrollArea()
-        self.results_scroll.setWidgetResizable(True)
-        self.results_scroll.setObjectName("card")
-
-        self.results_container = QWidget()
-        self.results_container.setObjectName("results_content")
-        self.results_container.setAttribute(Qt.WidgetAttribute.WA_StyledBackground)
-        self.results_layout = QVBoxLayout(self.results_container)
-        self.results_layout.setContentsMargins(10, 10, 10, 10)
-        self.results_layout.setSpacing(5)
-        self.results_layout.addStretch()
-
-        self.results_scroll.setWidget(self.results_container)
-        self.results_tabs.addTab(self.results_scroll, "Results")
+        # Tab 1: Results. Rows are painted by the delegate, so only the visible ones cost anything
+        self.results_model = ResultsModel(self)
+        self.results_view = QListView()
+        self.results_view.setObjectName("results_content")
+        self.results_view.setModel(self.results_model)
+        self.results_view.setItemDelegate(ResultDelegate(self.results_view))
+        self.results_view.setUniformItemSizes(True)
+        self.results_view.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.results_view.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.results_tabs.addTab(self.results_view, "Results")
 
         # Tab 2: Raw Log
         self.log_view = QPlainTextEdit()
@@ -478,16 +499,8 @@ class OrganizerApp(QMainWindow):
         self.btn_run.setEnabled(True)
 
     def clear_cards(self):
-        """Clears only the result cards without resetting other UI state."""
-        # Safely clear widgets from the layout without risking infinite loops
-        count = self.results_layout.count()
-        for _ in range(count - 1):  # keep the last stretch
-            item = self.results_layout.takeAt(0)
-            if item:
-                w = item.widget()
-                if w:
-                    w.deleteLater()
-        self.result_cards.clear()
+        """Clears only the result rows without resetting other UI state."""
+        self.results_model.clear()
 
     def clear_results(self):
         """Perform a full reset of the results area including toggles and sorts."""
@@ -526,15 +539,15 @@ class OrganizerApp(QMainWindow):
             self.lbl_stats_last.setText(f"Last Run: {last}")
 
     def show_model_download(self, callback):
-        modal = ModelDownloadModal(self, on_complete=callback)
+        modal = _lazy("ModelDownloadModal")(self, on_complete=callback)
         modal.exec()
 
     def show_settings(self, organizer):
-        dialog = SettingsDialog(self, organizer)
+        dialog = _lazy("SettingsDialog")(self, organizer)
         dialog.exec()
 
     def show_batch(self, organizer):
-        dialog = BatchDialog(self, organizer)
+        dialog = _lazy("BatchDialog")(self, organizer)
         dialog.exec()
 
     def show_status(self, message):
@@ -552,6 +565,14 @@ class OrganizerApp(QMainWindow):
     def after_main(self, ms, func):
         QTimer.singleShot(ms, self, func)
 
+    def start_timer(self, ms, func):
+        """Calls `func` on the GUI thread every `ms` milliseconds until the returned timer is stopped."""
+        timer = QTimer(self)
+        timer.setInterval(ms)
+        timer.timeout.connect(func)
+        timer.start()
+        return timer
+
     def enable_ai_ui(self):
         self.ai_conf_container.show()
         self.lbl_ai.setStyleSheet(f"{get_font_style('label')} color: #9C27B0;")
@@ -579,8 +600,7 @@ class OrganizerApp(QMainWindow):
             self.btn_stop.hide()
             self.btn_run.show()
             self.btn_preview.show()
-            for card in self.result_cards:
-                card.set_executed()
+            self.results_model.set_executed()
 
     def get_ai_confidence(self):
         return self.slider_conf.value() / 10.0
@@ -598,18 +618,30 @@ class OrganizerApp(QMainWindow):
         return self.chk_duplicates.isChecked()
 
     def add_result_card(self, data):
-        card = FileCard(data)
-        self.results_layout.insertWidget(self.results_layout.count() - 1, card)
-        self.result_cards.append(card)
+        self.results_model.append_events([data])
+
+    def add_result_cards(self, entries):
+        self.results_model.append_events(entries)
+
+    def update_result_rows(self, entries):
+        """Replaces rows in place; `entries` maps row (in insertion order) to its new event."""
+        self.results_model.update_events(entries)
+
+    def set_result_order(self, order):
+        """Shows only these rows, in this order; None restores insertion order."""
+        self.results_model.set_order(order)
 
     def update_results_header(self, message):
         self.results_header.setText(message)
 
     def append_log(self, message):
+        self.append_logs([message])
+
+    def append_logs(self, messages):
         from datetime import datetime
 
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_view.appendPlainText(f"[{timestamp}] {message}")
+        self.log_view.appendPlainText("\n".join(f"[{timestamp}] {message}" for message in messages))
         # Always scroll to bottom
         self.log_view.verticalScrollBar().setValue(self.log_view.verticalScrollBar().maximum())
 
@@ -734,10 +766,9 @@ class OrganizerApp(QMainWindow):
 
 
 def main():
-    app = QApplication(sys.argv)
-    window = OrganizerApp()
-    window.show()
-    sys.exit(app.exec())
+    from .startup import main as startup_main
+
+    startup_main()
 
 
 if __name__ == "__main__":
@@ -3,10 +3,12 @@ import os
 import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any, Callable, Iterable, List, Optional
 
 from pro_file_organizer.core.organizer import OrganizationOptions
 from pro_file_organizer.core.watcher import FolderWatcher
+from pro_file_organizer.ui.event_bridge import UIEventBridge
+from pro_file_organizer.ui.preview_index import PreviewIndex
 
 
 class MainWindowController:
@@ -15,24 +17,74 @@ class MainWindowController:
     Decoupled from customtkinter widgets for testability.
     """
 
-    def __init__(self, view: Any, organizer: Any, ml_organizer: Any):
+    def __init__(
+        self,
+        view: Any,
+        organizer: Any,
+        ml_organizer: Any = None,
+        ml_organizer_factory: Optional[Callable[[], Any]] = None,
+        load_in_background: bool = False,
+    ):
+        """
+        `ml_organizer_factory` creates the ML organizer the first time it is needed, so the ML stack is not
+        imported at startup. With `load_in_background`, stats, recent folders and the organizer's undo index
+        are read on a worker thread and pushed to the view once loaded.
+        """
         self.view = view
         self.organizer = organizer
-        self.ml_organizer = ml_organizer
+        self._ml_organizer = ml_organizer
+        self._ml_organizer_factory = ml_organizer_factory
 
         self.selected_path: Optional[Path] = None
         self.is_running = False
         self.ai_enabled = False
         self.watcher: Optional[FolderWatcher] = None
+        # (source folder, target folders) of the last preview, created up front when that folder is organized
+        self._planned_dirs: Optional[tuple[Path, list[Path]]] = None
+        # Paths reported by the watcher that have not been organized yet
+        self._pending_watch_paths: set[Path] = set()
         self.recent_folders: List[str] = []
         self.stats = {"total_files": 0, "last_run": "Never"}
-        self._cached_preview: List[dict] = []
+        self._cached_preview = PreviewIndex()
         self._source_path_for_preview: Optional[Path] = None
         self._hidden_categories: set[str] = set()
         self._sort_key: str = "none"
+        # Whether the view currently shows the preview in a custom order (sorted or filtered)
+        self._preview_ordered = False
+        # Batches the organize worker's progress, log and result callbacks onto the GUI thread
+        self.ui_bridge = UIEventBridge(view)
 
-        self.load_stats()
-        self.load_recent()
+        if load_in_background:
+            threading.Thread(target=self._load_state_worker, daemon=True).start()
+        else:
+            self.load_stats()
+            self.load_recent()
+
+    @property
+    def ml_organizer(self) -> Any:
+        if self._ml_organizer is None and self._ml_organizer_factory is not None:
+            self._ml_organizer = self._ml_organizer_factory()
+        return self._ml_organizer
+
+    @ml_organizer.setter
+    def ml_organizer(self, value: Any):
+        self._ml_organizer = value
+
+    def _load_state_worker(self):
+        stats = self._read_stats()
+        recent = self._read_recent()
+        load_state = getattr(self.organizer, "load_state", None)
+        if load_state:
+            load_state()
+        self.view.after_main(0, lambda: self._on_state_loaded(stats, recent))
+
+    def _on_state_loaded(self, stats: Optional[dict], recent: List[str]):
+        """Runs on the UI thread. Keeps any folders the user opened while loading at the top."""
+        if stats is not None:
+            self.stats = stats
+        self.recent_folders = (self.recent_folders + [p for p in recent if p not in self.recent_folders])[:10]
+        self.view.update_recent_menu(self.recent_folders)
+        self.view.update_stats_display(self.stats)
 
     def set_folder(self, path_str):
         if not path_str:
@@ -56,13 +108,17 @@ class MainWindowController:
         self.view.update_recent_menu(self.recent_folders)
 
     def load_recent(self):
+        self.recent_folders = self._read_recent()
+
+    def _read_recent(self) -> List[str]:
         try:
             recent_file = Path("config/recent.json")
             if recent_file.exists():
                 with open(recent_file, "r") as f:
-                    self.recent_folders = json.load(f)
+                    return json.load(f)
         except Exception:
-            self.recent_folders = []
+            pass
+        return []
 
     def save_recent(self):
         try:
@@ -78,6 +134,8 @@ class MainWindowController:
             self.set_folder(folder)
 
     def undo_action(self):
+        # The undo index may still be loading on the startup thread
+        self.organizer.wait_for_state()
         if self.organizer.undo_stack:
             if self.view.confirm_action("Undo?", "Rollback last organization?"):
                 self.organizer.undo_changes(log_callback=lambda m: self.view.show_status(m))
@@ -93,14 +151,20 @@ class MainWindowController:
         self.view.show_batch(self.organizer)
 
     def load_stats(self):
+        stats = self._read_stats()
+        if stats is not None:
+            self.stats = stats
+        self.view.update_stats_display(self.stats)
+
+    def _read_stats(self) -> Optional[dict]:
         try:
             stats_file = Path("config/stats.json")
             if stats_file.exists():
                 with open(stats_file, "r") as f:
-                    self.stats = json.load(f)
+                    return json.load(f)
         except Exception:
             pass
-        self.view.update_stats_display(self.stats)
+        return None
 
     def save_stats(self):
         try:
@@ -160,7 +224,9 @@ class MainWindowController:
                 self.view.set_watch_switch_state(False)
                 return
 
-            self.watcher = FolderWatcher(self.selected_path, lambda: self.view.after_main(0, self._on_watch_trigger))
+            self.watcher = FolderWatcher(
+                self.selected_path, lambda paths: self.view.after_main(0, lambda: self._on_watch_trigger(paths))
+            )
             if self.watcher.start(recursive=self.view.get_recursive_val()):
                 self.view.show_status(f"Watching: {self.selected_path.name}")
             else:
@@ -175,13 +241,18 @@ class MainWindowController:
             if self.watcher:
                 self.watcher.stop()
                 self.watcher = None
+            self._pending_watch_paths.clear()
             self.view.show_status("Watcher disabled")
 
-    def _on_watch_trigger(self):
-        if not self.is_running:
-            self.run_organization(dry_run=False, from_watcher=True)
+    def _on_watch_trigger(self, paths: Iterable[Path] = ()):
+        """Organizes the paths the watcher reported; paths arriving during a run wait for the next one."""
+        self._pending_watch_paths.update(paths)
+        if not self.is_running and self._pending_watch_paths:
+            paths, self._pending_watch_paths = self._pending_watch_paths, set()
+            self.run_organization(dry_run=False, from_watcher=True, paths=paths)
 
-    def run_organization(self, dry_run=False, from_watcher=False):
+    def run_organization(self, dry_run=False, from_watcher=False, paths: Optional[set[Path]] = None):
+        """`paths` limits the run to those files (see FileOrganizer.organize_paths) instead of the whole folder."""
         if not self.selected_path:
             self.view.show_error("No Folder", "Please select a folder first.")
             return
@@ -206,28 +277,25 @@ class MainWindowController:
         if self.ai_enabled:
             self.organizer.ml_confidence = self.view.get_ai_confidence()
 
-        threading.Thread(target=self._organize_worker, args=(dry_run,), daemon=True).start()
+        self.ui_bridge.start()
+        threading.Thread(target=self._organize_worker, args=(dry_run, paths), daemon=True).start()
 
-    def _organize_worker(self, dry_run: bool):
+    def _organize_worker(self, dry_run: bool, paths: Optional[set[Path]] = None):
         if not self.selected_path:
             return
 
-        self._cached_preview = []
+        self._cached_preview = PreviewIndex(self.selected_path)
         self._source_path_for_preview = self.selected_path
         self._hidden_categories = set()
         self._sort_key = "none"
+        self._preview_ordered = False
 
+        bridge = self.ui_bridge
         try:
             def on_event(data):
                 if dry_run:
                     self._cached_preview.append(data)
-                self.view.after_main(0, lambda: self.view.add_result_card(data))
-
-            def on_progress(current, total, filename):
-                self.view.after_main(0, lambda: self.view.update_progress(current, total, filename))
-
-            def on_log(msg):
-                self.view.after_main(0, lambda: self.view.append_log(msg))
+                bridge.event(data)
 
             options = OrganizationOptions(
                 source_path=self.selected_path,
@@ -237,21 +305,29 @@ class MainWindowController:
                 detect_duplicates=self.view.get_detect_duplicates_val(),
                 dry_run=dry_run,
                 use_ml=self.ai_enabled,
-                progress_callback=on_progress,
-                log_callback=on_log,
+                progress_callback=bridge.progress,
+                log_callback=bridge.log,
                 event_callback=on_event,
                 check_stop=lambda: not self.is_running,
             )
-            stats = self.organizer.organize_files(options)
-            self.view.after_main(0, lambda: self._on_complete(stats, dry_run))
+            planned = self._planned_dirs
+            if not dry_run and paths is None and planned is not None and planned[0] == self.selected_path:
+                options.planned_dirs = planned[1]
+            if paths is not None:
+                stats = self.organizer.organize_paths(paths, options)
+            else:
+                stats = self.organizer.organize_files(options)
+            bridge.finish(lambda: self._on_complete(stats, dry_run))
         except Exception as e:
             err_msg = str(e)
             import traceback
             traceback.print_exc()
-            self.view.after_main(
-                0, lambda: self.view.show_error("Operation Failed", f"An unexpected error occurred: {err_msg}")
-            )
-            self.view.after_main(0, lambda: self._on_complete({"moved": 0, "errors": 1}, dry_run))
+
+            def on_failed():
+                self.view.show_error("Operation Failed", f"An unexpected error occurred: {err_msg}")
+                self._on_complete({"moved": 0, "errors": 1}, dry_run)
+
+            bridge.finish(on_failed)
 
     def _on_complete(self, stats, dry_run):
         self.is_running = False
@@ -268,6 +344,9 @@ class MainWindowController:
 
         self.view.show_status(msg)
         self.view.update_results_header(msg)
+        self._planned_dirs = None
+        if dry_run and stats.get("target_dirs") and self._source_path_for_preview:
+            self._planned_dirs = (self._source_path_for_preview, stats["target_dirs"])
 
         if not dry_run:
             if not isinstance(self.stats, dict):
@@ -277,6 +356,10 @@ class MainWindowController:
             self.save_stats()
             self.view.update_stats_display(self.stats)
 
+        if self.watcher and self._pending_watch_paths:
+            # Changes seen while this run was busy
+            self.view.after_main(0, self._on_watch_trigger)
+
     def on_confidence_changed(self, value):
         """Called when the AI confidence slider moves."""
         self.organizer.ml_confidence = value / 10.0
@@ -301,64 +384,23 @@ class MainWindowController:
             self._refresh_preview()
 
     def _refresh_preview(self):
-        """Update existing preview results based on new threshold."""
+        """Re-applies the threshold, category filter and sort to the preview without re-adding its rows."""
+        if self.is_running:
+            # Rows are still arriving; the view and the index are not in step yet
+            return
+        preview = self._cached_preview
         threshold = self.organizer.ml_confidence
-        self.view.clear_cards()
-        category_counts = {}
-
-        # 1. First pass: Copy entries, update categories and counts based on threshold
-        # We need this to get accurate counts and to set the `category` and `confidence` fields
-        # which will be used for sorting later.
-        updated_preview = []
-        for raw_entry in self._cached_preview:
-            entry = {**raw_entry}
-            ai_cat = entry.get("ai_category")
-            ai_conf = entry.get("ai_confidence", 0.0)
-            ext_cat = entry.get("ext_category", "Others")
-
-            if ai_cat and ai_conf >= threshold:
-                entry["category"] = ai_cat
-                entry["method"] = entry.get("ai_method", "ml")
-                entry["confidence"] = ai_conf
-            else:
-                entry["category"] = ext_cat
-                entry["method"] = "extension"
-                entry["confidence"] = 1.0
-
-            cat_name = entry["category"].split("/")[0]
-            category_counts[cat_name] = category_counts.get(cat_name, 0) + 1
-            updated_preview.append(entry)
-
-        # 2. Sort the entries
-        if self._sort_key == "name":
-            entries = sorted(updated_preview, key=lambda e: e.get("file", "").lower())
-        elif self._sort_key == "confidence":
-            entries = sorted(updated_preview, key=lambda e: e.get("confidence", 0.0), reverse=True)
-        elif self._sort_key == "type":
-            entries = sorted(updated_preview, key=lambda e: e.get("category", ""))
-        else:
-            entries = updated_preview
-
-        # 3. Second pass: Filter and Add to UI
-        for entry in entries:
-            cat_name = entry["category"].split("/")[0]
-
-            if cat_name in self._hidden_categories:
-                continue
 
-            # Rebuild destination path (needed for FileCard display)
-            if self._source_path_for_preview:
-                dest = self._source_path_for_preview / entry["category"]
-                if entry.get("relative_dir"):
-                    dest = dest / entry["relative_dir"]
-                dest = dest / entry["file"]
-                entry["destination"] = str(dest)
+        # Only rows whose category flips at the new threshold are sent to the view
+        changed = preview.set_threshold(threshold)
+        if changed:
+            self.view.update_result_rows({row: preview.entry(row) for row in changed})
 
-            self.view.add_result_card(entry)
+        order = preview.order(self._sort_key, self._hidden_categories)
+        if order is not None or self._preview_ordered:
+            self.view.set_result_order(order)
+        self._preview_ordered = order is not None
 
-        # Update UI headers and breakdown
-        ai_count = sum(1 for e in updated_preview
-                       if e.get("ai_category") and e.get("ai_confidence", 0.0) >= threshold)
-        msg = f"Done! Would move {len(self._cached_preview)} files ({ai_count} AI-categorized)."
+        msg = f"Done! Would move {len(preview)} files ({preview.ai_count} AI-categorized)."
         self.view.update_results_header(msg)
-        self.view.update_category_breakdown(category_counts, self._hidden_categories)
+        self.view.update_category_breakdown(preview.category_counts(), self._hidden_categories)
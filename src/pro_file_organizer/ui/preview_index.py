@@ -0,0 +1,173 @@
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Iterable, Optional
+
+DEFAULT_PREVIEW_CATEGORY = "Others"
+
+
+class PreviewIndex:
+    """
+    Dry-run results kept as columns so the confidence slider, category toggles and sort menu can re-filter a
+    large preview without rebuilding it.
+
+    Per row: the file name, interned ids for the extension category, AI category (-1 if none), AI method and
+    date subfolder, and the AI confidence. AI rows are presorted by descending confidence, so for a threshold
+    the rows sorted into their AI category are a prefix of that order, found by bisect. Moving the threshold
+    only flips the rows between the old and new cut; set_threshold() returns exactly those. Name order is
+    sorted once; confidence and category order are rebuilt in linear time from the current cut.
+    """
+
+    def __init__(self, source_path: Optional[Path] = None, entries: Iterable[dict] = ()):
+        self.source_path = source_path
+        self.names: list[str] = []
+        self.ext_categories = array("I")
+        self.ai_categories = array("i")
+        self.ai_confidences = array("d")
+        self.ai_methods = array("I")
+        self.relative_dirs = array("I")
+        self.types = array("I")
+        # Whether each row is currently sorted by its AI category, as last reported to the view
+        self.applied = bytearray()
+        self.strings: list[str] = []
+        self._string_ids: dict[str, int] = {}
+        self._tops: dict[int, str] = {}
+        self._indexed = 0
+        self._ai_by_confidence = array("I")
+        self._neg_confidences: list[float] = []
+        self._by_name = array("I")
+        self._cut: Optional[int] = None
+        self._counts: dict[str, int] = {}
+        for entry in entries:
+            self.append(entry)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _intern(self, value: str) -> int:
+        string_id = self._string_ids.get(value)
+        if string_id is None:
+            string_id = self._string_ids[value] = len(self.strings)
+            self.strings.append(value)
+        return string_id
+
+    def _top(self, category_id: int) -> str:
+        top = self._tops.get(category_id)
+        if top is None:
+            top = self._tops[category_id] = self.strings[category_id].split("/")[0]
+        return top
+
+    def append(self, entry: dict):
+        """Adds one result event. Called from the organize worker while the preview runs."""
+        ai_category = entry.get("ai_category")
+        self.names.append(entry.get("file", ""))
+        self.ext_categories.append(self._intern(entry.get("ext_category", DEFAULT_PREVIEW_CATEGORY)))
+        self.ai_categories.append(self._intern(ai_category) if ai_category else -1)
+        self.ai_confidences.append(float(entry.get("ai_confidence", 0.0)))
+        self.ai_methods.append(self._intern(entry.get("ai_method", "ml")))
+        self.relative_dirs.append(self._intern(entry.get("relative_dir") or ""))
+        self.types.append(self._intern(entry.get("type", "move")))
+        # What the worker already sent to the view
+        self.applied.append(bool(ai_category) and entry.get("method", "extension") != "extension")
+
+    def _effective(self, row: int) -> int:
+        return self.ai_categories[row] if self.applied[row] else self.ext_categories[row]
+
+    def _build(self):
+        """Sorts rows appended since the last call into the presorted orders."""
+        n = len(self.names)
+        if self._indexed == n:
+            return
+        ai_rows = [r for r in range(n) if self.ai_categories[r] >= 0]
+        ai_rows.sort(key=self.ai_confidences.__getitem__, reverse=True)
+        self._ai_by_confidence = array("I", ai_rows)
+        self._neg_confidences = [-self.ai_confidences[r] for r in ai_rows]
+        self._by_name = array("I", sorted(range(n), key=lambda r: self.names[r].lower()))
+        self._counts = {}
+        for r in range(n):
+            top = self._top(self._effective(r))
+            self._counts[top] = self._counts.get(top, 0) + 1
+        self._cut = None
+        self._indexed = n
+
+    def set_threshold(self, threshold: float) -> list[int]:
+        """Applies a confidence threshold and returns the rows whose category changed."""
+        self._build()
+        cut = bisect_right(self._neg_confidences, -threshold)
+        if self._cut is None:
+            # First pass: compare every AI row against what the worker sent
+            positions: Iterable[int] = range(len(self._ai_by_confidence))
+        else:
+            positions = range(min(cut, self._cut), max(cut, self._cut))
+        self._cut = cut
+
+        changed = []
+        for position in positions:
+            row = self._ai_by_confidence[position]
+            applied = position < cut
+            if self.applied[row] != applied:
+                before = self._top(self._effective(row))
+                self.applied[row] = applied
+                after = self._top(self._effective(row))
+                self._counts[before] -= 1
+                self._counts[after] = self._counts.get(after, 0) + 1
+                changed.append(row)
+        return changed
+
+    @property
+    def ai_count(self) -> int:
+        """Rows currently sorted by their AI category."""
+        return self._cut or 0
+
+    def category_counts(self) -> dict[str, int]:
+        """Rows per top-level category, under the current threshold."""
+        return {top: count for top, count in self._counts.items() if count}
+
+    def category(self, row: int) -> str:
+        return self.strings[self._effective(row)]
+
+    def entry(self, row: int) -> dict:
+        """The row as a result event under the current threshold."""
+        category = self.category(row)
+        relative_dir = self.strings[self.relative_dirs[row]]
+        entry = {
+            "type": self.strings[self.types[row]],
+            "file": self.names[row],
+            "category": category,
+            "method": self.strings[self.ai_methods[row]] if self.applied[row] else "extension",
+            "confidence": self.ai_confidences[row] if self.applied[row] else 1.0,
+            "relative_dir": relative_dir,
+        }
+        if self.source_path:
+            destination = self.source_path / category
+            if relative_dir:
+                destination = destination / relative_dir
+            entry["destination"] = str(destination / self.names[row])
+        return entry
+
+    def order(self, sort_key: str, hidden_categories: Iterable[str] = ()) -> Optional[list[int]]:
+        """Rows to show, in display order; None means every row in scan order."""
+        self._build()
+        hidden = set(hidden_categories)
+        if sort_key == "name":
+            rows: Iterable[int] = self._by_name
+        elif sort_key == "confidence":
+            # Highest first, ties in scan order: rows at 1.0 (extension or certain AI), then the applied AI rows
+            confidences = self.ai_confidences
+            certain = [r for r in range(len(self.names)) if not self.applied[r] or confidences[r] >= 1.0]
+            rows = certain + [r for r in self._ai_by_confidence if self.applied[r] and confidences[r] < 1.0]
+        elif sort_key == "type":
+            # Counting sort on the category's rank: linear and stable
+            category_ids = sorted({self._effective(r) for r in range(len(self.names))}, key=self.strings.__getitem__)
+            buckets: dict[int, list[int]] = {category_id: [] for category_id in category_ids}
+            for r in range(len(self.names)):
+                buckets[self._effective(r)].append(r)
+            rows = [r for category_id in category_ids for r in buckets[category_id]]
+        elif not hidden:
+            return None
+        else:
+            rows = range(len(self.names))
+
+        if hidden:
+            return [r for r in rows if self._top(self._effective(r)) not in hidden]
+        return list(rows)
@@ -0,0 +1,143 @@
+"""
+GUI entry point. Kept free of Qt and app imports at module level so `--profile-startup` can time them.
+"""
+
+import argparse
+import sys
+import time
+from importlib.abc import MetaPathFinder
+from typing import Any, Callable, List, Optional
+
+# Number of slowest imports listed by --profile-startup
+PROFILE_TOP_IMPORTS = 15
+
+
+class ImportTimer(MetaPathFinder):
+    """
+    Records how long each module takes to execute while installed on sys.meta_path, like `python -X importtime`.
+    Inclusive time counts the module's own imports; self time does not.
+    """
+
+    def __init__(self):
+        self.timings: List[tuple[str, float, float]] = []
+        self._stack: List[float] = []
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        if loader is not None and hasattr(loader, "exec_module"):
+            spec.loader = _TimedLoader(loader, self, fullname)
+        return spec
+
+    def _timed(self, name: str, run: Callable[[], Any]):
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            run()
+        finally:
+            inclusive = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += inclusive
+            self.timings.append((name, inclusive, inclusive - children))
+
+    def slowest(self, count: int = PROFILE_TOP_IMPORTS) -> List[tuple[str, float, float]]:
+        return sorted(self.timings, key=lambda t: t[1], reverse=True)[:count]
+
+
+class _TimedLoader:
+    def __init__(self, loader: Any, timer: ImportTimer, name: str):
+        self._loader = loader
+        self._timer = timer
+        self._name = name
+
+    def __getattr__(self, attr):
+        return getattr(self._loader, attr)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Loaders look themselves up on the spec (e.g. for get_resource_reader), so restore the real one
+        module.__spec__.loader = self._loader
+        module.__loader__ = self._loader
+        self._timer._timed(self._name, lambda: self._loader.exec_module(module))
+
+
+def format_startup_report(
+    timer: ImportTimer, import_seconds: float, window_seconds: float, first_paint_seconds: float
+) -> str:
+    lines = [
+        f"Startup: first paint after {first_paint_seconds * 1000:.0f} ms "
+        f"(imports {import_seconds * 1000:.0f} ms, window {window_seconds * 1000:.0f} ms)",
+        f"{'inclusive ms':>13}{'self ms':>10}  module",
+    ]
+    for name, inclusive, own in timer.slowest():
+        lines.append(f"{inclusive * 1000:>13.1f}{own * 1000:>10.1f}  {name}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="pro-file-organizer", description="Pro File Organizer")
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print time to first paint and the slowest imports to stderr",
+    )
+    args, qt_args = parser.parse_known_args(argv if argv is not None else sys.argv[1:])
+
+    start = time.perf_counter()
+    timer = ImportTimer()
+    if args.profile_startup:
+        timer.install()
+    try:
+        from PySide6.QtCore import QEvent, QObject
+        from PySide6.QtWidgets import QApplication
+
+        from .main_window import OrganizerApp
+    finally:
+        timer.uninstall()
+    imported = time.perf_counter()
+
+    app = QApplication([sys.argv[0], *qt_args])
+    window = OrganizerApp()
+    constructed = time.perf_counter()
+
+    if args.profile_startup:
+
+        class _FirstPaint(QObject):
+            def eventFilter(self, obj, event):
+                if event.type() == QEvent.Type.Paint:
+                    window.removeEventFilter(self)
+                    report = format_startup_report(
+                        timer, imported - start, constructed - imported, time.perf_counter() - start
+                    )
+                    print(report, file=sys.stderr, flush=True)
+                    from ..core.logger import logger
+
+                    logger.debug(report)
+                return False
+
+        first_paint = _FirstPaint(window)
+        window.installEventFilter(first_paint)
+
+    window.show()
+    sys.exit(app.exec())
+
+
+if __name__ == "__main__":
+    main()
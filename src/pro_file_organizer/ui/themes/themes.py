@@ -179,6 +179,12 @@ def build_stylesheet(colors: Dict[str, str]) -> str:
         background-color: {colors["bg_card"]};
     }}
 
+    QListView#results_content {{
+        border: none;
+        border-radius: {RADII["standard"]}px;
+        padding: 8px 0px;
+    }}
+
     QScrollBar:vertical {{
         border: none;
         background: {colors["bg_main"]};
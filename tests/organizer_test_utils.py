@@ -0,0 +1,28 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pro_file_organizer.core.organizer import FileOrganizer
+from pro_file_organizer.core.undo_journal import UndoJournal
+
+
+def make_test_organizer(test_case: unittest.TestCase) -> FileOrganizer:
+    """
+    A FileOrganizer whose undo journal, hash cache and embedding cache live in a temp folder removed after the
+    test. Startup recovery and legacy migration run against that folder, never the user's data directory.
+    """
+    state_dir = Path(tempfile.mkdtemp())
+    test_case.addCleanup(shutil.rmtree, state_dir, True)
+
+    organizer = FileOrganizer(defer_state=True)
+    organizer.undo_journal = UndoJournal(state_dir / "undo_journal", legacy_file=state_dir / "undo_stack.json")
+    organizer.hash_cache_file = state_dir / "hash_cache.sqlite3"
+    organizer.embedding_cache_dir = state_dir / "embeddings"
+    with patch("pro_file_organizer.core.organizer.init_app_dirs"):
+        organizer.load_state()
+
+    # Runs before the folder is removed
+    test_case.addCleanup(lambda: organizer._hash_cache is not None and organizer._hash_cache.close())
+    return organizer
@@ -0,0 +1,142 @@
+import hashlib
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import Future
+from pathlib import Path
+
+from pro_file_organizer.core.duplicates import PARTIAL_HASH_BLOCK, DuplicateIndex
+from pro_file_organizer.core.scanner import FileRecord
+
+
+class TestDuplicateIndex(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.full_calls: list[str] = []
+        self.partial_calls: list[str] = []
+        self.index = DuplicateIndex(self._full, self._partial)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _full(self, path, _record):
+        self.full_calls.append(path.name)
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+
+    def _partial(self, path, _record):
+        self.partial_calls.append(path.name)
+        data = path.read_bytes()
+        return hashlib.sha256(data[:PARTIAL_HASH_BLOCK] + data[-PARTIAL_HASH_BLOCK:]).hexdigest()
+
+    def record(self, name, content: bytes):
+        path = self.test_dir / name
+        path.write_bytes(content)
+        return FileRecord.from_path(path)
+
+    def test_unique_sizes_are_never_hashed(self):
+        self.index.add(self.record("a", b"1"))
+        self.index.add(self.record("b", b"22"))
+        self.assertIsNone(self.index.find_duplicate(self.record("c", b"333")))
+        self.assertEqual(self.partial_calls + self.full_calls, [])
+        self.assertEqual(len(self.index), 3)
+
+    def test_small_files_skip_full_hash(self):
+        self.index.add(self.record("a", b"same"))
+        self.assertEqual(self.index.find_duplicate(self.record("b", b"same")), self.test_dir / "a")
+        self.assertIsNone(self.index.find_duplicate(self.record("c", b"diff")))
+        self.assertEqual(self.full_calls, [])
+        # "a" is hashed once and reused
+        self.assertEqual(sorted(self.partial_calls), ["a", "b", "c"])
+
+    def test_large_files_confirmed_by_full_hash(self):
+        edge = b"x" * PARTIAL_HASH_BLOCK * 2
+        self.index.add(self.record("a", edge + b"A" + edge))
+        self.assertIsNone(self.index.find_duplicate(self.record("b", edge + b"B" + edge)))
+        self.assertEqual(self.index.find_duplicate(self.record("c", edge + b"A" + edge)), self.test_dir / "a")
+        self.assertEqual(self.index.full_hashes, 3)
+
+    def test_relocate_updates_reported_path(self):
+        original = self.record("a", b"same")
+        self.assertIsNone(self.index.find_duplicate(original))
+        moved = self.test_dir / "moved"
+        (self.test_dir / "a").rename(moved)
+        self.index.relocate(original, moved)
+        self.assertEqual(self.index.find_duplicate(self.record("b", b"same")), moved)
+
+    def test_relocate_drops_unfinished_hash(self):
+        original = self.record("a", b"same")
+        self.index.add(original)
+        entry = self.index._by_identity[(original.device, original.inode)]
+        running: Future = Future()
+        entry.partial = running
+        moved = self.test_dir / "moved"
+        (self.test_dir / "a").rename(moved)
+
+        self.index.relocate(original, moved)
+        # The hash started at the old path fails now that the file is gone
+        running.set_result("")
+        self.assertIsNone(entry.partial)
+        self.assertEqual(self.index.find_duplicate(self.record("b", b"same")), moved)
+
+    def test_unreadable_file_is_not_registered(self):
+        index = DuplicateIndex(
+            self._full, lambda path, _record: "" if path.name == "b" else self._partial(path, _record)
+        )
+        index.add(self.record("a", b"same"))
+        self.assertIsNone(index.find_duplicate(self.record("b", b"same")))
+        self.assertEqual(len(index), 1)
+
+    def test_failed_hash_is_retried(self):
+        failures = {"a"}
+
+        def flaky_partial(path, record):
+            if path.name in failures:
+                failures.discard(path.name)
+                return ""
+            return self._partial(path, record)
+
+        index = DuplicateIndex(self._full, flaky_partial)
+        index.add(self.record("a", b"same"))
+        # "a" can't be read this time, so nothing matches
+        self.assertIsNone(index.find_duplicate(self.record("b", b"same")))
+        self.assertEqual(index.find_duplicate(self.record("c", b"same")), self.test_dir / "a")
+
+    def test_prefetch_matches_serial_results(self):
+        edge = b"x" * PARTIAL_HASH_BLOCK * 2
+        contents = [edge + bytes([65 + i % 3]) + edge for i in range(12)] + [b"small%d" % (i % 2) for i in range(6)]
+        records = [self.record(f"f{i}", c) for i, c in enumerate(contents)]
+
+        serial = DuplicateIndex(self._full, self._partial)
+        expected = [serial.find_duplicate(r) for r in records]
+
+        pooled = DuplicateIndex(self._full, self._partial, workers=4)
+        try:
+            results = []
+            for i, r in enumerate(records):
+                for upcoming in records[i : i + 4]:
+                    pooled.prefetch(upcoming)
+                results.append(pooled.find_duplicate(r))
+        finally:
+            pooled.close()
+        self.assertEqual(results, expected)
+        self.assertEqual(sum(p is not None for p in results), 13)
+
+    def test_prefetch_skips_file_being_moved(self):
+        content = b"y" * PARTIAL_HASH_BLOCK * 3
+        original = self.record("a", content)
+        index = DuplicateIndex(self._full, self._partial, workers=2)
+        self.addCleanup(index.close)
+        index.add(original)
+        index.set_moving(original)
+        upcoming = self.record("b", content)
+        index.prefetch(upcoming)
+
+        moved = self.test_dir / "moved"
+        (self.test_dir / "a").rename(moved)
+        index.relocate(original, moved)
+        self.assertEqual(index.find_duplicate(upcoming), moved)
+        self.assertNotIn("a", self.partial_calls + self.full_calls)
+
+
+if __name__ == "__main__":
+    unittest.main()
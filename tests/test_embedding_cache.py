@@ -0,0 +1,99 @@
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from pro_file_organizer.core.embedding_cache import EmbeddingStore, model_key
+from pro_file_organizer.core.scanner import FileRecord
+
+
+def record(inode, size=100, mtime_ns=1):
+    return FileRecord(f"f{inode}", "/src", size, mtime_ns, inode, 1, 0o100000)
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestEmbeddingStore(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        # test_ml_organizer replaces numpy in sys.modules; the store imports it lazily
+        modules = patch.dict(sys.modules, {"numpy": np})
+        modules.start()
+        self.addCleanup(modules.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def store(self, max_bytes=1024 * 1024):
+        return EmbeddingStore(self.test_dir / "store", max_bytes)
+
+    def test_roundtrip_survives_reopen(self):
+        store = self.store()
+        vector = np.array([0.25, -0.5, 1.0, 0.0])
+        store.put(record(1), vector)
+        store.close()
+
+        store = self.store()
+        self.assertEqual(store.dim, 4)
+        np.testing.assert_allclose(store.get(record(1)), vector)
+        self.assertEqual(store.get(record(1)).dtype, np.float32)
+        self.assertIsNone(store.get(record(2)))
+        store.close()
+
+    def test_changed_file_misses(self):
+        store = self.store()
+        store.put(record(1), np.ones(4))
+        self.assertIsNone(store.get(record(1, mtime_ns=2)))
+        self.assertIsNone(store.get(record(1, size=101)))
+
+        # Re-embedding the changed file reuses its row
+        store.put(record(1, mtime_ns=2), np.zeros(4))
+        self.assertEqual(len(store), 1)
+        np.testing.assert_allclose(store.get(record(1, mtime_ns=2)), np.zeros(4))
+        store.close()
+
+    def test_evicts_least_recently_used(self):
+        # Room for three 4-dim float16 vectors
+        store = self.store(max_bytes=3 * 4 * 2)
+        for inode in (1, 2, 3):
+            store.put(record(inode), np.full(4, inode))
+        self.assertIsNotNone(store.get(record(1)))
+
+        store.put(record(4), np.full(4, 4))
+        self.assertEqual(len(store), 3)
+        self.assertIsNone(store.get(record(2)))
+        np.testing.assert_allclose(store.get(record(1)), np.full(4, 1))
+        np.testing.assert_allclose(store.get(record(4)), np.full(4, 4))
+        self.assertEqual((self.test_dir / "store" / "vectors.f16").stat().st_size, 3 * 4 * 2)
+        store.close()
+
+    def test_grows_vector_file(self):
+        store = self.store(max_bytes=10_000 * 8 * 2)
+        for inode in range(1500):
+            store.put(record(inode), np.full(8, inode % 100))
+        np.testing.assert_allclose(store.get(record(1234)), np.full(8, 34))
+        self.assertEqual(len(store), 1500)
+        store.close()
+
+    def test_new_dimension_resets(self):
+        store = self.store()
+        store.put(record(1), np.ones(4))
+        store.put(record(2), np.ones(6))
+        self.assertEqual(store.dim, 6)
+        self.assertIsNone(store.get(record(1)))
+        self.assertEqual(len(store), 1)
+        store.close()
+
+    def test_model_key(self):
+        self.assertEqual(model_key("google/siglip2", "abc123", "image"), "google_siglip2@abc123-image")
+        self.assertEqual(model_key("Qwen/Qwen3", None), "Qwen_Qwen3@unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
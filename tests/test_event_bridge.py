@@ -0,0 +1,69 @@
+import unittest
+from unittest.mock import MagicMock
+
+from pro_file_organizer.ui.event_bridge import UIEventBridge
+
+
+class TestUIEventBridge(unittest.TestCase):
+    def setUp(self):
+        self.view = MagicMock()
+        self.view.after_main.side_effect = lambda ms, func: func()
+        self.calls = []
+        self.view.update_progress.side_effect = lambda *args: self.calls.append(("progress", args))
+        self.view.append_logs.side_effect = lambda logs: self.calls.append(("logs", list(logs)))
+        self.view.add_result_cards.side_effect = lambda rows: self.calls.append(("rows", [r["file"] for r in rows]))
+        self.bridge = UIEventBridge(self.view, interval_ms=33)
+
+    def test_batches_in_order_with_latest_progress(self):
+        self.bridge.start()
+        self.view.start_timer.assert_called_once_with(33, self.bridge._tick)
+
+        for i in range(1, 4):
+            self.bridge.progress(i, 3, f"f{i}")
+        self.bridge.log("a")
+        self.bridge.log("b")
+        self.bridge.event({"file": "x"})
+        self.bridge.event({"file": "y"})
+        self.bridge.log("c")
+        # Nothing reaches the view until the timer fires
+        self.assertEqual(self.calls, [])
+
+        self.bridge._tick()
+        self.assertEqual(
+            self.calls,
+            [("progress", (3, 3, "f3")), ("logs", ["a", "b"]), ("rows", ["x", "y"]), ("logs", ["c"])],
+        )
+
+        # Progress that has not changed is not applied again
+        self.calls.clear()
+        self.bridge._tick()
+        self.assertEqual(self.calls, [])
+        self.assertEqual(self.bridge.stats()["busy_ticks"], 1)
+
+    def test_finish_runs_after_queued_items_and_stops(self):
+        self.bridge.start()
+        timer = self.view.start_timer.return_value
+        self.bridge.event({"file": "x"})
+        self.bridge.finish(lambda: self.calls.append(("done", ())))
+
+        self.assertEqual(self.calls, [("rows", ["x"]), ("done", ())])
+        timer.stop.assert_called_once()
+        self.assertFalse(self.bridge.active)
+
+        stats = self.bridge.stats()
+        self.assertEqual((stats["event"], stats["log"], stats["progress"]), (1, 0, 0))
+        self.assertEqual(stats["max_batch"], 2)
+
+        # Outside a run, calls go straight through after_main
+        self.bridge.log("late")
+        self.view.append_log.assert_called_once_with("late")
+
+    def test_counts_dropped_frames(self):
+        self.bridge.start()
+        self.bridge._last_tick -= 0.2  # ~6 intervals since the last tick
+        self.bridge._tick()
+        self.assertGreaterEqual(self.bridge.stats()["dropped_frames"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from pro_file_organizer.core.extraction import TextExtractor, extract_text
+
+
+class TestTextExtractor(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.extractor = TextExtractor(2, timeout=5.0)
+
+    def tearDown(self):
+        self.extractor.close()
+        shutil.rmtree(self.test_dir)
+
+    def test_matches_inline_extraction(self):
+        paths = []
+        for i in range(4):
+            path = self.test_dir / f"doc{i}.md"
+            path.write_text(f"# Heading {i}\n" + "body " * 2000)
+            paths.append(path)
+        for path in paths:
+            self.extractor.submit(path)
+
+        for path in paths:
+            self.assertEqual(self.extractor.get(path), extract_text(path))
+        self.assertEqual(self.extractor.extracted, 4)
+        self.assertEqual(len(self.extractor.get(paths[0])), 5000)
+
+    def test_unsupported_file_is_empty(self):
+        path = self.test_dir / "archive.zip"
+        path.write_bytes(b"PK\x03\x04")
+        self.assertEqual(self.extractor.get(path), "")
+
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "needs POSIX named pipes")
+    def test_stuck_file_times_out(self):
+        # Opening a FIFO with no writer blocks forever, like a parser stuck on a pathological file
+        stuck = self.test_dir / "stuck.txt"
+        os.mkfifo(stuck)
+        ok = self.test_dir / "ok.txt"
+        ok.write_text("still extracted")
+
+        extractor = TextExtractor(1, timeout=0.5)
+        try:
+            extractor.submit(stuck)
+            extractor.submit(ok)
+            self.assertEqual(extractor.get(stuck), "")
+            self.assertEqual(extractor.get(ok), "still extracted")
+        finally:
+            extractor.close()
+        self.assertEqual(extractor.timeouts, 1)
+        self.assertEqual(extractor.extracted, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
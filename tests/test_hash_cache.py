@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from pro_file_organizer.core.hash_cache import HashCache
+from pro_file_organizer.core.scanner import FileRecord
+
+
+class TestHashCache(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.cache = HashCache(self.test_dir / "cache" / "hashes.sqlite3", max_bytes=1024 * 1024)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.test_dir)
+
+    def record(self, name, content="data"):
+        path = self.test_dir / name
+        path.write_text(content)
+        return FileRecord.from_path(path)
+
+    def test_roundtrip_and_persistence(self):
+        rec = self.record("a.txt")
+        self.assertIsNone(self.cache.get(rec, "sha256"))
+        self.cache.put(rec, "sha256", "abc")
+        self.assertEqual(self.cache.get(rec, "sha256"), "abc")
+        self.assertIsNone(self.cache.get(rec, "blake2b"))
+        self.cache.close()
+
+        self.cache = HashCache(self.test_dir / "cache" / "hashes.sqlite3", max_bytes=1024 * 1024)
+        self.assertEqual(self.cache.get(rec, "sha256"), "abc")
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_changed_file_is_invalidated(self):
+        rec = self.record("a.txt")
+        self.cache.put(rec, "sha256", "abc")
+
+        path = self.test_dir / "a.txt"
+        path.write_text("changed content")
+        os.utime(path, ns=(rec.mtime_ns + 1_000_000, rec.mtime_ns + 1_000_000))
+        changed = FileRecord.from_path(path)
+
+        self.assertIsNone(self.cache.get(changed, "sha256"))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction(self):
+        records = [rec._replace(inode=i) for i, rec in enumerate([self.record("a.txt")] * 4000)]
+        for rec in records:
+            self.cache.put(rec, "sha256", "f" * 64)
+        self.cache.flush()
+        # Touch the first rows so they become the most recently used
+        for rec in records[:10]:
+            self.cache.get(rec, "sha256")
+
+        self.cache.max_bytes = self.cache.size_bytes // 2
+        self.cache.flush()
+
+        self.assertLess(self.cache.size_bytes, self.cache.max_bytes)
+        self.assertLess(len(self.cache), 4000)
+        for rec in records[:10]:
+            self.assertIsNotNone(self.cache.get(rec, "sha256"))
+        self.assertIsNone(self.cache.get(records[10], "sha256"))
+
+    def test_clear(self):
+        self.cache.put(self.record("a.txt"), "sha256", "abc")
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pro_file_organizer.core import hashing
+from pro_file_organizer.core.hashing import available_algorithms, hash_file, hash_file_ends, resolve_algorithm
+from pro_file_organizer.core.organizer import FileOrganizer
+
+
+class TestHashing(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.file = self.test_dir / "data.bin"
+        self.data = os.urandom(3 * 1024 * 1024 + 17)
+        self.file.write_bytes(self.data)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_digests_are_tagged(self):
+        self.assertEqual(hash_file(self.file, "sha256"), "sha256:" + hashlib.sha256(self.data).hexdigest())
+        self.assertEqual(hash_file(self.file, "blake2b"), "blake2b:" + hashlib.blake2b(self.data).hexdigest())
+        for algorithm in available_algorithms():
+            with self.subTest(algorithm=algorithm):
+                self.assertTrue(hash_file(self.file, algorithm).startswith(f"{algorithm}:"))
+
+    def test_mmap_matches_buffered_read(self):
+        buffered = hash_file(self.file, "blake2b")
+        with patch.object(hashing, "MMAP_THRESHOLD", 1024):
+            self.assertEqual(hash_file(self.file, "blake2b"), buffered)
+
+    def test_hash_file_ends(self):
+        block = 4096
+        expected = hashlib.blake2b(self.data[:block] + self.data[-block:]).hexdigest()
+        self.assertEqual(hash_file_ends(self.file, block, "blake2b"), "blake2b:" + expected)
+
+        small = self.test_dir / "small.bin"
+        small.write_bytes(b"abc")
+        self.assertEqual(hash_file_ends(small, block, "blake2b"), hash_file(small, "blake2b"))
+
+    def test_resolve_algorithm_fallback(self):
+        self.assertEqual(resolve_algorithm("sha256"), "sha256")
+        self.assertEqual(resolve_algorithm("md4-turbo"), hashing.DEFAULT_HASH_ALGORITHM)
+
+    def test_organizer_algorithm_config(self):
+        organizer = FileOrganizer(defer_state=True)
+        organizer.hash_algorithm = "sha256"
+        self.assertTrue(organizer._get_file_hash(self.file).startswith("sha256:"))
+
+        config = self.test_dir / "config.json"
+        self.assertTrue(organizer.save_config(config))
+        loaded = FileOrganizer(defer_state=True)
+        loaded.load_config(config)
+        self.assertEqual(loaded.hash_algorithm, "sha256")
+
+        organizer.hash_algorithm = "md4-turbo"
+        self.assertTrue(any("hash algorithm" in e for e in organizer.validate_config()))
+
+
+if __name__ == "__main__":
+    unittest.main()
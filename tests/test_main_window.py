@@ -47,16 +47,12 @@ class TestMainWindow(unittest.TestCase):
         self.app.btn_run.setEnabled.assert_called_with(True)
 
     def test_clear_results(self):
-        self.app.results_layout.count.return_value = 3  # 2 items to clear + 1 stretch
-        mock_item = MagicMock()
-        mock_widget = MagicMock()
-        mock_item.widget.return_value = mock_widget
-        self.app.results_layout.takeAt.return_value = mock_item
+        self.app.add_result_cards([{"file": "a.txt"}, {"file": "b.txt"}])
+        self.assertEqual(self.app.results_model.rowCount(), 2)
 
         self.app.clear_results()
-        # Should be called count-1 times
-        self.assertEqual(self.app.results_layout.takeAt.call_count, 2)
-        mock_widget.deleteLater.assert_called()
+        self.assertEqual(self.app.results_model.rowCount(), 0)
+        self.app.sort_container.hide.assert_called()
 
     def test_show_status(self):
         self.app.show_status("Busy...")
@@ -227,11 +223,26 @@ class TestMainWindow(unittest.TestCase):
         self.app.controller.set_folder.assert_called_with("/new/path")
 
     def test_add_result_card(self):
-        with patch("pro_file_organizer.ui.main_window.FileCard") as mock_card:
-            data = {"file": "test.txt", "category": "Docs"}
-            self.app.add_result_card(data)
-            self.assertEqual(len(self.app.result_cards), 1)
-            mock_card.assert_called()
+        data = {"file": "test.txt", "category": "Docs", "destination": "/tmp/Docs/test.txt"}
+        self.app.add_result_card(data)
+        self.assertEqual(self.app.results_model.rowCount(), 1)
+        self.assertEqual(self.app.results_model.store.detail(0), "→ Docs/test.txt")
+
+    def test_append_logs_is_one_append(self):
+        self.app.log_view.appendPlainText = MagicMock()
+        self.app.log_view.verticalScrollBar = MagicMock()
+        self.app.append_logs(["one", "two"])
+        self.app.log_view.appendPlainText.assert_called_once()
+        text = self.app.log_view.appendPlainText.call_args[0][0]
+        self.assertTrue(text.endswith("] two"))
+        self.assertEqual(len(text.splitlines()), 2)
+
+    def test_set_running_state_marks_rows_executed(self):
+        self.app.add_result_card({"file": "test.txt"})
+        self.app.set_running_state(True)
+        self.assertFalse(self.app.results_model.executed)
+        self.app.set_running_state(False)
+        self.assertTrue(self.app.results_model.executed)
 
 
 if __name__ == "__main__":
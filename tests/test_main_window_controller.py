@@ -1,3 +1,4 @@
+import threading
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, mock_open, patch
@@ -6,6 +7,7 @@ from unittest.mock import MagicMock, mock_open, patch
 from pro_file_organizer.core.ml_organizer import MultimodalFileOrganizer
 from pro_file_organizer.core.organizer import FileOrganizer
 from pro_file_organizer.ui.main_window_controller import MainWindowController
+from pro_file_organizer.ui.preview_index import PreviewIndex
 
 
 class TestMainWindowController(unittest.TestCase):
@@ -39,6 +41,30 @@ class TestMainWindowController(unittest.TestCase):
             c = MainWindowController(self.view, self.organizer, self.ml_organizer)
             self.assertEqual(c.recent_folders, [])
 
+    def test_background_state_load(self):
+        view = MagicMock()
+        loaded = threading.Event()
+        pending = []
+        view.after_main.side_effect = lambda ms, func: (pending.append(func), loaded.set())
+        factory = MagicMock(return_value=self.ml_organizer)
+        with patch.object(MainWindowController, "_read_stats", return_value={"total_files": 5, "last_run": "x"}):
+            with patch.object(MainWindowController, "_read_recent", return_value=["/tmp/a", "/tmp/b"]):
+                c = MainWindowController(view, self.organizer, ml_organizer_factory=factory, load_in_background=True)
+                self.assertTrue(loaded.wait(timeout=5))
+
+        # Folders opened before the load finished stay on top
+        c.recent_folders = ["/tmp/b"]
+        pending[0]()
+
+        self.organizer.load_state.assert_called_once()
+        view.update_stats_display.assert_called_with({"total_files": 5, "last_run": "x"})
+        view.update_recent_menu.assert_called_with(["/tmp/b", "/tmp/a"])
+
+        factory.assert_not_called()
+        self.assertIs(c.ml_organizer, self.ml_organizer)
+        self.assertIs(c.ml_organizer, self.ml_organizer)
+        factory.assert_called_once()
+
     def test_save_stats_error(self):
         with patch("os.makedirs", side_effect=Exception("Disk full")):
             self.controller.save_stats()  # Should not raise
@@ -186,6 +212,24 @@ class TestMainWindowController(unittest.TestCase):
             on_progress(1, 10, "f")
             self.view.update_progress.assert_called()
 
+    def test_preview_plan_used_by_next_organize(self):
+        self.controller.selected_path = Path("/tmp")
+        self.controller._source_path_for_preview = Path("/tmp")
+        planned = [Path("/tmp/Documents"), Path("/tmp/Images")]
+        self.controller._on_complete({"moved": 2, "target_dirs": planned}, dry_run=True)
+
+        self.organizer.organize_files.return_value = {"moved": 2}
+        self.controller._organize_worker(False)
+        self.assertEqual(self.organizer.organize_files.call_args[0][0].planned_dirs, planned)
+
+        # A plan is used once, and only for the folder it was made for
+        self.controller._on_complete({"moved": 2}, dry_run=False)
+        self.assertIsNone(self.controller._planned_dirs)
+        self.controller._on_complete({"moved": 2, "target_dirs": planned}, dry_run=True)
+        self.controller.selected_path = Path("/other")
+        self.controller._organize_worker(False)
+        self.assertEqual(self.organizer.organize_files.call_args[0][0].planned_dirs, ())
+
     def test_on_complete_branches_extended(self):
         # Case 1: Success path
         stats = {"moved": 5}
@@ -238,15 +282,33 @@ class TestMainWindowController(unittest.TestCase):
         self.controller.is_running = False
 
         with patch.object(self.controller, "run_organization") as mock_run:
-            self.controller._on_watch_trigger()
-            mock_run.assert_called_with(dry_run=False, from_watcher=True)
+            self.controller._on_watch_trigger({Path("/tmp/a.txt")})
+            mock_run.assert_called_with(dry_run=False, from_watcher=True, paths={Path("/tmp/a.txt")})
 
-            # Case: already running
+            # Case: already running; the paths wait for the next run
             mock_run.reset_mock()
             self.controller.is_running = True
-            self.controller._on_watch_trigger()
+            self.controller._on_watch_trigger({Path("/tmp/b.txt")})
             mock_run.assert_not_called()
 
+            self.controller.watcher = MagicMock()
+            self.view.after_main.side_effect = lambda _ms, func: func()
+            self.controller._on_complete({"moved": 1}, dry_run=False)
+            mock_run.assert_called_once_with(dry_run=False, from_watcher=True, paths={Path("/tmp/b.txt")})
+            self.assertEqual(self.controller._pending_watch_paths, set())
+
+    def test_watch_run_organizes_only_changed_paths(self):
+        self.controller.selected_path = Path("/tmp")
+        self.controller.organizer = MagicMock()
+        self.controller.organizer.organize_paths.return_value = {"moved": 1, "errors": 0}
+
+        self.controller._organize_worker(False, {Path("/tmp/a.txt")})
+
+        self.controller.organizer.organize_files.assert_not_called()
+        paths, options = self.controller.organizer.organize_paths.call_args[0]
+        self.assertEqual(paths, {Path("/tmp/a.txt")})
+        self.assertEqual(options.source_path, Path("/tmp"))
+
     def test_on_category_toggle(self):
         """Test toggling category visibility updates state and triggers refresh."""
         self.controller._cached_preview = [{"category": "Images"}]
@@ -272,73 +334,79 @@ class TestMainWindowController(unittest.TestCase):
             mock_refresh.assert_called_once()
 
     def test_refresh_preview(self):
-        """Test _refresh_preview categorizes, counts, and filters correctly."""
-        # Setup specific mock data for sorting and filtering
-        self.controller._source_path_for_preview = Path("/tmp")
-        self.controller._cached_preview = [
-            {"file": "b.txt", "ext_category": "Documents", "ai_category": "Images", "ai_confidence": 0.4},
-            {"file": "a.txt", "ext_category": "Documents", "ai_category": "Images", "ai_confidence": 0.9, "relative_dir": "2023"},
-            {"file": "c.txt", "ext_category": "Others", "ai_category": None}
-        ]
+        """Test _refresh_preview sends only flipped rows, counts, and orders correctly."""
+        self.controller._cached_preview = PreviewIndex(
+            Path("/tmp"),
+            [
+                {"file": "b.txt", "ext_category": "Documents", "ai_category": "Images", "ai_confidence": 0.4},
+                {"file": "a.txt", "ext_category": "Documents", "ai_category": "Images", "ai_confidence": 0.9, "relative_dir": "2023"},
+                {"file": "c.txt", "ext_category": "Others", "ai_category": None},
+            ],
+        )
 
         # Test logic branch: confidence > threshold (threshold is 0.5)
         self.organizer.ml_confidence = 0.5
 
         self.controller._refresh_preview()
 
-        # b.txt -> 0.4 < 0.5 -> ext_category: Documents
-        # a.txt -> 0.9 > 0.5 -> ai_category: Images
-        # c.txt -> None -> ext_category: Others
-
-        # Check call counts for view updates
-        self.assertEqual(self.view.add_result_card.call_count, 3)
-        self.view.update_category_breakdown.assert_called_once()
-        self.view.update_results_header.assert_called_once()
+        # b.txt -> 0.4 < 0.5 -> ext_category: Documents (unchanged)
+        # a.txt -> 0.9 > 0.5 -> ai_category: Images (flipped)
+        # c.txt -> None -> ext_category: Others (unchanged)
+        self.view.update_result_rows.assert_called_once()
+        rows = self.view.update_result_rows.call_args[0][0]
+        self.assertEqual(list(rows), [1])
+        self.assertEqual(rows[1]["category"], "Images")
+        # Check path rebuild with relative_dir
+        self.assertEqual(rows[1]["destination"], str(Path("/tmp/Images/2023/a.txt")))
 
-        # Verify added cards
-        calls = self.view.add_result_card.call_args_list
-        categories = sorted([c[0][0]["category"] for c in calls])
-        self.assertEqual(categories, ["Documents", "Images", "Others"])
+        self.view.update_results_header.assert_called_once_with("Done! Would move 3 files (1 AI-categorized).")
+        self.view.update_category_breakdown.assert_called_once_with({"Documents": 1, "Images": 1, "Others": 1}, set())
+        # Scan order needs no reordering
+        self.view.set_result_order.assert_not_called()
 
-        # Check path rebuild with relative_dir
-        a_txt_call = next(c[0][0] for c in calls if c[0][0]["file"] == "a.txt")
-        self.assertEqual(a_txt_call["destination"], str(Path("/tmp/Images/2023/a.txt")))
+        # Same threshold again: nothing flips
+        self.view.update_result_rows.reset_mock()
+        self.controller._refresh_preview()
+        self.view.update_result_rows.assert_not_called()
 
         # Test Filtering
-        self.view.add_result_card.reset_mock()
         self.controller._hidden_categories.add("Images")
         self.controller._refresh_preview()
-
-        self.assertEqual(self.view.add_result_card.call_count, 2) # Images skipped
-        calls = self.view.add_result_card.call_args_list
-        categories = sorted([c[0][0]["category"] for c in calls])
-        self.assertEqual(categories, ["Documents", "Others"])
+        self.view.set_result_order.assert_called_with([0, 2])  # Images skipped
         self.controller._hidden_categories.remove("Images")
 
         # Test Sorting Branches
-        # Name
-        self.view.add_result_card.reset_mock()
         self.controller._sort_key = "name"
         self.controller._refresh_preview()
-        calls = self.view.add_result_card.call_args_list
-        files = [c[0][0]["file"] for c in calls]
-        self.assertEqual(files, ["a.txt", "b.txt", "c.txt"])
+        self.view.set_result_order.assert_called_with([1, 0, 2])
 
-        # Confidence
-        self.view.add_result_card.reset_mock()
         self.controller._sort_key = "confidence"
         self.controller._refresh_preview()
-        calls = self.view.add_result_card.call_args_list
-        confs = [c[0][0]["confidence"] for c in calls]
-        self.assertEqual(confs, [1.0, 1.0, 0.9])
+        self.view.set_result_order.assert_called_with([0, 2, 1])
 
-        # Type (Category)
-        self.view.add_result_card.reset_mock()
         self.controller._sort_key = "type"
         self.controller._refresh_preview()
-        calls = self.view.add_result_card.call_args_list
-        cats = [c[0][0]["category"] for c in calls]
-        self.assertEqual(cats, ["Documents", "Images", "Others"])
+        self.view.set_result_order.assert_called_with([0, 1, 2])
+
+        # Back to scan order
+        self.controller._sort_key = "none"
+        self.controller._refresh_preview()
+        self.view.set_result_order.assert_called_with(None)
+
+        # Lowering the threshold flips only b.txt
+        self.organizer.ml_confidence = 0.3
+        self.controller._refresh_preview()
+        rows = self.view.update_result_rows.call_args[0][0]
+        self.assertEqual(list(rows), [0])
+        self.assertEqual(rows[0]["method"], "ml")
+        self.view.update_results_header.assert_called_with("Done! Would move 3 files (2 AI-categorized).")
+
+        # Not while a run is still adding rows
+        self.view.update_results_header.reset_mock()
+        self.controller.is_running = True
+        self.controller._refresh_preview()
+        self.view.update_results_header.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,14 @@
 import sys
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, mock_open, patch
 
+try:
+    import numpy as real_np
+except ImportError:
+    real_np = None
+
 # Mock dependencies before importing ml_organizer
 sys.modules["transformers"] = MagicMock()
 sys.modules["transformers"].AutoConfig = MagicMock()
@@ -144,17 +150,14 @@ class TestMultimodalFileOrganizer(unittest.TestCase):
         self.organizer.image_processor.return_value = MagicMock()
         self.organizer.image_processor.to.return_value = mock_inputs
 
-        mock_outputs = MagicMock()
-        mock_outputs.logits_per_image = [MagicMock()]
-        self.organizer.image_model.return_value = mock_outputs
-
         mock_probs = MagicMock()
         mock_probs.argmax.return_value.item.return_value = 1
         mock_probs[1].item.return_value = 0.95
 
         self.organizer.Image.open.return_value = MagicMock()
         self.organizer.torch.no_grad.return_value = MagicMock()
-        self.organizer.torch.sigmoid.return_value = mock_probs
+        # Scores for a batch of one image
+        self.organizer.torch.sigmoid.return_value = [mock_probs]
 
         cat, conf = self.organizer.categorize_image(Path("test.jpg"))
         self.assertEqual(cat, "Documents/Code")
@@ -209,6 +212,123 @@ class TestMultimodalFileOrganizer(unittest.TestCase):
             cat, conf, method = self.organizer.smart_categorize(Path("unknown.dat"))
             self.assertEqual(method, "extension")
 
+    def test_smart_categorize_many_routes_batches(self):
+        paths = [Path("a.jpg"), Path("notes.txt"), Path("b.png"), Path("data.bin"), Path("c.pdf")]
+        with patch.object(
+            self.organizer, "categorize_images", return_value=[("Images/Personal", 0.9), (None, 0.0)]
+        ) as images:
+            with patch.object(self.organizer, "extract_text", side_effect=lambda p: f"content of {p.name}"):
+                with patch.object(
+                    self.organizer,
+                    "categorize_text_files",
+                    return_value=[("Documents/Code", 0.7), ("Documents/Code", 0.6)],
+                ) as texts:
+                    results = self.organizer.smart_categorize_many(paths)
+
+        images.assert_called_once_with([Path("a.jpg"), Path("b.png")], None)
+        texts.assert_called_once_with(
+            [(Path("notes.txt"), "content of notes.txt"), (Path("c.pdf"), "content of c.pdf")], None
+        )
+        self.assertEqual(
+            results,
+            [
+                ("Images/Personal", 0.9, "image-ml"),
+                ("Documents/Code", 0.7, "text-ml"),
+                (None, 0.0, "extension"),
+                (None, 0.0, "extension"),
+                ("Documents/Code", 0.6, "text-ml"),
+            ],
+        )
+
+        self.organizer.models_loaded = False
+        self.assertEqual(self.organizer.smart_categorize_many(paths[:2]), [(None, 0.0, "ml-not-loaded")] * 2)
+
+    def test_categorize_images_batches(self):
+        self.organizer.batch_size = 2
+        self.organizer.image_processor.reset_mock()
+        results = self.organizer.categorize_images([Path(f"{i}.jpg") for i in range(5)])
+        self.assertEqual(len(results), 5)
+        batch_sizes = [
+            len(c.kwargs["images"]) for c in self.organizer.image_processor.call_args_list if "images" in c.kwargs
+        ]
+        self.assertEqual(batch_sizes, [2, 2, 1])
+
+    def test_label_features_cached_until_labels_change(self):
+        encode_labels = self.organizer.image_model.get_text_features
+        self.organizer.categorize_images([Path(f"{i}.jpg") for i in range(3)])
+        self.organizer.categorize_image(Path("x.jpg"))
+        self.assertEqual(encode_labels.call_count, 1)
+        # Images only go through the vision tower
+        self.organizer.image_model.assert_not_called()
+        self.assertEqual(self.organizer.image_model.get_image_features.call_count, 2)
+
+        self.organizer.categories_config["Images/Pets"] = {"visual": ["a cat"]}
+        self.organizer.categorize_image(Path("y.jpg"))
+        self.assertEqual(encode_labels.call_count, 2)
+        _, kwargs = self.organizer.image_processor.call_args_list[-2]
+        self.assertEqual(kwargs["text"], ["label", "code", "a cat"])
+
+    @unittest.skipIf(real_np is None, "numpy not installed")
+    def test_categorize_text_files_matches_single(self):
+        self.organizer.np = real_np
+        self.organizer.text_category_embeddings = {
+            "Images/Personal": real_np.array([1.0, 0.0, 0.0]),
+            "Documents/Code": real_np.array([0.0, 1.0, 1.0]),
+        }
+        vectors = {"photo album": [0.9, 0.1, 0.0], "python code": [0.1, 0.8, 0.7]}
+
+        def encode(texts, **kwargs):
+            if isinstance(texts, str):
+                return real_np.array(next(v for k, v in vectors.items() if k in texts))
+            return real_np.array([next(v for k, v in vectors.items() if k in t) for t in texts])
+
+        self.mock_text_model.encode.side_effect = encode
+        items = [
+            (Path("a.txt"), "my photo album notes"),
+            (Path("b.txt"), "short"),
+            (Path("c.py"), "some python code here"),
+        ]
+        batched = self.organizer.categorize_text_files(items)
+        single = [self.organizer.categorize_text_file(p, c) for p, c in items]
+        self.assertEqual([c for c, _ in batched], ["Images/Personal", None, "Documents/Code"])
+        for (b_cat, b_conf), (s_cat, s_conf) in zip(batched, single):
+            self.assertEqual(b_cat, s_cat)
+            self.assertAlmostEqual(b_conf, s_conf)
+
+    @unittest.skipIf(real_np is None, "numpy not installed")
+    def test_cached_text_embeddings_skip_extraction(self):
+        from pro_file_organizer.core.embedding_cache import EmbeddingStore
+        from pro_file_organizer.core.scanner import FileRecord
+
+        self.organizer.np = real_np
+        self.organizer.text_category_embeddings = {
+            "Images/Personal": real_np.array([1.0, 0.0, 0.0]),
+            "Documents/Code": real_np.array([0.0, 1.0, 1.0]),
+        }
+        self.mock_text_model.encode.side_effect = lambda texts, **kwargs: real_np.array([[0.1, 0.8, 0.7]] * len(texts))
+        paths = [Path("a.py"), Path("b.md")]
+        records = [FileRecord(p.name, "/src", 100, 5, i + 1, 1, 0o100000) for i, p in enumerate(paths)]
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            with patch.dict(sys.modules, {"numpy": real_np}):
+                self.organizer.text_embeddings = EmbeddingStore(cache_dir, 1024 * 1024)
+            with patch.object(self.organizer, "extract_text", return_value="some python code here") as extract:
+                first = self.organizer.smart_categorize_many(paths, records=records)
+                self.assertEqual(extract.call_count, 2)
+                second = self.organizer.smart_categorize_many(paths, records=records)
+                self.assertEqual(extract.call_count, 2)
+
+                # A modified file is embedded again
+                records[1] = records[1]._replace(mtime_ns=6)
+                self.organizer.smart_categorize_many(paths, records=records)
+                self.assertEqual(extract.call_count, 3)
+            self.organizer.text_embeddings.close()
+
+        self.assertEqual(self.mock_text_model.encode.call_count, 2)
+        self.assertEqual([c for c, _, _ in second], ["Documents/Code"] * 2)
+        for (_, f_conf, _), (_, s_conf, _) in zip(first, second):
+            self.assertAlmostEqual(f_conf, s_conf, places=3)
+
     def test_load_models_full(self):
         self.organizer.models_loaded = False
         # Since we use local imports, we patch the modules themselves
@@ -220,6 +340,45 @@ class TestMultimodalFileOrganizer(unittest.TestCase):
                     self.assertTrue(self.organizer.models_loaded)
                     self.assertIsNotNone(self.organizer.torch)
 
+    def test_load_models_int8_backend(self):
+        self.organizer.models_loaded = False
+        self.organizer.backend = "torch-int8"
+        with patch("sentence_transformers.SentenceTransformer", return_value=self.mock_text_model):
+            self.assertTrue(self.organizer.load_models())
+
+        quantize = self.organizer.torch.ao.quantization.quantize_dynamic
+        self.assertEqual(quantize.call_count, 2)
+        self.assertEqual(self.organizer.device, "cpu")
+        self.assertIs(self.organizer.text_model, quantize.return_value)
+        self.assertIs(self.organizer.image_model, quantize.return_value)
+
+    def test_onnx_backend_falls_back_without_onnxruntime(self):
+        from pro_file_organizer.core.ml_backends import resolve_backend
+
+        with patch.dict(sys.modules, {"onnxruntime": None}):
+            self.assertEqual(resolve_backend("onnx"), "torch")
+        self.assertEqual(resolve_backend("torch-int8"), "torch-int8")
+        self.assertEqual(resolve_backend("tensorrt"), "torch")
+
+    def test_load_models_onnx_backend_frees_vision_tower(self):
+        self.organizer.models_loaded = False
+        self.organizer.backend = "onnx"
+        with patch("sentence_transformers.SentenceTransformer", return_value=self.mock_text_model):
+            with patch("pro_file_organizer.core.ml_organizer.resolve_backend", return_value="onnx"):
+                with patch.object(self.organizer, "_load_onnx_image_encoder") as load_encoder:
+                    self.assertTrue(self.organizer.load_models())
+
+        self.assertIs(self.organizer.image_encoder, load_encoder.return_value)
+        self.assertIsNone(self.organizer.image_model.vision_model)
+        # The text tower is still there for the label features
+        self.organizer.image_model.get_text_features.assert_called()
+
+    def test_onnx_image_encoder_replaces_vision_tower(self):
+        self.organizer.image_encoder = MagicMock()
+        self.organizer.categorize_images([Path("a.jpg"), Path("b.jpg")])
+        self.organizer.image_encoder.assert_called_once()
+        self.organizer.image_model.get_image_features.assert_not_called()
+
     def test_load_models_already_loaded(self):
         self.organizer.models_loaded = True
         cb = MagicMock()
@@ -2,17 +2,24 @@ import json
 import os
 import shutil
 import tempfile
+import time
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+from pro_file_organizer.core.duplicates import DuplicateIndex
+from pro_file_organizer.core.hashing import hash_file_ends
 from pro_file_organizer.core.organizer import FileOrganizer, OrganizationOptions
+from pro_file_organizer.core.scanner import FileRecord
+from pro_file_organizer.core.transfer import move_no_clobber
+from pro_file_organizer.core.undo_journal import UndoJournal
+from tests.organizer_test_utils import make_test_organizer
 
 
 class TestFileOrganizer(unittest.TestCase):
     def setUp(self):
         self.test_dir = tempfile.mkdtemp()
-        self.organizer = FileOrganizer()
+        self.organizer = make_test_organizer(self)
 
     def tearDown(self):
         shutil.rmtree(self.test_dir)
@@ -30,6 +37,16 @@ class TestFileOrganizer(unittest.TestCase):
         unique_p = self.organizer.get_unique_path(p)
         self.assertEqual(unique_p, Path(self.test_dir) / "test_1.txt")
 
+    def test_deferred_state(self):
+        with patch("pro_file_organizer.core.organizer.init_app_dirs") as mock_init:
+            organizer = FileOrganizer(defer_state=True)
+            mock_init.assert_not_called()
+
+            # Anything that needs the undo stack loads it on demand, exactly once
+            self.assertTrue(organizer.wait_for_state(timeout=5))
+            organizer.load_state()
+            mock_init.assert_called_once()
+
     def test_organize_basic(self):
         self.create_file("image.jpg")
         self.create_file("doc.pdf")
@@ -57,6 +74,54 @@ class TestFileOrganizer(unittest.TestCase):
 
         self.assertTrue((Path(self.test_dir) / "Images" / "image.png").exists())
 
+    def test_organize_paths(self):
+        changed = self.create_file("new.jpg")
+        untouched = self.create_file("old.pdf")
+        nested = self.create_file("sub/nested.png")
+        excluded = self.create_file("notes.tmp")
+        in_excluded_folder = self.create_file("node_modules/index.js")
+        self.organizer.excluded_extensions = {".tmp"}
+        outside = Path(tempfile.mkdtemp()) / "elsewhere.txt"
+        self.addCleanup(shutil.rmtree, outside.parent)
+        outside.write_text("x")
+        root = Path(self.test_dir)
+
+        paths = [changed, changed, nested, excluded, outside, root / "deleted.txt", root / "sub"]
+        with patch.object(self.organizer, "scan_records") as mock_scan:
+            stats = self.organizer.organize_paths(paths, OrganizationOptions(root))
+        mock_scan.assert_not_called()
+
+        # Only the changed top-level file moves; nested files need a recursive run
+        self.assertEqual(stats["moved"], 1)
+        self.assertTrue((root / "Images" / "new.jpg").exists())
+        self.assertTrue(untouched.exists())
+        self.assertTrue(nested.exists())
+        self.assertTrue(excluded.exists())
+        self.assertTrue(outside.exists())
+
+        options = OrganizationOptions(root, recursive=True, del_empty=True)
+        stats = self.organizer.organize_paths([nested, in_excluded_folder], options)
+        self.assertEqual(stats["moved"], 1)
+        self.assertTrue(in_excluded_folder.exists())
+        self.assertTrue((root / "Images" / "nested.png").exists())
+        # The folder it left empty is removed
+        self.assertFalse((root / "sub").exists())
+
+    def test_organize_paths_duplicates_index_matching_sizes(self):
+        self.create_file("Documents/existing.txt", "same content")
+        self.create_file("Documents/other.txt", "different length content")
+        changed = self.create_file("copy.txt", "same content")
+        root = Path(self.test_dir)
+
+        add = DuplicateIndex.add
+        with patch.object(DuplicateIndex, "add", autospec=True, side_effect=add) as mock_add:
+            stats = self.organizer.organize_paths([changed], OrganizationOptions(root, detect_duplicates=True))
+
+        # other.txt cannot match, so it is never indexed
+        self.assertEqual([call.args[1].name for call in mock_add.call_args_list], ["existing.txt"])
+        self.assertEqual(stats["duplicates"], 1)
+        self.assertTrue(changed.exists())
+
     def test_date_sort(self):
         f = self.create_file("photo.jpg")
         ts = 1672574400  # 2023-01-01
@@ -111,24 +176,82 @@ class TestFileOrganizer(unittest.TestCase):
 
         self.assertEqual(stats["moved"], 1)
 
+    def test_streaming_mode(self):
+        for i in range(5):
+            self.create_file(f"doc{i}.txt")
+        self.create_file("sub/photo.jpg")
+
+        progress = []
+        options = OrganizationOptions(
+            Path(self.test_dir),
+            recursive=True,
+            streaming=True,
+            stream_buffer_size=2,
+            progress_callback=lambda curr, total, name: progress.append((curr, total)),
+        )
+        stats = self.organizer.organize_files(options)
+
+        self.assertEqual(stats["moved"], 6)
+        self.assertEqual(stats["errors"], 0)
+        self.assertTrue((Path(self.test_dir) / "Images" / "photo.jpg").exists())
+        # Total is the running discovered count, never behind the processed count
+        self.assertEqual([c for c, _ in progress], list(range(1, 7)))
+        self.assertTrue(all(total >= curr for curr, total in progress))
+
+    def test_streaming_scan_error(self):
+        with patch("pro_file_organizer.core.organizer.list_dir", side_effect=OSError("Listing failed")):
+            log_cb = MagicMock()
+            stats = self.organizer.organize_files(
+                OrganizationOptions(Path(self.test_dir), streaming=True, log_callback=log_cb)
+            )
+        self.assertEqual(stats["moved"], 0)
+        self.assertEqual(stats["errors"], 1)
+        log_cb.assert_any_call("Error scanning files: Listing failed")
+
     def test_rollback_on_error(self):
         self.create_file("file1.txt")
         self.create_file("file2.txt")
 
-        # Mock shutil.move to fail on the second file
-        original_move = shutil.move
+        # Mock the move to fail on the second file
+        original_move = move_no_clobber
 
         def side_effect(src, dst):
             if "file2.txt" in str(src):
                 raise PermissionError("Access Denied")
             return original_move(src, dst)
 
-        with patch("shutil.move", side_effect=side_effect):
+        with patch("pro_file_organizer.core.organizer.move_no_clobber", side_effect=side_effect):
             stats = self.organizer.organize_files(OrganizationOptions(Path(self.test_dir), rollback_on_error=True))
             self.assertTrue(stats.get("rolled_back", False))
             self.assertTrue((Path(self.test_dir) / "file1.txt").exists())
             self.assertTrue((Path(self.test_dir) / "file2.txt").exists())
 
+    def test_rollback_stops_background_work(self):
+        for i in range(30):
+            self.create_file(f"d{i % 3}/file{i}.txt", content=f"content {i % 5}" if i != 3 else "unique")
+
+        def fail_on_third(src, dst):
+            if Path(src).name == "file3.txt":
+                raise PermissionError("Access Denied")
+            return move_no_clobber(src, dst)
+
+        options = OrganizationOptions(
+            Path(self.test_dir),
+            recursive=True,
+            streaming=True,
+            detect_duplicates=True,
+            hash_workers=4,
+            rollback_on_error=True,
+        )
+        with patch("pro_file_organizer.core.organizer.move_no_clobber", side_effect=fail_on_third):
+            with patch.object(DuplicateIndex, "close", autospec=True, side_effect=DuplicateIndex.close) as close_index:
+                with patch("pro_file_organizer.core.organizer.BoundedBuffer.close", autospec=True) as close_buffer:
+                    stats = self.organizer.organize_files(options)
+
+        self.assertTrue(stats["rolled_back"])
+        close_index.assert_called()
+        close_buffer.assert_called()
+
     def test_deep_collision(self):
         for i in range(5):
             self.create_file("test.txt")
@@ -166,12 +289,88 @@ class TestFileOrganizer(unittest.TestCase):
         self.create_file("unknown.ext")
         mock_ml = MagicMock()
         mock_ml.models_loaded = True
-        mock_ml.smart_categorize.return_value = ("Images", 0.9, "image-ml")
+        mock_ml.smart_categorize_many.side_effect = lambda paths, threshold, **kwargs: [
+            ("Images", 0.9, "image-ml")
+        ] * len(paths)
 
         with patch("pro_file_organizer.core.ml_organizer.MultimodalFileOrganizer", return_value=mock_ml):
             self.organizer.organize_files(OrganizationOptions(Path(self.test_dir), use_ml=True))
             self.assertTrue((Path(self.test_dir) / "Images" / "unknown.ext").exists())
 
+    def test_organize_with_ml_batches(self):
+        for i in range(40):
+            self.create_file(f"file{i}.ext")
+        mock_ml = MagicMock()
+        mock_ml.models_loaded = True
+        mock_ml.smart_categorize_many.side_effect = lambda paths, threshold, **kwargs: [
+            ("Images", 0.9, "image-ml")
+        ] * len(paths)
+
+        with patch("pro_file_organizer.core.ml_organizer.MultimodalFileOrganizer", return_value=mock_ml):
+            stats = self.organizer.organize_files(OrganizationOptions(Path(self.test_dir), use_ml=True, ml_batch_size=4))
+        self.assertEqual(stats["moved"], 40)
+        # Windows of four batches: 16 + 16 + 8
+        self.assertEqual([len(c.args[0]) for c in mock_ml.smart_categorize_many.call_args_list], [16, 16, 8])
+        mock_ml.smart_categorize.assert_not_called()
+
+        # ml_batch_size=1 keeps the per-file path
+        for i in range(2):
+            self.create_file(f"single{i}.ext")
+        mock_ml.smart_categorize.return_value = ("Images", 0.9, "image-ml")
+        self.organizer.organize_files(OrganizationOptions(Path(self.test_dir), use_ml=True, ml_batch_size=1))
+        self.assertEqual(mock_ml.smart_categorize.call_count, 2)
+
+    def test_organize_with_extraction_workers(self):
+        self.create_file("notes.txt", "meeting notes")
+        self.create_file("photo.jpg")
+        mock_ml = MagicMock()
+        mock_ml.models_loaded = True
+        mock_ml.needs_text.side_effect = lambda record: record.suffix == ".txt"
+        texts = {}
+
+        def categorize(paths, threshold, records=None, extract=None):
+            for path in paths:
+                if path.suffix == ".txt":
+                    texts[path.name] = extract(path)
+            return [("Images", 0.9, "image-ml")] * len(paths)
+
+        mock_ml.smart_categorize_many.side_effect = categorize
+        with patch("pro_file_organizer.core.ml_organizer.MultimodalFileOrganizer", return_value=mock_ml):
+            stats = self.organizer.organize_files(
+                OrganizationOptions(Path(self.test_dir), use_ml=True, ml_batch_size=4, extract_workers=2)
+            )
+        self.assertEqual(texts, {"notes.txt": "meeting notes"})
+        self.assertEqual(stats["moved"], 2)
+        self.assertEqual(stats["stages"]["extract"]["items"], 1)
+        self.assertEqual(stats["stages"]["categorize"]["items"], 2)
+
+    def test_landed_files_are_not_extracted(self):
+        paths = [self.create_file(f"doc{i}.txt", "text") for i in range(3)]
+        records = [FileRecord.from_path(path) for path in paths]
+        self.organizer.ml_categorizer = MagicMock()
+        self.organizer.ml_categorizer.smart_categorize_many.side_effect = lambda paths, threshold, **kwargs: [
+            ("Documents", 0.9, "text-ml")
+        ] * len(paths)
+        # doc0 landed before the scan reached it; doc2 lands while it is in the look-ahead window
+        landed = {str(paths[0])}
+        extractor = MagicMock()
+        extractor.submit.side_effect = lambda path: landed.add(str(path)) if path == paths[2] else None
+
+        stage = self.organizer._categorize_stage(records, True, landed, ml_batch_size=4, extractor=extractor)
+
+        self.assertEqual([record.path for record, _ in stage], [paths[1]])
+        self.assertEqual([c.args[0] for c in extractor.submit.call_args_list], [paths[1], paths[2]])
+        extractor.discard.assert_any_call(paths[2])
+
+    def test_stage_counters(self):
+        for i in range(3):
+            self.create_file(f"file{i}.txt")
+        stats = self.organizer.organize_files(OrganizationOptions(Path(self.test_dir), streaming=True))
+        self.assertEqual(set(stats["stages"]), {"scan", "extract", "categorize", "move"})
+        for stage in ("scan", "categorize", "move"):
+            self.assertEqual(stats["stages"][stage]["items"], 3)
+        self.assertEqual(stats["stages"]["extract"]["items"], 0)
+
     def test_recursive_exclusions(self):
         self.create_file(".git/config")
         self.create_file("venv/activate")
@@ -183,6 +382,38 @@ class TestFileOrganizer(unittest.TestCase):
         self.assertNotIn("config", filenames)
         self.assertNotIn("activate", filenames)
 
+    def test_undo_journal_inside_source_is_skipped(self):
+        root = Path(self.test_dir)
+        self.organizer.undo_journal = UndoJournal(root / "state" / "journal")
+        self.create_file("state/journal/notes.txt")
+        # Only the configured folder is skipped, not every folder of that name
+        self.create_file("other/journal/report.txt")
+
+        for workers in (1, 4):
+            records = self.organizer.scan_records(root, recursive=True, workers=workers)
+            self.assertEqual([r.name for r in records], ["report.txt"])
+        paths = [root / "state" / "journal" / "notes.txt", root / "state" / "journal"]
+        self.assertEqual(self.organizer.path_records(paths, root, recursive=True), [])
+
+        stats = self.organizer.organize_files(OrganizationOptions(root, recursive=True))
+        self.assertEqual(stats["moved"], 1)
+        self.assertTrue((root / "state" / "journal" / "notes.txt").exists())
+        self.assertEqual(self.organizer.undo_changes(), 1)
+        self.assertTrue((root / "other" / "journal" / "report.txt").exists())
+
+    def test_parallel_scan_workers(self):
+        for i in range(6):
+            self.create_file(f"dir{i}/nested/file{i}.txt")
+        self.create_file("node_modules/pkg.js")
+
+        serial = list(self.organizer.scan_files(Path(self.test_dir), recursive=True))
+        parallel = list(self.organizer.scan_files(Path(self.test_dir), recursive=True, workers=4))
+        self.assertEqual(parallel, serial)
+
+        stats = self.organizer.organize_files(OrganizationOptions(Path(self.test_dir), recursive=True, scan_workers=4))
+        self.assertEqual(stats["moved"], 6)
+        self.assertTrue((Path(self.test_dir) / "node_modules" / "pkg.js").exists())
+
     def test_event_callbacks(self):
         self.create_file("test.txt")
         callback = MagicMock()
@@ -206,7 +437,9 @@ class TestFileOrganizer(unittest.TestCase):
         self.create_file("unknown.ext")
         mock_ml = MagicMock()
         mock_ml.models_loaded = False
-        mock_ml.smart_categorize.return_value = ("Images", 0.9, "image-ml")
+        mock_ml.smart_categorize_many.side_effect = lambda paths, threshold, **kwargs: [
+            ("Images", 0.9, "image-ml")
+        ] * len(paths)
 
         log_cb = MagicMock()
         prog_cb = MagicMock()
@@ -260,6 +493,7 @@ class TestFileOrganizer(unittest.TestCase):
             self.assertIn("file", entry)
             self.assertIn("source", entry)
             self.assertIn("destination", entry)
+            self.assertEqual(entry["size"], 4)
 
     def test_hashing_error(self):
         self.create_file("file.txt")
@@ -287,16 +521,98 @@ class TestFileOrganizer(unittest.TestCase):
         self.assertEqual(stats["duplicates"], 1)
         self.assertEqual(stats["moved"], 0)
 
+    def test_duplicate_detection_uses_hash_cache(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        self.organizer.hash_cache_file = os.path.join(cache_dir, "hashes.sqlite3")
+
+        dest_dir = Path(self.test_dir) / "Images"
+        dest_dir.mkdir()
+        for i in range(3):
+            (dest_dir / f"old{i}.jpg").write_text(f"content {i}")
+
+        # Nothing to compare against: the destination is indexed by size without being read
+        with patch("pro_file_organizer.core.organizer.hash_file_ends", wraps=hash_file_ends) as mock_hash:
+            self.organizer.organize_files(OrganizationOptions(Path(self.test_dir), detect_duplicates=True))
+        self.assertEqual(mock_hash.call_count, 0)
+
+        # A size collision hashes the colliding files only
+        self.create_file("new.jpg", content="content 1")
+        stats = self.organizer.organize_files(OrganizationOptions(Path(self.test_dir), detect_duplicates=True))
+        self.assertEqual(stats["duplicates"], 1)
+        self.assertEqual(len(self.organizer._hash_cache), 4)
+
+        # Unchanged files are served from the cache on the next run
+        with patch("pro_file_organizer.core.organizer.hash_file_ends", wraps=hash_file_ends) as mock_hash:
+            stats = self.organizer.organize_files(OrganizationOptions(Path(self.test_dir), detect_duplicates=True))
+        self.assertEqual(stats["duplicates"], 1)
+        self.assertEqual(mock_hash.call_count, 0)
+
+        # Rebuilding starts from an empty cache and re-hashes the category folders
+        self.assertEqual(self.organizer.rebuild_hash_cache(Path(self.test_dir)), 3)
+        self.assertEqual(len(self.organizer._hash_cache), 3)
+
+    def test_duplicate_detection_same_ends_different_middle(self):
+        block = b"x" * 64 * 1024
+        (Path(self.test_dir) / "Images").mkdir()
+        (Path(self.test_dir) / "Images" / "a.jpg").write_bytes(block + b"A" + block)
+        (Path(self.test_dir) / "b.jpg").write_bytes(block + b"B" + block)
+        (Path(self.test_dir) / "c.jpg").write_bytes(block + b"A" + block)
+
+        stats = self.organizer.organize_files(OrganizationOptions(Path(self.test_dir), detect_duplicates=True))
+        self.assertEqual(stats["moved"], 1)
+        self.assertEqual(stats["duplicates"], 1)
+        dup = next(e for e in stats["report"] if e["status"] == "duplicate")
+        self.assertEqual(dup["file"], "c.jpg")
+        self.assertTrue(dup["duplicate_of"].endswith("a.jpg"))
+
+    def test_duplicate_detection_hash_workers(self):
+        for i in range(20):
+            self.create_file(f"file{i}.txt", content=f"content {i % 7}")
+        (Path(self.test_dir) / "Documents").mkdir()
+        (Path(self.test_dir) / "Documents" / "existing.txt").write_text("content 3")
+
+        stats = self.organizer.organize_files(
+            OrganizationOptions(Path(self.test_dir), detect_duplicates=True, use_hash_cache=False, hash_workers=4)
+        )
+        self.assertEqual(stats["moved"], 6)
+        self.assertEqual(stats["duplicates"], 14)
+        moved = [Path(e["destination"]).read_text() for e in stats["report"] if e["status"] == "moved"]
+        self.assertEqual(sorted(moved), [f"content {i}" for i in (0, 1, 2, 4, 5, 6)])
+
+    def test_hash_cache_opened_once_with_hash_workers(self):
+        rows = []
+        for workers in (1, 4):
+            root = Path(tempfile.mkdtemp())
+            self.addCleanup(shutil.rmtree, root)
+            (root / "Documents").mkdir()
+            for i in range(20):
+                (root / "Documents" / f"old{i}.txt").write_text(f"content {i:02d}")
+                (root / f"new{i}.txt").write_text(f"content {i + 10:02d}")
+            organizer = make_test_organizer(self)
+            organizer.hash_cache_file = root / "cache" / "hashes.sqlite3"
+
+            start = time.perf_counter()
+            stats = organizer.organize_files(OrganizationOptions(root, detect_duplicates=True, hash_workers=workers))
+            elapsed = time.perf_counter() - start
+
+            self.assertEqual(stats["duplicates"], 10)
+            # Workers racing to open the database would each wait out sqlite's 5 s busy timeout
+            self.assertLess(elapsed, 2.0)
+            rows.append(len(organizer._hash_cache))
+            organizer._hash_cache.close()
+        self.assertEqual(rows[0], rows[1])
+
     def test_organize_permission_error(self):
         self.create_file("file.txt")
-        with patch("shutil.move", side_effect=PermissionError("Permission Denied")):
+        with patch("pro_file_organizer.core.organizer.move_no_clobber", side_effect=PermissionError("Denied")):
             stats = self.organizer.organize_files(OrganizationOptions(Path(self.test_dir)))
             self.assertEqual(stats["errors"], 1)
             self.assertEqual(stats["report"][0]["error_type"], "PermissionError")
 
     def test_organize_os_error(self):
         self.create_file("file.txt")
-        with patch("shutil.move", side_effect=OSError("OS Error")):
+        with patch("pro_file_organizer.core.organizer.move_no_clobber", side_effect=OSError("OS Error")):
             stats = self.organizer.organize_files(OrganizationOptions(Path(self.test_dir)))
             self.assertEqual(stats["errors"], 1)
             self.assertEqual(stats["report"][0]["error_type"], "OSError")
@@ -324,6 +640,67 @@ class TestFileOrganizer(unittest.TestCase):
             self.assertTrue((Path(self.test_dir) / "sensitive.txt").exists())
             self.assertFalse((outside_path / "sensitive.txt").exists())
 
+    def test_target_folders_resolved_once(self):
+        for i in range(50):
+            self.create_file(f"doc{i}.txt")
+            self.create_file(f"photo{i}.jpg")
+
+        with patch("pathlib.Path.resolve", autospec=True, side_effect=Path.resolve) as mock_resolve:
+            stats = self.organizer.organize_files(OrganizationOptions(Path(self.test_dir), dry_run=True))
+
+        self.assertEqual(stats["moved"], 100)
+        # The source root, two target folders and the one folder the files come from
+        self.assertEqual(mock_resolve.call_count, 4)
+
+    def test_target_folder_created_once(self):
+        for i in range(20):
+            self.create_file(f"doc{i}.txt")
+        target = Path(self.test_dir) / "Documents"
+
+        with patch("pathlib.Path.mkdir", autospec=True, side_effect=Path.mkdir) as mock_mkdir:
+            stats = self.organizer.organize_files(OrganizationOptions(Path(self.test_dir)))
+
+        self.assertEqual(stats["moved"], 20)
+        self.assertEqual([c.args[0] for c in mock_mkdir.call_args_list].count(target), 1)
+
+    def test_planned_dirs_from_dry_run(self):
+        for name in ("photo.jpg", "doc.pdf"):
+            os.utime(self.create_file(name), (1672574400, 1672574400))  # 2023-01-01
+        root = Path(self.test_dir)
+
+        preview = self.organizer.organize_files(OrganizationOptions(root, date_sort=True, dry_run=True))
+        self.assertEqual(
+            preview["target_dirs"], [root / "Documents" / "2023" / "January", root / "Images" / "2023" / "January"]
+        )
+        self.assertFalse((root / "Images").exists())
+
+        # A stale entry is created and removed again; one outside the source is never created
+        planned = [*preview["target_dirs"], root / "Archives" / "2023" / "January", root / ".." / "outside"]
+        calls = []
+        real_mkdir = os.mkdir
+
+        def mkdir(path, *args, **kwargs):
+            if str(path).startswith(str(root)):
+                calls.append("mkdir")
+            return real_mkdir(path, *args, **kwargs)
+
+        def move(src, dst):
+            calls.append("move")
+            return move_no_clobber(src, dst)
+
+        options = OrganizationOptions(root, date_sort=True, planned_dirs=planned)
+        with patch("os.mkdir", side_effect=mkdir):
+            with patch("pro_file_organizer.core.organizer.move_no_clobber", side_effect=move):
+                stats = self.organizer.organize_files(options)
+
+        self.assertEqual(stats["moved"], 2)
+        self.assertTrue((root / "Images" / "2023" / "January" / "photo.jpg").exists())
+        self.assertTrue((root / "Documents" / "2023" / "January" / "doc.pdf").exists())
+        self.assertFalse((root / "Archives").exists())
+        self.assertFalse((root.parent / "outside").exists())
+        # Folders are made in the up-front pass, never between moves
+        self.assertEqual(calls[calls.index("move") :], ["move", "move"])
+
     def test_safety_hard_stop_undo(self):
         """Tests that undo logic refuses to move files outside the source directory."""
         # 1. Setup a valid move
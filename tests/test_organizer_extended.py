@@ -1,14 +1,16 @@
+import os
 import shutil
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, mock_open, patch
 
-from pro_file_organizer.core.organizer import FileOrganizer, OrganizationOptions
+from pro_file_organizer.core.organizer import OrganizationOptions
+from tests.organizer_test_utils import make_test_organizer
 
 
 class TestOrganizerExtended(unittest.TestCase):
     def setUp(self):
-        self.organizer = FileOrganizer()
+        self.organizer = make_test_organizer(self)
         self.tmp_dir = Path("/tmp/organizer_test_ext")
         if self.tmp_dir.exists():
             shutil.rmtree(self.tmp_dir)
@@ -64,17 +66,18 @@ class TestOrganizerExtended(unittest.TestCase):
     def test_organize_files_date_sort_and_logging(self):
         f = self.tmp_dir / "old.txt"
         f.touch()
+        os.utime(f, (1600000000, 1600000000))
         mock_log = MagicMock()
-        with patch.object(Path, "stat") as mock_stat:
-            mock_stat.return_value.st_mtime = 1600000000
-            self.organizer.organize_files(OrganizationOptions(self.tmp_dir, date_sort=True, log_callback=mock_log))
-            # Verify logging was called
-            mock_log.assert_called()
+        # Date sort reads the mtime captured by the scanner
+        self.organizer.organize_files(OrganizationOptions(self.tmp_dir, date_sort=True, log_callback=mock_log))
+        # Verify logging was called
+        mock_log.assert_called()
+        self.assertTrue((self.tmp_dir / "Documents" / "2020" / "September" / "old.txt").exists())
 
     def test_organize_files_rollback_on_error(self):
         f = self.tmp_dir / "test.txt"
         f.touch()
-        with patch("shutil.move", side_effect=Exception("Move Failed")):
+        with patch("pro_file_organizer.core.organizer.move_no_clobber", side_effect=Exception("Move Failed")):
             result = self.organizer.organize_files(OrganizationOptions(self.tmp_dir, rollback_on_error=True))
             self.assertTrue(result.get("rolled_back", False))
 
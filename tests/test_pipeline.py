@@ -0,0 +1,96 @@
+import threading
+import time
+import unittest
+
+from pro_file_organizer.core.pipeline import BoundedBuffer, StageMeter, lookahead
+
+
+class TestBoundedBuffer(unittest.TestCase):
+    def test_passes_items_in_order(self):
+        buffer = BoundedBuffer(range(100), maxsize=4)
+        self.assertEqual(list(buffer), list(range(100)))
+        self.assertEqual(buffer.produced, 100)
+        self.assertIsNone(buffer.error)
+
+    def test_producer_is_bounded(self):
+        pulled = []
+        release = threading.Event()
+
+        def source():
+            for i in range(50):
+                pulled.append(i)
+                yield i
+            release.set()
+
+        buffer = BoundedBuffer(source(), maxsize=2)
+        it = iter(buffer)
+        self.assertEqual(next(it), 0)
+        # The producer may run ahead by at most the queue size plus the item it is blocked on
+        self.assertFalse(release.wait(0.2))
+        self.assertLessEqual(len(pulled), 5)
+        self.assertEqual(list(it), list(range(1, 50)))
+
+    def test_source_error_is_captured(self):
+        def source():
+            yield 1
+            raise OSError("listing failed")
+
+        buffer = BoundedBuffer(source())
+        self.assertEqual(list(buffer), [1])
+        self.assertIsInstance(buffer.error, OSError)
+
+    def test_early_close_stops_producer(self):
+        def endless():
+            i = 0
+            while True:
+                yield i
+                i += 1
+
+        buffer = BoundedBuffer(endless(), maxsize=1)
+        for item in buffer:
+            if item == 3:
+                break
+        buffer._thread.join(timeout=2)
+        self.assertFalse(buffer._thread.is_alive())
+
+
+class TestLookahead(unittest.TestCase):
+    def test_window_runs_ahead_of_consumer(self):
+        entered = []
+        seen = []
+        for item in lookahead(range(10), 3, entered.append):
+            seen.append(item)
+            # Items up to three ahead of the consumer have already entered the window
+            self.assertEqual(entered[-1], min(item + 3, 9))
+        self.assertEqual(seen, list(range(10)))
+
+
+class TestStageMeter(unittest.TestCase):
+    def test_producer_and_consumer(self):
+        produced = StageMeter()
+        consumed = StageMeter()
+
+        def source():
+            for i in range(3):
+                time.sleep(0.01)
+                yield i
+
+        for _ in consumed.consumer(produced.producer(source())):
+            time.sleep(0.02)
+
+        self.assertEqual(produced.items, 3)
+        self.assertEqual(consumed.items, 3)
+        self.assertGreaterEqual(produced.seconds, 0.03)
+        self.assertGreaterEqual(consumed.seconds, 0.06)
+
+    def test_as_dict(self):
+        meter = StageMeter()
+        self.assertEqual(meter.as_dict(), {"items": 0, "seconds": 0.0, "per_second": 0.0})
+        with meter.measure(items=4):
+            pass
+        meter.add(0, 2.0 - meter.seconds)
+        self.assertEqual(meter.as_dict(), {"items": 4, "seconds": 2.0, "per_second": 2.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import random
+import unittest
+from pathlib import Path
+
+from pro_file_organizer.ui.preview_index import PreviewIndex
+
+
+def naive_refresh(entries, threshold, sort_key, hidden):
+    """The straightforward re-categorize, sort and filter over every entry."""
+    rows = []
+    for i, e in enumerate(entries):
+        if e.get("ai_category") and e.get("ai_confidence", 0.0) >= threshold:
+            rows.append((i, e["ai_category"], e["ai_confidence"]))
+        else:
+            rows.append((i, e.get("ext_category", "Others"), 1.0))
+    if sort_key == "name":
+        rows.sort(key=lambda r: entries[r[0]]["file"].lower())
+    elif sort_key == "confidence":
+        rows.sort(key=lambda r: r[2], reverse=True)
+    elif sort_key == "type":
+        rows.sort(key=lambda r: r[1])
+    return [r[0] for r in rows if r[1].split("/")[0] not in hidden], {r[0]: r[1] for r in rows}
+
+
+class TestPreviewIndex(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.entries = []
+        for i in range(500):
+            entry = {"file": f"{rng.choice('abcXYZ')}{i}.txt", "ext_category": rng.choice(["Documents", "Others"])}
+            if rng.random() < 0.7:
+                entry["ai_category"] = rng.choice(["Images/Personal", "Images/Screens", "Documents/Work"])
+                entry["ai_confidence"] = rng.choice([0.1, 0.3, 0.5, 0.5, 0.75, 0.9, 1.0])
+            self.entries.append(entry)
+        self.index = PreviewIndex(Path("/src"), self.entries)
+
+    def test_matches_full_refresh(self):
+        for threshold in [0.5, 0.9, 0.0, 0.3, 1.0, 0.75]:
+            self.index.set_threshold(threshold)
+            for sort_key in ["none", "name", "confidence", "type"]:
+                for hidden in [set(), {"Images"}, {"Documents", "Others"}]:
+                    expected, categories = naive_refresh(self.entries, threshold, sort_key, hidden)
+                    order = self.index.order(sort_key, hidden)
+                    self.assertEqual(order if order is not None else list(range(len(self.entries))), expected)
+            self.assertEqual({r: self.index.category(r) for r in range(len(self.entries))}, categories)
+
+            counts = {}
+            for category in categories.values():
+                counts[category.split("/")[0]] = counts.get(category.split("/")[0], 0) + 1
+            self.assertEqual(self.index.category_counts(), counts)
+
+    def test_threshold_returns_only_flipped_rows(self):
+        self.index.set_threshold(0.5)
+        before = {r: self.index.category(r) for r in range(len(self.entries))}
+        changed = self.index.set_threshold(0.8)
+        after = {r: self.index.category(r) for r in range(len(self.entries))}
+
+        self.assertEqual(sorted(changed), [r for r in before if before[r] != after[r]])
+        self.assertTrue(all(0.5 <= self.entries[r]["ai_confidence"] < 0.8 for r in changed))
+        self.assertEqual(self.index.set_threshold(0.8), [])
+
+    def test_first_pass_compares_with_emitted_rows(self):
+        entries = [
+            {
+                "file": "a.jpg",
+                "ext_category": "Images",
+                "ai_category": "Images/Personal",
+                "ai_confidence": 0.9,
+                "method": "image-ml",
+                "ai_method": "image-ml",
+            },
+            {"file": "b.jpg", "ext_category": "Images", "ai_category": "Images/Personal", "ai_confidence": 0.2},
+        ]
+        index = PreviewIndex(Path("/src"), entries)
+        # a.jpg was already shown under its AI category at the run's threshold
+        self.assertEqual(index.set_threshold(0.3), [])
+        self.assertEqual(index.set_threshold(0.1), [1])
+        self.assertEqual(index.entry(0)["method"], "image-ml")
+        self.assertEqual(index.entry(1)["destination"], str(Path("/src/Images/Personal/b.jpg")))
+        self.assertEqual(index.ai_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
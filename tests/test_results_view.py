@@ -0,0 +1,105 @@
+import importlib
+import sys
+import unittest
+
+from tests.ui_test_utils import get_pyside_mocks
+
+# Apply standardized mocks
+mock_qtwidgets, mock_qtcore, mock_qtgui = get_pyside_mocks()
+sys.modules["PySide6.QtWidgets"] = mock_qtwidgets
+sys.modules["PySide6.QtCore"] = mock_qtcore
+sys.modules["PySide6.QtGui"] = mock_qtgui
+
+import pro_file_organizer.ui.components.results_view  # noqa: E402
+
+importlib.reload(pro_file_organizer.ui.components.results_view)
+from pro_file_organizer.ui.components.results_view import ResultsModel, ResultStore  # noqa: E402
+
+
+class TestResultStore(unittest.TestCase):
+    def test_columns_and_details(self):
+        store = ResultStore()
+        store.append({"file": "a.jpg", "destination": "/src/Images/a.jpg", "category": "Images"})
+        store.append({"file": "b.jpg", "destination": "/src/Images/b_1.jpg", "category": "Images"})
+        store.append({"file": "c.txt", "type": "error", "error": "Access Denied"})
+        store.append({"file": "d.txt", "type": "duplicate", "duplicate_of": "/src/Documents/orig.txt"})
+        store.append({"file": "e.png", "method": "image-ml", "confidence": 0.85, "category": "Images/Personal"})
+
+        self.assertEqual(len(store), 5)
+        self.assertEqual(store.detail(0), "→ Images/a.jpg")
+        # Only the renamed destination is stored separately
+        self.assertEqual(store.detail(1), "→ Images/b_1.jpg")
+        self.assertEqual(store.renamed, {1: "b_1.jpg"})
+        self.assertEqual(store.detail(2), "Error: Access Denied")
+        self.assertEqual(store.detail(3), "Duplicate of: orig.txt")
+
+        self.assertEqual(store.style(0)[1], "EXT")
+        self.assertEqual(store.style(2)[1], "ERR")
+        self.assertEqual(store.style(3)[1], "DUP")
+        self.assertEqual(store.style(4)[1], "AI 85%")
+        self.assertEqual(store.event(4)["category"], "Images/Personal")
+
+        # Repeated categories and folders are stored once
+        self.assertEqual(store.categories[0], store.categories[1])
+        self.assertEqual(store.details[0], store.details[1])
+
+    def test_clear(self):
+        store = ResultStore()
+        store.append({"file": "a.jpg"})
+        store.clear()
+        self.assertEqual(len(store), 0)
+        self.assertEqual(store.strings, [])
+
+
+class TestResultsModel(unittest.TestCase):
+    def setUp(self):
+        self.model = ResultsModel()
+
+    def test_bulk_append_is_one_insert(self):
+        self.model.append_events({"file": f"f{i}.txt"} for i in range(1000))
+        self.assertEqual(self.model.rowCount(), 1000)
+        self.assertEqual(self.model.notifications, [("insert", 0, 999)])
+
+        self.model.append_events([])
+        self.assertEqual(len(self.model.notifications), 1)
+
+    def test_order_sorts_and_filters_without_copying_rows(self):
+        self.model.append_events([{"file": "b"}, {"file": "c"}, {"file": "a"}])
+        self.model.set_order([2, 0])
+        self.assertEqual(self.model.rowCount(), 2)
+        display = mock_qtcore.Qt.ItemDataRole.DisplayRole
+        self.assertEqual([self.model.data(self.model.index(r), display) for r in range(2)], ["a", "b"])
+
+        # New rows go to the end of the current order
+        self.model.append_events([{"file": "d"}])
+        self.assertEqual(self.model.data(self.model.index(2), display), "d")
+
+        self.model.set_order(None)
+        self.assertEqual(self.model.rowCount(), 4)
+
+    def test_update_events_in_place(self):
+        self.model.append_events([{"file": "a.jpg", "destination": "/s/Images/a.jpg"}, {"file": "b.txt"}])
+        self.model.update_events({0: {"file": "a.jpg", "destination": "/s/Images/Personal/a.jpg", "method": "ml", "confidence": 0.8}})
+        self.assertEqual(self.model.rowCount(), 2)
+        self.assertEqual(self.model.store.detail(0), "→ Personal/a.jpg")
+        self.assertEqual(self.model.store.style(0)[1], "AI 80%")
+        self.model.dataChanged.emit.assert_called_once()
+
+    def test_roles_and_executed(self):
+        self.model.append_events([{"file": "a.txt", "type": "error", "error": "boom"}])
+        index = self.model.index(0)
+        self.assertEqual(self.model.data(index, ResultsModel.BadgeRole), "ERR")
+        self.assertEqual(self.model.data(index, ResultsModel.DetailRole), "Error: boom")
+        self.assertFalse(self.model.data(index, ResultsModel.ExecutedRole))
+
+        self.model.set_executed()
+        self.assertTrue(self.model.data(index, ResultsModel.ExecutedRole))
+        self.model.dataChanged.emit.assert_called_once()
+
+        self.model.clear()
+        self.assertEqual(self.model.rowCount(), 0)
+        self.assertFalse(self.model.executed)
+
+
+if __name__ == "__main__":
+    unittest.main()
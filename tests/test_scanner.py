@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from pro_file_organizer.core.scanner import FileRecord, ParallelWalker, list_dir, walk_records
+
+
+class TestScanner(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def create_file(self, rel, content="test"):
+        path = self.test_dir / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        return path
+
+    def test_record_carries_stat_data(self):
+        f = self.create_file("photo.JPG", content="12345")
+        ts = 1672574400
+        os.utime(f, (ts, ts))
+
+        files, subdirs = list_dir(self.test_dir)
+        self.assertEqual(subdirs, [])
+        self.assertEqual(len(files), 1)
+
+        record = files[0]
+        st = f.stat()
+        self.assertEqual(record.name, "photo.JPG")
+        self.assertEqual(record.parent, str(self.test_dir))
+        self.assertEqual(record.path, f)
+        self.assertEqual(record.suffix, ".JPG")
+        self.assertEqual(record.size, 5)
+        self.assertEqual(record.mtime, ts)
+        self.assertEqual(record.inode, st.st_ino)
+        self.assertEqual(record.device, st.st_dev)
+        self.assertEqual(record, FileRecord.from_path(f))
+
+    def test_list_dir_exclusions(self):
+        self.create_file("keep.txt")
+        self.create_file("skip.tmp")
+        self.create_file("Thumbs.db")
+        self.create_file("sub/inner.txt")
+        self.create_file(".git/config")
+
+        files, subdirs = list_dir(self.test_dir, {".git"}, {"Thumbs.db"}, {".tmp"})
+        self.assertEqual([r.name for r in files], ["keep.txt"])
+        self.assertEqual(subdirs, [str(self.test_dir / "sub")])
+
+    def test_walk_matches_os_walk_order(self):
+        for rel in ["a.txt", "x/b.txt", "x/y/c.txt", "z/d.txt", "node_modules/e.js"]:
+            self.create_file(rel)
+
+        expected = []
+        for root, dirs, files in os.walk(self.test_dir):
+            dirs[:] = [d for d in dirs if d != "node_modules"]
+            expected.extend(Path(root) / f for f in files)
+
+        records = list(walk_records(self.test_dir, {"node_modules"}))
+        self.assertEqual([r.path for r in records], expected)
+
+    def test_walk_missing_root(self):
+        self.assertEqual(list(walk_records(self.test_dir / "missing")), [])
+
+    def test_parallel_walker_matches_serial_order(self):
+        for a in range(4):
+            for b in range(3):
+                self.create_file(f"d{a}/e{b}/f.txt")
+                self.create_file(f"d{a}/e{b}/skip.tmp")
+            self.create_file(f"d{a}/top{a}.jpg")
+        self.create_file(".git/objects/blob")
+        self.create_file("root.md")
+
+        exclusions = ({".git"}, set(), {".tmp"})
+        serial = [r.path for r in walk_records(self.test_dir, *exclusions)]
+        for workers in (1, 2, 8):
+            with self.subTest(workers=workers):
+                parallel = [r.path for r in ParallelWalker(self.test_dir, workers, *exclusions)]
+                self.assertEqual(parallel, serial)
+        self.assertEqual(len(serial), 17)
+
+    def test_parallel_walker_bounds_buffered_listings(self):
+        for a in range(10):
+            for b in range(10):
+                self.create_file(f"d{a}/e{b}/f.txt")
+        serial = [r.path for r in walk_records(self.test_dir)]
+
+        walker = ParallelWalker(self.test_dir, 4, max_listings=3)
+        parallel = []
+        buffered = []
+        for record in walker:
+            # A slow consumer: the workers would otherwise list the whole tree ahead of it
+            time.sleep(0.002)
+            buffered.append(len(walker._results))
+            parallel.append(record.path)
+
+        self.assertEqual(parallel, serial)
+        # Workers that passed the check together may each add one more
+        self.assertLessEqual(max(buffered), 3 + 4)
+
+    def test_parallel_walker_early_close(self):
+        for i in range(20):
+            self.create_file(f"d{i}/f.txt")
+        walker = ParallelWalker(self.test_dir, 4)
+        it = iter(walker)
+        next(it)
+        it.close()
+        self.assertTrue(walker._stop.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
 import importlib
 import sys
+import tempfile
 import unittest
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 from tests.ui_test_utils import get_pyside_mocks
@@ -20,6 +22,7 @@ import pro_file_organizer.ui.main_window
 
 importlib.reload(pro_file_organizer.ui.main_window)
 from pro_file_organizer.ui.main_window import OrganizerApp
+from pro_file_organizer.ui.startup import ImportTimer, format_startup_report
 
 
 class TestStartupRegression(unittest.TestCase):
@@ -39,6 +42,45 @@ class TestStartupRegression(unittest.TestCase):
         except Exception as e:
             self.fail(f"OrganizerApp failed to initialize due to unexpected error: {e}")
 
+    @patch("pro_file_organizer.ui.main_window.FileOrganizer")
+    @patch("pro_file_organizer.ui.main_window.MultimodalFileOrganizer")
+    def test_ml_organizer_created_on_first_use(self, mock_ml, mock_org):
+        mock_org.return_value.get_theme_mode.return_value = "System"
+
+        app = OrganizerApp()
+        mock_org.assert_called_once_with(defer_state=True)
+        mock_ml.assert_not_called()
+
+        self.assertIs(app.controller.ml_organizer, mock_ml.return_value)
+        self.assertIs(app.ml_organizer, mock_ml.return_value)
+        mock_ml.assert_called_once()
+
+
+class TestImportTimer(unittest.TestCase):
+    def test_records_inclusive_and_self_time(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            Path(tmp, "startup_probe_outer.py").write_text("import time\nimport startup_probe_inner\ntime.sleep(0.02)\n")
+            Path(tmp, "startup_probe_inner.py").write_text("import time\ntime.sleep(0.05)\n")
+            sys.path.insert(0, tmp)
+            timer = ImportTimer()
+            timer.install()
+            try:
+                importlib.import_module("startup_probe_outer")
+            finally:
+                timer.uninstall()
+                sys.path.remove(tmp)
+                sys.modules.pop("startup_probe_outer", None)
+                sys.modules.pop("startup_probe_inner", None)
+
+        timings = {name: (inclusive, own) for name, inclusive, own in timer.timings}
+        self.assertNotIn(timer, sys.meta_path)
+        self.assertGreaterEqual(timings["startup_probe_inner"][0], 0.05)
+        self.assertGreaterEqual(timings["startup_probe_outer"][0], 0.07)
+        # The inner module's time is not counted as the outer module's own time
+        self.assertLess(timings["startup_probe_outer"][1], timings["startup_probe_outer"][0] - 0.04)
+        self.assertEqual(timer.slowest(1)[0][0], "startup_probe_outer")
+        self.assertIn("startup_probe_inner", format_startup_report(timer, 0.1, 0.05, 0.2))
+
 
 if __name__ == "__main__":
     unittest.main()
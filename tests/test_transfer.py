@@ -0,0 +1,313 @@
+import errno
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+from pro_file_organizer.core import transfer
+from pro_file_organizer.core.organizer import OrganizationOptions
+from pro_file_organizer.core.transfer import MoveExecutor, NameIndex, copy_file_noreplace, move_no_clobber
+from tests.organizer_test_utils import make_test_organizer
+
+
+class TestNameIndex(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_reserve_matches_suffix_scheme(self):
+        (self.test_dir / "IMG_0001.jpg").touch()
+        (self.test_dir / "IMG_0001_2.jpg").touch()
+        names = NameIndex()
+        target = self.test_dir / "IMG_0001.jpg"
+
+        reserved = [names.reserve(target).name for _ in range(4)]
+
+        self.assertEqual(reserved, ["IMG_0001_1.jpg", "IMG_0001_3.jpg", "IMG_0001_4.jpg", "IMG_0001_5.jpg"])
+        self.assertEqual(names.reserve(self.test_dir / "other.jpg").name, "other.jpg")
+        self.assertEqual(names.reserve(self.test_dir / "missing" / "a.txt").name, "a.txt")
+
+    def test_directory_listed_once(self):
+        for i in range(3):
+            (self.test_dir / f"dup_{i}.txt").touch()
+        (self.test_dir / "dup.txt").touch()
+        names = NameIndex()
+        with patch("pro_file_organizer.core.transfer.os.scandir", wraps=os.scandir) as scandir:
+            reserved = {names.reserve(self.test_dir / "dup.txt") for _ in range(1000)}
+        self.assertEqual(scandir.call_count, 1)
+        self.assertEqual(len(reserved), 1000)
+
+    def test_release(self):
+        names = NameIndex()
+        path = names.reserve(self.test_dir / "a.txt")
+        names.release(path)
+        self.assertEqual(names.reserve(self.test_dir / "a.txt"), path)
+
+
+class TestMoveNoClobber(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.src = self.test_dir / "src.txt"
+        self.src.write_text("new")
+        self.dst = self.test_dir / "dst.txt"
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def assert_moves_without_clobbering(self):
+        self.dst.write_text("existing")
+        with self.assertRaises(FileExistsError):
+            move_no_clobber(self.src, self.dst)
+        self.assertEqual(self.dst.read_text(), "existing")
+        self.assertEqual(self.src.read_text(), "new")
+
+        other = self.test_dir / "other.txt"
+        move_no_clobber(self.src, other)
+        self.assertFalse(self.src.exists())
+        self.assertEqual(other.read_text(), "new")
+
+    def test_move(self):
+        self.assert_moves_without_clobbering()
+
+    def test_link_fallback(self):
+        with patch("pro_file_organizer.core.transfer._load_renameat2", return_value=None):
+            self.assert_moves_without_clobbering()
+
+    def test_cross_device_fallback(self):
+        exdev = OSError(errno.EXDEV, "Invalid cross-device link")
+        with patch("pro_file_organizer.core.transfer._load_renameat2", return_value=None):
+            with patch("pro_file_organizer.core.transfer.os.link", side_effect=exdev):
+                self.assert_moves_without_clobbering()
+
+    def test_cross_device_copy_failure_frees_name(self):
+        with patch.object(transfer, "_rename_noreplace", return_value=False):
+            with patch.object(transfer, "_link_noreplace", return_value=False):
+                with patch.object(transfer, "_copy_contents", side_effect=OSError("disk full")):
+                    with self.assertRaises(OSError):
+                        move_no_clobber(self.src, self.dst)
+        self.assertFalse(self.dst.exists())
+        self.assertTrue(self.src.exists())
+
+
+class TestCopyFileNoreplace(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.src = self.test_dir / "src.bin"
+        # Spans several chunks and a partial last one
+        self.data = os.urandom(transfer.COPY_CHUNK * 2 + 12345)
+        self.src.write_bytes(self.data)
+        self.src.chmod(0o640)
+        os.utime(self.src, ns=(1_600_000_000_000_000_000, 1_600_000_000_123_456_789))
+        self.dst = self.test_dir / "dst.bin"
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def assert_copied(self, method: str):
+        with patch.object(transfer, "COPY_MAX_CALL", transfer.COPY_CHUNK):
+            self.assertEqual(copy_file_noreplace(self.src, self.dst), method)
+        self.assertEqual(self.dst.read_bytes(), self.data)
+        self.assertEqual(self.dst.stat().st_mode & 0o777, 0o640)
+        self.assertEqual(self.dst.stat().st_mtime_ns, self.src.stat().st_mtime_ns)
+
+    def test_fallback_chain(self):
+        unsupported = OSError(errno.EXDEV, "Invalid cross-device link")
+        with patch.object(transfer, "_clone", return_value=False):
+            if hasattr(os, "copy_file_range"):
+                self.assert_copied("copy_file_range")
+                self.dst.unlink()
+            with patch("pro_file_organizer.core.transfer.os.copy_file_range", side_effect=unsupported, create=True):
+                if sys.platform.startswith("linux"):
+                    self.assert_copied("sendfile")
+                    self.dst.unlink()
+                with patch("pro_file_organizer.core.transfer.os.sendfile", side_effect=unsupported, create=True):
+                    self.assert_copied("chunked")
+
+    def test_empty_file(self):
+        self.src.write_bytes(b"")
+        self.assertEqual(copy_file_noreplace(self.src, self.dst), "empty")
+        self.assertEqual(self.dst.read_bytes(), b"")
+
+    def test_short_copy_is_removed(self):
+        def short_copy(src_fd, dst_fd, size):
+            os.write(dst_fd, os.read(src_fd, size // 2))
+            return "chunked"
+
+        with patch.object(transfer, "_copy_contents", side_effect=short_copy):
+            with self.assertRaises(OSError):
+                copy_file_noreplace(self.src, self.dst)
+        self.assertFalse(self.dst.exists())
+        self.assertEqual(self.src.read_bytes(), self.data)
+
+    def test_does_not_replace(self):
+        self.dst.write_bytes(b"existing")
+        with self.assertRaises(FileExistsError):
+            copy_file_noreplace(self.src, self.dst)
+        self.assertEqual(self.dst.read_bytes(), b"existing")
+
+
+class TestMoveExecutor(unittest.TestCase):
+    def test_results_in_submission_order_with_device_limit(self):
+        lock = threading.Lock()
+        active: dict[int, int] = {}
+        peak: dict[int, int] = {}
+
+        def fake_move(src, dst):
+            device = src % 2
+            with lock:
+                active[device] = active.get(device, 0) + 1
+                peak[device] = max(peak.get(device, 0), active[device])
+            # Later moves finish first
+            time.sleep(0.002 * (20 - src))
+            with lock:
+                active[device] -= 1
+            if src == 7:
+                raise PermissionError("in use")
+
+        mover = MoveExecutor(workers=8, per_device=2, move=fake_move)
+        for i in range(20):
+            mover.submit(i, None, (i % 2, i % 2), size=1_000_000, tag=i)
+        results = list(mover.results(wait=True))
+        mover.close()
+
+        self.assertEqual([tag for tag, _ in results], list(range(20)))
+        self.assertIsInstance(results[7][1], PermissionError)
+        self.assertEqual(sum(error is None for _, error in results), 19)
+        self.assertEqual(peak, {0: 2, 1: 2})
+        stats = mover.as_dict()
+        self.assertEqual((stats["files"], stats["bytes"]), (19, 19_000_000))
+        self.assertGreater(stats["files_per_second"], 0)
+        self.assertGreater(stats["mb_per_second"], 0)
+
+    def test_waits_for_moves_of_a_size(self):
+        release = threading.Event()
+        mover = MoveExecutor(workers=2, move=lambda src, dst: release.wait(5) if src == "slow" else None)
+        mover.submit("slow", None, (1, 1), size=10, tag="slow")
+        mover.submit("fast", None, (1, 1), size=20, tag="fast")
+
+        self.assertEqual(list(mover.results()), [])
+        self.assertTrue(mover.in_flight(10))
+        release.set()
+        self.assertEqual([tag for tag, _ in mover.results(size=10)], ["slow", "fast"])
+        self.assertFalse(mover.in_flight(10))
+        mover.close()
+
+
+class TestOrganizerCollisions(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.organizer = make_test_organizer(self)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_name_taken_after_listing(self):
+        (self.test_dir / "a.txt").write_text("mine")
+        (self.test_dir / "Documents").mkdir()
+        reserve = NameIndex.reserve
+
+        def reserve_then_race(names, path):
+            reserved = reserve(names, path)
+            if reserved.name == "a.txt":
+                # Another process creates the file between the listing and the move
+                reserved.write_text("theirs")
+            return reserved
+
+        with patch.object(NameIndex, "reserve", autospec=True, side_effect=reserve_then_race):
+            stats = self.organizer.organize_files(OrganizationOptions(self.test_dir))
+
+        self.assertEqual(stats["moved"], 1)
+        self.assertEqual((self.test_dir / "Documents" / "a.txt").read_text(), "theirs")
+        self.assertEqual((self.test_dir / "Documents" / "a_1.txt").read_text(), "mine")
+
+        # Undo puts ours back and leaves theirs alone
+        self.organizer.undo_changes()
+        self.assertEqual((self.test_dir / "a.txt").read_text(), "mine")
+        self.assertEqual((self.test_dir / "Documents" / "a.txt").read_text(), "theirs")
+
+    def test_moved_out_name_is_free_again(self):
+        january = self.test_dir / "Documents" / "2023" / "January"
+        january.mkdir(parents=True)
+        (self.test_dir / "other").mkdir()
+        paths = [self.test_dir / "first.txt", january / "a.txt", self.test_dir / "other" / "a.txt"]
+        for path, month in zip(paths, (1, 3, 1)):
+            path.write_text(path.parent.name)
+            stamp = datetime(2023 if month == 1 else 2024, month, 15).timestamp()
+            os.utime(path, (stamp, stamp))
+
+        # first.txt lists January; a.txt then leaves it for 2024/March, and other/a.txt takes its name
+        stats = self.organizer.organize_paths(paths, OrganizationOptions(self.test_dir, date_sort=True, recursive=True))
+
+        self.assertEqual(stats["renamed"], 0)
+        self.assertEqual((january / "a.txt").read_text(), "other")
+        self.assertEqual((self.test_dir / "Documents" / "2024" / "March" / "a.txt").read_text(), "January")
+
+    def test_parallel_moves_match_serial_run(self):
+        def build(root: Path):
+            for folder in range(6):
+                for i in range(10):
+                    path = root / f"in{folder}" / f"doc{i}.txt"
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    path.write_text(f"{folder}-{i}")
+            (root / "in0" / "copy.txt").write_text("0-0")
+
+        runs = []
+        for workers in (1, 4):
+            root = self.test_dir / f"run{workers}"
+            build(root)
+            options = OrganizationOptions(root, recursive=True, detect_duplicates=True, move_workers=workers)
+            stats = make_test_organizer(self).organize_files(options)
+            report = [
+                (e["status"], Path(e["source"]).relative_to(root), Path(e.get("destination", root)).relative_to(root))
+                for e in stats["report"]
+            ]
+            contents = {p.relative_to(root): p.read_text() for p in root.rglob("*.txt")}
+            runs.append((stats["moved"], stats["duplicates"], report, contents))
+            self.assertEqual(stats["transfer"]["files"], stats["moved"])
+
+        self.assertEqual(runs[0], runs[1])
+        self.assertEqual(runs[1][:2], (60, 1))
+
+    def test_parallel_hashes_and_moves_match_serial_run(self):
+        # Large enough to need full hashes; prefetch must not hash the original while it is being moved
+        content = os.urandom(50 * 1024)
+        for run in range(5):
+            for workers in (1, 4):
+                root = self.test_dir / f"run{run}-{workers}"
+                root.mkdir()
+                for i in range(20):
+                    (root / f"copy{i:02}.bin").write_bytes(content)
+                options = OrganizationOptions(
+                    root, detect_duplicates=True, use_hash_cache=False, hash_workers=workers, move_workers=workers
+                )
+                stats = make_test_organizer(self).organize_files(options)
+                self.assertEqual((stats["moved"], stats["duplicates"], stats["errors"]), (1, 19, 0))
+
+    def test_parallel_rollback_undoes_moves_in_flight(self):
+        for i in range(20):
+            (self.test_dir / f"f{i}.txt").write_text(str(i))
+
+        def failing_move(src, dst):
+            if Path(src).name == "f5.txt":
+                raise PermissionError("in use")
+            move_no_clobber(src, dst)
+
+        options = OrganizationOptions(self.test_dir, rollback_on_error=True, move_workers=4)
+        with patch("pro_file_organizer.core.organizer.move_no_clobber", side_effect=failing_move):
+            stats = self.organizer.organize_files(options)
+
+        self.assertTrue(stats["rolled_back"])
+        self.assertEqual(sorted(p.name for p in self.test_dir.rglob("*.txt")), sorted(f"f{i}.txt" for i in range(20)))
+        self.assertEqual(list(self.test_dir.glob("*/*.txt")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,7 +16,6 @@ import pro_file_organizer.ui.components.ui_components  # noqa: E402
 
 importlib.reload(pro_file_organizer.ui.components.ui_components)
 from pro_file_organizer.ui.components.ui_components import (  # noqa: E402
-    FileCard,
     ModelDownloadModal,
     RedirectedStderr,
 )
@@ -26,24 +25,6 @@ class TestUIComponents(unittest.TestCase):
     def setUp(self):
         self.mock_parent = MagicMock()
 
-    def test_file_card_init_variations(self):
-        # AI Method
-        data = {"file": "test.png", "method": "image-ml", "confidence": 0.85, "destination": "/tmp/dest/file.png"}
-        card = FileCard(data, self.mock_parent)
-        self.assertEqual(card.lbl_badge.text.return_value, "AI 85%")
-
-        # Error type
-        data = {"file": "error.txt", "type": "error", "error": "Access Denied"}
-        card = FileCard(data, self.mock_parent)
-        self.assertEqual(card.lbl_badge.text.return_value, "ERR")
-        self.assertIn("Access Denied", card.lbl_dest.text.return_value)
-
-        # Path exception in dest display
-        patch_path = "pro_file_organizer.ui.components.ui_components.Path"
-        with patch(patch_path, side_effect=Exception("Path error")):
-            card = FileCard({"file": "f.txt", "destination": "dest"}, self.mock_parent)
-            self.assertEqual(card.lbl_dest.text.return_value, "→ dest")
-
     def test_redirected_stderr_logic(self):
         signals = MagicMock()
         redirector = RedirectedStderr(signals)
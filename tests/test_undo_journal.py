@@ -0,0 +1,223 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from pro_file_organizer.core.organizer import FileOrganizer, OrganizationOptions
+from pro_file_organizer.core.transfer import move_no_clobber
+from pro_file_organizer.core.undo_journal import UndoJournal
+
+# Organizes argv[2] with the journal in argv[1] and kills the process during the third move
+_CRASHING_RUN = """
+import os, sys
+from pathlib import Path
+from unittest.mock import patch
+from pro_file_organizer.core.organizer import FileOrganizer, OrganizationOptions
+from pro_file_organizer.core.transfer import move_no_clobber
+from pro_file_organizer.core.undo_journal import UndoJournal
+
+organizer = FileOrganizer()
+organizer.undo_journal = UndoJournal(sys.argv[1])
+real_move = move_no_clobber
+moves = []
+
+def crashing_move(src, dst):
+    moves.append(src)
+    if len(moves) == 3:
+        os._exit(9)
+    return real_move(src, dst)
+
+with patch("pro_file_organizer.core.organizer.move_no_clobber", crashing_move):
+    organizer.organize_files(OrganizationOptions(Path(sys.argv[2])))
+"""
+
+
+class TestUndoJournal(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(tempfile.mkdtemp())
+        self.source = self.test_dir / "source"
+        self.source.mkdir()
+        self.journal = UndoJournal(self.test_dir / "journal", legacy_file=self.test_dir / "undo_stack.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_segment_roundtrip(self):
+        run = self.journal.begin_run(self.source)
+        moves = [
+            (self.source / "Images" / "a.jpg", self.source / "a.jpg"),
+            (self.source / "Docs" / "b.txt", self.source / "sub" / "b.txt"),
+            (Path("/elsewhere/c.txt"), self.source / "c.txt"),
+        ]
+        for new_path, original_path in moves:
+            run.append(new_path, original_path)
+        run.close()
+
+        self.journal.save_index([{"source_path": self.source, "segment": run.segment, "moves": run.moves}])
+        runs = self.journal.load_index()
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(runs[0]["moves"], 3)
+        self.assertNotIn("history", runs[0])
+        self.assertEqual(self.journal.read_history(runs[0]), moves)
+
+        # Paths inside the source folder are stored relative to it
+        self.assertIn('["Images/a.jpg", "a.jpg"]', run.segment.read_text())
+
+    def test_migrates_legacy_undo_stack(self):
+        legacy = [
+            {
+                "history": [[str(self.source / "Docs" / "a.txt"), str(self.source / "a.txt")]],
+                "source_path": str(self.source),
+            }
+        ]
+        (self.test_dir / "undo_stack.json").write_text(json.dumps(legacy))
+
+        runs = self.journal.load_index()
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(self.journal.read_history(runs[0]), [(self.source / "Docs" / "a.txt", self.source / "a.txt")])
+        self.assertFalse((self.test_dir / "undo_stack.json").exists())
+        self.assertTrue((self.test_dir / "undo_stack.json.migrated").exists())
+
+    def test_organizer_undo_after_restart(self):
+        (self.source / "a.jpg").write_text("a")
+        (self.source / "b.txt").write_text("b")
+
+        organizer = FileOrganizer()
+        organizer.undo_journal = self.journal
+        organizer._load_undo_stack()
+        organizer.organize_files(OrganizationOptions(self.source))
+
+        restarted = FileOrganizer()
+        restarted.undo_journal = self.journal
+        with patch.object(UndoJournal, "read_history", wraps=self.journal.read_history) as read_history:
+            restarted._load_undo_stack()
+            self.assertEqual(len(restarted.undo_stack), 1)
+            read_history.assert_not_called()
+
+            self.assertEqual(restarted.undo_changes(), 2)
+            read_history.assert_called_once()
+
+        self.assertTrue((self.source / "a.jpg").exists())
+        self.assertTrue((self.source / "b.txt").exists())
+        self.assertEqual(self.journal.load_index(), [])
+        self.assertEqual(list((self.test_dir / "journal").glob("run-*.jsonl")), [])
+
+    def test_trims_to_max_undo_stack(self):
+        organizer = FileOrganizer()
+        organizer.undo_journal = self.journal
+        organizer._load_undo_stack()
+        organizer.max_undo_stack = 2
+        for i in range(3):
+            (self.source / f"f{i}.txt").write_text("x")
+            organizer.organize_files(OrganizationOptions(self.source))
+
+        self.assertEqual(len(organizer.undo_stack), 2)
+        self.assertEqual(len(list((self.test_dir / "journal").glob("run-*.jsonl"))), 2)
+
+    def test_rollback_discards_segment(self):
+        (self.source / "a.txt").write_text("a")
+        (self.source / "b.txt").write_text("b")
+        organizer = FileOrganizer()
+        organizer.undo_journal = self.journal
+        organizer._load_undo_stack()
+
+        real_move = move_no_clobber
+        calls = []
+
+        def flaky_move(src, dst):
+            calls.append(src)
+            if len(calls) == 2:
+                raise OSError("disk gone")
+            return real_move(src, dst)
+
+        with patch("pro_file_organizer.core.organizer.move_no_clobber", side_effect=flaky_move):
+            result = organizer.organize_files(OrganizationOptions(self.source, rollback_on_error=True))
+        self.assertTrue(result["rolled_back"])
+        self.assertEqual(organizer.undo_stack, [])
+        self.assertEqual(list((self.test_dir / "journal").glob("run-*.jsonl")), [])
+
+    def test_group_commit(self):
+        journal = UndoJournal(self.test_dir / "journal", sync_every=10, sync_interval_ms=60_000)
+        run = journal.begin_run(self.source)
+        with patch("pro_file_organizer.core.undo_journal.os.fsync") as fsync:
+            for i in range(25):
+                run.append(self.source / "Docs" / f"{i}.txt", self.source / f"{i}.txt")
+            self.assertEqual(fsync.call_count, 2)
+            run.close()
+            self.assertEqual(fsync.call_count, 3)
+
+    def _crash_run(self):
+        for name in ("a.txt", "b.txt", "c.txt", "d.txt"):
+            (self.source / name).write_text(name)
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        proc = subprocess.run(
+            [sys.executable, "-c", _CRASHING_RUN, str(self.test_dir / "journal"), str(self.source)], env=env
+        )
+        self.assertEqual(proc.returncode, 9)
+        self.assertEqual(len(list((self.source / "Documents").iterdir())), 2)
+        self.assertEqual(self.journal.load_index(), [])
+
+    def test_recovery_finishes_interrupted_run(self):
+        self._crash_run()
+
+        organizer = FileOrganizer()
+        organizer.undo_journal = self.journal
+        organizer._load_undo_stack()
+        self.assertEqual(organizer.recover_interrupted_runs(), 1)
+        self.assertEqual(len(organizer.undo_stack), 1)
+        self.assertEqual(len(self.journal.load_index()), 1)
+
+        # The third move was journaled but never happened; undo restores the two that did
+        self.assertEqual(organizer.undo_changes(), 2)
+        self.assertEqual(sorted(p.name for p in self.source.iterdir()), ["a.txt", "b.txt", "c.txt", "d.txt"])
+
+    def test_recovery_rollback(self):
+        self._crash_run()
+
+        organizer = FileOrganizer()
+        organizer.undo_journal = self.journal
+        organizer._load_undo_stack()
+        self.assertEqual(organizer.recover_interrupted_runs(rollback=True), 1)
+        self.assertEqual(organizer.undo_stack, [])
+        self.assertEqual(sorted(p.name for p in self.source.iterdir()), ["a.txt", "b.txt", "c.txt", "d.txt"])
+        self.assertEqual(organizer.recover_interrupted_runs(), 0)
+
+    def test_recovery_checks_moves_since_last_sync(self):
+        self._crash_run()
+        # Both sides of the two finished moves exist; with sync_every=2 only the last two journaled moves (the
+        # second and the one cut short) can still be unsynced, so only the second is reported
+        for moved in (self.source / "Documents").iterdir():
+            (self.source / moved.name).write_text(moved.name)
+        self.journal.sync_every = 2
+
+        organizer = FileOrganizer()
+        organizer.undo_journal = self.journal
+        organizer._load_undo_stack()
+        with patch("pro_file_organizer.core.organizer.logger") as logger:
+            organizer.recover_interrupted_runs()
+        incomplete = [c.args[0] for c in logger.warning.call_args_list if c.args[0].startswith("Incomplete move")]
+        self.assertEqual(len(incomplete), 1)
+
+    def test_live_run_is_not_recovered(self):
+        run = self.journal.begin_run(self.source)
+        run.append(self.source / "Docs" / "a.txt", self.source / "a.txt")
+        self.assertEqual(self.journal.find_interrupted([]), [])
+        run.close()
+
+    def test_torn_record_is_skipped(self):
+        run = self.journal.begin_run(self.source)
+        run.append(self.source / "Docs" / "a.txt", self.source / "a.txt")
+        run.close()
+        with open(run.segment, "a") as f:
+            f.write('["Docs/b.t')
+        history = self.journal.read_history({"source_path": self.source, "segment": run.segment})
+        self.assertEqual(history, [(self.source / "Docs" / "a.txt", self.source / "a.txt")])
+
+
+if __name__ == "__main__":
+    unittest.main()
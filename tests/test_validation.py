@@ -5,7 +5,7 @@ from pro_file_organizer.core import organizer
 
 class TestSettingsValidation(unittest.TestCase):
     def setUp(self):
-        self.organizer = organizer.FileOrganizer()
+        self.organizer = organizer.FileOrganizer(defer_state=True)
 
     def test_validate_config_valid(self):
         self.organizer.directories = {"Images": [".jpg", ".png"]}
@@ -29,6 +29,12 @@ class TestSettingsValidation(unittest.TestCase):
         errors = self.organizer.validate_config()
         self.assertTrue(any("Duplicate extension" in e for e in errors))
 
+    def test_validate_config_ml_backend(self):
+        self.organizer.ml_backend = "torch-int8"
+        self.assertEqual(self.organizer.validate_config(), [])
+        self.organizer.ml_backend = "tensorrt"
+        self.assertTrue(any("ML backend" in e for e in self.organizer.validate_config()))
+
 
 if __name__ == "__main__":
     unittest.main()
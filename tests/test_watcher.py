@@ -1,3 +1,6 @@
+import shutil
+import tempfile
+import time
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -6,28 +9,99 @@ from pro_file_organizer.core.watcher import FolderWatcher, FolderWatcherHandler
 
 
 class TestWatcher(unittest.TestCase):
-    def test_handler_dispatch(self):
-        import time
-
-        callback = MagicMock()
-        handler = FolderWatcherHandler(callback, debounce=0.01)
-
-        event = MagicMock()
-        event.is_directory = False
-        event.event_type = "created"
-
-        # Test dispatch
-        handler.dispatch(event)
-        callback.assert_called_once()
-
-        # Test debounce
-        callback.reset_mock()
-        handler.dispatch(event)
-        callback.assert_not_called()
-
-        time.sleep(0.02)
-        handler.dispatch(event)
-        callback.assert_called_once()
+    def setUp(self):
+        self.dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.now = 0.0
+        self.callback = MagicMock()
+        self.handler = FolderWatcherHandler(
+            self.callback, debounce=2.0, max_latency=30.0, poll_interval=1.0, clock=lambda: self.now
+        )
+
+    def event(self, event_type, name, dest=None, is_directory=False):
+        dest_path = str(self.dir / dest) if dest else None
+        return MagicMock(
+            event_type=event_type, src_path=str(self.dir / name), dest_path=dest_path, is_directory=is_directory
+        )
+
+    def write(self, name, content="data"):
+        path = self.dir / name
+        with open(path, "a") as f:
+            f.write(content)
+        return path
+
+    def test_handler_collects_changed_paths(self):
+        self.write("new.jpg")
+        self.write("done.pdf")
+        self.handler.dispatch(self.event("created", "new.jpg"))
+        self.handler.dispatch(self.event("modified", "new.jpg"))
+        self.handler.dispatch(self.event("moved", "tmp.part", "done.pdf"))
+        self.handler.dispatch(self.event("deleted", "gone.txt"))
+        self.handler.dispatch(self.event("created", "folder", is_directory=True))
+
+        self.assertEqual(set(self.handler._pending), {self.dir / "new.jpg", self.dir / "done.pdf"})
+        self.callback.assert_not_called()
+
+    def test_trailing_edge_debounce(self):
+        for i in range(10_000):
+            self.write(f"f{i % 100}.txt", "x")
+            self.handler.dispatch(self.event("modified", f"f{i % 100}.txt"))
+            self.now += 0.001
+        self.callback.assert_not_called()
+
+        # Nothing is due until the folder has been quiet for the debounce period
+        self.assertAlmostEqual(self.handler.next_poll(), self.now - 0.001 + 2.0)
+        # The first check only records sizes; the next one, a poll interval later, finds them unchanged
+        self.now = self.handler.next_poll()
+        self.assertEqual(self.handler.poll(), set())
+        self.assertEqual(self.handler.next_poll(), self.now + 1.0)
+        self.now += 1.0
+        self.handler.poll()
+
+        # The whole burst arrives as one batch
+        self.callback.assert_called_once_with({self.dir / f"f{i}.txt" for i in range(100)})
+        self.assertIsNone(self.handler.next_poll())
+
+    def test_max_latency(self):
+        self.write("a.txt")
+        # An event every second never lets the debounce expire
+        for _ in range(40):
+            self.handler.dispatch(self.event("modified", "a.txt"))
+            self.now += 1.0
+        self.assertEqual(self.handler.next_poll(), 30.0)
+
+    def test_growing_file_waits(self):
+        self.write("download.iso")
+        self.handler.dispatch(self.event("created", "download.iso"))
+        self.write("gone.txt")
+        self.handler.dispatch(self.event("created", "gone.txt"))
+        self.now = 2.0
+        self.handler.poll()
+
+        # Still growing, without further events
+        self.write("download.iso", "more")
+        (self.dir / "gone.txt").unlink()
+        self.now = 3.0
+        self.handler.poll()
+        self.callback.assert_not_called()
+        self.assertEqual(set(self.handler._pending), {self.dir / "download.iso"})
+
+        self.now = 4.0
+        self.handler.poll()
+        self.callback.assert_called_once_with({self.dir / "download.iso"})
+
+    def test_background_thread(self):
+        handler = FolderWatcherHandler(self.callback, debounce=0.01, poll_interval=0.01)
+        handler.start()
+        try:
+            self.write("a.txt")
+            handler.dispatch(self.event("created", "a.txt"))
+            deadline = time.monotonic() + 5
+            while not self.callback.called and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            handler.stop()
+        self.callback.assert_called_once_with({self.dir / "a.txt"})
 
     def test_watcher_start_stop(self):
         callback = MagicMock()
@@ -61,6 +135,7 @@ class TestWatcher(unittest.TestCase):
             watcher.stop()
             mock_observer_class.return_value.stop.assert_called()
             mock_observer_class.return_value.join.assert_called()
+            self.assertIsNone(watcher.logic._thread)
 
     def test_watcher_import_error(self):
         callback = MagicMock()
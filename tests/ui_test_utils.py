@@ -106,6 +106,41 @@ class MockModule(object):
     pass
 
 
+class MockListModel(MockBase):
+    """Inert stand-in for QAbstractListModel; records change notifications."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Don't let MockBase's stubs (e.g. clear) shadow the model's own methods
+        for name in [n for n in vars(self) if hasattr(type(self), n)]:
+            del self.__dict__[name]
+        self.dataChanged = MagicMock()
+        self.notifications = []
+
+    def index(self, row, column=0, parent=None):
+        index = MagicMock()
+        index.row.return_value = row
+        index.isValid.return_value = True
+        return index
+
+    def beginInsertRows(self, parent, first, last):
+        self.notifications.append(("insert", first, last))
+
+    def endInsertRows(self):
+        pass
+
+    def beginResetModel(self):
+        self.notifications.append(("reset",))
+
+    def endResetModel(self):
+        pass
+
+
+class MockModelIndex(object):
+    def isValid(self):
+        return False
+
+
 def get_pyside_mocks():
     mock_qtwidgets = MockModule()
 
@@ -147,6 +182,8 @@ def get_pyside_mocks():
     mock_qtwidgets.QSlider = MagicMock(side_effect=lambda *args, **kwargs: MockBase(*args, **kwargs))
     mock_qtwidgets.QProgressBar = MagicMock(side_effect=lambda *args, **kwargs: MockBase(*args, **kwargs))
     mock_qtwidgets.QScrollArea = MagicMock(side_effect=lambda *args, **kwargs: MockBase(*args, **kwargs))
+    mock_qtwidgets.QListView = MagicMock(side_effect=lambda *args, **kwargs: MockBase(*args, **kwargs))
+    mock_qtwidgets.QStyledItemDelegate = MockBase
     mock_qtwidgets.QFileDialog = MagicMock()
     mock_qtwidgets.QFileDialog.getExistingDirectory = MagicMock(return_value="/mock/path")
     mock_qtwidgets.QFileDialog.getSaveFileName = MagicMock(return_value=("/mock/file.json", "filter"))
@@ -190,6 +227,11 @@ def get_pyside_mocks():
     mock_qtcore.Qt.PenStyle.NoPen = 0
     mock_qtcore.Qt.PenStyle.DashLine = 1
 
+    mock_qtcore.Qt.ItemDataRole = MockModule()
+    mock_qtcore.Qt.ItemDataRole.DisplayRole = 0
+    mock_qtcore.Qt.ItemDataRole.ToolTipRole = 3
+    mock_qtcore.Qt.ItemDataRole.UserRole = 256
+
     mock_qtcore.Qt.AlignCenter = 1
     mock_qtcore.Qt.Horizontal = 1
     mock_qtcore.Qt.Checked = 2
@@ -208,6 +250,9 @@ def get_pyside_mocks():
     mock_qtcore.QTimer.singleShot = MagicMock(side_effect=mock_single_shot)
     mock_qtcore.Signal = MagicMock(side_effect=lambda *args: MagicMock())
     mock_qtcore.QObject = MockBase
+    mock_qtcore.QAbstractListModel = MockListModel
+    mock_qtcore.QModelIndex = MockModelIndex
+    mock_qtcore.QRect = MagicMock()
     mock_qtcore.QSize = MagicMock()
     mock_qtcore.QPoint = MagicMock()
     mock_qtcore.QPropertyAnimation = lambda *args, **kwargs: MagicMock()